@@ -0,0 +1,73 @@
+"""Measure the running times behind the estimates used by ``partition``.
+
+Run with ``python benchmarks/calibrate.py``; the printed constants are the ones used
+in ``src/numberpartitioning/auto.py``, and should be updated there when the
+algorithms change.
+"""
+
+import random
+from math import inf
+from time import perf_counter
+from typing import Callable, List, Tuple
+
+from numberpartitioning import complete_karmarkar_karp, karmarkar_karp
+
+
+def _time(function: Callable[[], object], repeat: int = 3) -> float:
+    """Give the shortest of a number of running times of a function, in seconds."""
+    best = inf
+    for _ in range(repeat):
+        start = perf_counter()
+        function()
+        best = min(best, perf_counter() - start)
+    return best
+
+
+def _fit_line(xs: List[float], ys: List[float]) -> Tuple[float, float]:
+    """Fit a line to points with least squares, giving its intercept and slope."""
+    mean_x = sum(xs) / len(xs)
+    mean_y = sum(ys) / len(ys)
+    slope = sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys)) / sum(
+        (x - mean_x) ** 2 for x in xs
+    )
+    return mean_y - slope * mean_x, slope
+
+
+def main() -> None:
+    rng = random.Random(0)
+
+    # The Karmarkar--Karp algorithm: time per number, as a function of the number of
+    # parts.
+    num_numbers = 20_000
+    numbers = [rng.randrange(10**9) for _ in range(num_numbers)]
+    parts: List[float] = [2, 10, 50, 100]
+    times = [
+        _time(lambda: karmarkar_karp(numbers, int(num_parts))) / num_numbers
+        for num_parts in parts
+    ]
+    intercept, slope = _fit_line(parts, times)
+    print(f"_KARMARKAR_KARP_TIME_PER_NUMBER = {intercept:.1e}")
+    print(f"_KARMARKAR_KARP_TIME_PER_NUMBER_AND_PART = {slope:.1e}")
+
+    # The first partition of the complete Karmarkar--Karp search: time per squared
+    # number, as a function of the number of parts.
+    num_numbers = 1000
+    numbers = [rng.randrange(10**9) for _ in range(num_numbers)]
+    parts = [3, 10, 30]
+    times = [
+        _time(
+            lambda: next(
+                complete_karmarkar_karp(numbers, int(num_parts), method="purepython")
+            ),
+            repeat=1,
+        )
+        / num_numbers**2
+        for num_parts in parts
+    ]
+    intercept, slope = _fit_line(parts, times)
+    print(f"_FIRST_LEAF_TIME_PER_SQUARED_NUMBER = {intercept:.1e}")
+    print(f"_FIRST_LEAF_TIME_PER_SQUARED_NUMBER_AND_PART = {slope:.1e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""Reproducible generators of instances for the benchmarks.
+
+Every generator takes the number of numbers, the number of parts, and a seed, and
+returns the same list of numbers for the same arguments.
+"""
+
+import random
+from typing import Callable, Dict, List
+
+
+def uniform(num_numbers: int, num_parts: int, seed: int) -> List[int]:
+    """Integers drawn uniformly from [0, 2^32)."""
+    rng = random.Random(seed)
+    return [rng.randrange(2**32) for _ in range(num_numbers)]
+
+
+def exponential(num_numbers: int, num_parts: int, seed: int) -> List[int]:
+    """Integers drawn from an exponential distribution with mean 2^20, so that a few
+    numbers are much larger than the rest."""
+    rng = random.Random(seed)
+    return [int(rng.expovariate(2**-20)) for _ in range(num_numbers)]
+
+
+def high_precision(num_numbers: int, num_parts: int, seed: int) -> List[int]:
+    """Integers drawn uniformly from [0, 2^96), too large for 64-bit arithmetic and
+    with too many bits for perfect partitions to be likely."""
+    rng = random.Random(seed)
+    return [rng.randrange(2**96) for _ in range(num_numbers)]
+
+
+def perfect(num_numbers: int, num_parts: int, seed: int) -> List[int]:
+    """Integers in [0, 2^32) which can be partitioned into parts of equal sizes.
+
+    The numbers are split at random into the given number of groups, and the last
+    number of each group is increased until all groups have the same sum.
+    """
+    rng = random.Random(seed)
+    numbers = [rng.randrange(2**32) for _ in range(num_numbers)]
+    groups: List[List[int]] = [[] for _ in range(num_parts)]
+    for i in range(num_numbers):
+        groups[i % num_parts if i < num_parts else rng.randrange(num_parts)].append(i)
+    group_sums = [sum(numbers[i] for i in group) for group in groups]
+    for group, group_sum in zip(groups, group_sums):
+        if group:
+            numbers[group[-1]] += max(group_sums) - group_sum
+    return numbers
+
+
+GENERATORS: Dict[str, Callable[[int, int, int], List[int]]] = {
+    "uniform": uniform,
+    "exponential": exponential,
+    "high_precision": high_precision,
+    "perfect": perfect,
+}
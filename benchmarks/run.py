@@ -0,0 +1,198 @@
+"""Time the algorithms on a grid of generated instances.
+
+Run with ``python benchmarks/run.py``; ``--quick`` uses a smaller grid. The results
+can be stored with ``--save results.json``, and compared with stored results with
+``--compare results.json``, in which case the exit status is non-zero if any
+benchmark got slower by more than the tolerance, or found a worse partition. To see
+the effect of a change, save the results before the change, and compare with them
+after it, on the same machine.
+
+The heuristics, ``greedy`` and ``karmarkar_karp``, are timed on large instances. The
+complete algorithms, ``complete_greedy`` and ``complete_karmarkar_karp``, are run
+with a time limit on smaller instances, recording the time until the first and the
+best partition, the total time, the statistics of the search, and whether the best
+partition was proven optimal.
+"""
+
+import argparse
+import json
+import sys
+from math import inf
+from time import perf_counter
+from typing import Any, Callable, Dict, Iterator, List, Tuple
+
+from instances import GENERATORS
+
+from numberpartitioning import (
+    complete_greedy,
+    complete_karmarkar_karp,
+    greedy,
+    karmarkar_karp,
+)
+from numberpartitioning.common import SearchStatistics
+
+HEURISTICS: Dict[str, Callable[..., Any]] = {
+    "greedy": greedy,
+    "karmarkar_karp": karmarkar_karp,
+}
+COMPLETE: Dict[str, Callable[..., Iterator[Any]]] = {
+    "complete_greedy": complete_greedy,
+    "complete_karmarkar_karp": complete_karmarkar_karp,
+}
+# The numbers of numbers and parts for the heuristics and the complete algorithms.
+GRIDS = {
+    "full": (
+        [(n, k) for n in [1_000, 10_000, 100_000] for k in [2, 10, 100]],
+        [(n, k) for n in [20, 40, 60] for k in [2, 3, 5, 10]],
+    ),
+    "quick": (
+        [(n, k) for n in [1_000, 10_000] for k in [2, 10]],
+        [(n, k) for n in [15, 25] for k in [2, 4]],
+    ),
+}
+SEED = 0
+# Times below this number of seconds are too noisy to be compared.
+MIN_COMPARED_TIME = 0.01
+
+
+def _difference(sizes: List[int]) -> int:
+    return max(sizes) - min(sizes)
+
+
+def run_heuristic(
+    function: Callable[..., Any], numbers: List[int], num_parts: int, repeat: int = 3
+) -> Dict[str, Any]:
+    best_time = inf
+    for _ in range(repeat):
+        start = perf_counter()
+        result = function(numbers, num_parts)
+        best_time = min(best_time, perf_counter() - start)
+    return {"time": best_time, "difference": _difference(result.sizes)}
+
+
+def run_complete(
+    function: Callable[..., Iterator[Any]],
+    numbers: List[int],
+    num_parts: int,
+    time_limit: float,
+) -> Dict[str, Any]:
+    stats = SearchStatistics()
+    start = perf_counter()
+    for result in function(numbers, num_parts, time_limit=time_limit, stats=stats):
+        pass
+    total_time = perf_counter() - start
+    return {
+        "time_to_first": stats.improvement_times[0],
+        "time_to_best": stats.improvement_times[-1],
+        "time": total_time,
+        "nodes": stats.nodes,
+        "pruned": stats.pruned,
+        "max_stack_size": stats.max_stack_size,
+        "proven_optimal": result.proven_optimal,
+        "difference": _difference(result.sizes),
+    }
+
+
+def run(grid: str, time_limit: float) -> Dict[str, Dict[str, Any]]:
+    heuristic_grid, complete_grid = GRIDS[grid]
+    results = {}
+    for generator_name, generator in GENERATORS.items():
+        for functions, runner, sizes in [
+            (HEURISTICS, run_heuristic, heuristic_grid),
+            (COMPLETE, run_complete, complete_grid),
+        ]:
+            for num_numbers, num_parts in sizes:
+                numbers = generator(num_numbers, num_parts, SEED)
+                for function_name, function in functions.items():
+                    name = "/".join([function_name, generator_name, f"n={num_numbers}"])
+                    name += f"/k={num_parts}"
+                    if runner is run_complete:
+                        result = run_complete(function, numbers, num_parts, time_limit)
+                    else:
+                        result = run_heuristic(function, numbers, num_parts)
+                    results[name] = result
+                    print(name, _format(result), flush=True)
+    return results
+
+
+def compare(
+    results: Dict[str, Dict[str, Any]],
+    baseline: Dict[str, Dict[str, Any]],
+    tolerance: float,
+) -> List[Tuple[str, str]]:
+    """Find the benchmarks that got slower by more than the tolerance, as a factor, or
+    found worse partitions, compared with the baseline."""
+    regressions = []
+    for name, result in results.items():
+        old = baseline.get(name)
+        if old is None:
+            continue
+        # Partitions found within a time limit depend on the speed of the machine, so
+        # they are only compared for heuristics and for searches that finished.
+        if result["difference"] > old["difference"] and old.get("proven_optimal", True):
+            regressions.append(
+                (name, f"difference {old['difference']} -> {result['difference']}")
+            )
+        for key in ["time_to_first", "time"]:
+            if key not in result or key not in old:
+                continue
+            if key == "time" and not (
+                result.get("proven_optimal", True) and old.get("proven_optimal", True)
+            ):
+                # Searches stopped by the time limit always take the same time.
+                continue
+            if max(result[key], old[key]) < MIN_COMPARED_TIME:
+                continue
+            if result[key] > tolerance * old[key]:
+                regressions.append(
+                    (name, f"{key} {old[key]:.4f}s -> {result[key]:.4f}s")
+                )
+        if old.get("proven_optimal") and not result.get("proven_optimal", True):
+            regressions.append((name, "no longer proven optimal"))
+    return regressions
+
+
+def _format(result: Dict[str, Any]) -> str:
+    return " ".join(
+        f"{key}={value:.4f}" if isinstance(value, float) else f"{key}={value}"
+        for key, value in result.items()
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--quick", action="store_true", help="use a smaller grid")
+    parser.add_argument(
+        "--time-limit",
+        type=float,
+        default=2.0,
+        help="time limit for the complete algorithms, in seconds (default: 2)",
+    )
+    parser.add_argument("--save", metavar="PATH", help="store the results as JSON")
+    parser.add_argument(
+        "--compare", metavar="PATH", help="compare with results stored as JSON"
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=1.5,
+        help="slowdown factor reported as a regression (default: 1.5)",
+    )
+    args = parser.parse_args()
+    results = run("quick" if args.quick else "full", args.time_limit)
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(results, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.tolerance)
+        for name, description in regressions:
+            print(f"REGRESSION {name}: {description}")
+        if regressions:
+            sys.exit(1)
+        print("No regressions")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,25 @@
+from .auto import partition
+from .batch import partition_many
+from .cache import PartitionCache
 from .complete_karmarkar_karp import complete_karmarkar_karp
 from .greedy import complete_greedy, greedy
+from .incremental import IncrementalPartitioner
 from .karmarkar_karp import karmarkar_karp
+from .local_search import improve
+from .recursive_number_partitioning import recursive_number_partitioning
+from .sequential_number_partitioning import sequential_number_partitioning
 
 __version__ = "0.0.2"
-__all__ = ["complete_greedy", "greedy", "karmarkar_karp", "complete_karmarkar_karp"]
+__all__ = [
+    "complete_greedy",
+    "greedy",
+    "IncrementalPartitioner",
+    "improve",
+    "karmarkar_karp",
+    "complete_karmarkar_karp",
+    "partition",
+    "partition_many",
+    "PartitionCache",
+    "recursive_number_partitioning",
+    "sequential_number_partitioning",
+]
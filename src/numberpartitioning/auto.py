@@ -0,0 +1,143 @@
+from typing import Any, Iterator, Optional
+
+from .common import AnyPartitioningResult, _to_list
+from .complete_karmarkar_karp import (
+    _SCHROEPPEL_SHAMIR_MAX_SIZE,
+    _auto_uses_dp,
+    complete_karmarkar_karp,
+)
+from .greedy import greedy
+from .karmarkar_karp import karmarkar_karp
+from .sequential_number_partitioning import sequential_number_partitioning
+
+# Estimated running times in seconds, as measured by benchmarks/calibrate.py: the
+# Karmarkar--Karp algorithm takes a time per number that grows linearly with the
+# number of parts, and the complete Karmarkar--Karp search needs a time quadratic in
+# the number of numbers, and growing linearly with the number of parts, to reach its
+# first partition. The greedy algorithm is taken to be fast enough for any input.
+_KARMARKAR_KARP_TIME_PER_NUMBER = 6.6e-6
+_KARMARKAR_KARP_TIME_PER_NUMBER_AND_PART = 1.9e-7
+_FIRST_LEAF_TIME_PER_SQUARED_NUMBER = 8.1e-9
+_FIRST_LEAF_TIME_PER_SQUARED_NUMBER_AND_PART = 3.8e-8
+# The number of seconds the Karmarkar--Karp algorithm may be expected to take before
+# the greedy algorithm is used instead, when no time limit is given.
+_HEURISTIC_TIME = 1.0
+
+OBJECTIVES = ("difference", "largest_part")
+
+
+def partition(
+    numbers: Any,
+    num_parts: int = 2,
+    return_indices: bool = False,
+    time_limit: Optional[float] = None,
+    optimal: bool = False,
+    objective: str = "difference",
+    compact: bool = False,
+) -> AnyPartitioningResult:
+    """Partition numbers with the algorithm best suited for the input.
+
+    The choice is based on estimates of the running times of the algorithms, which
+    depend on the number of numbers, the number of parts, and for two parts, the
+    size of the numbers and their total.
+
+    Without a time limit, and unless an optimal partition is asked for, the partition
+    is the one produced by the Karmarkar--Karp algorithm, or by the greedy algorithm
+    if the former would take too long. Otherwise, a complete algorithm is run until
+    it finds an optimal partition or the time limit is reached, and the best
+    partition found is returned; if the time limit does not even allow for the first
+    partition of the complete algorithm, a heuristic is used as above, choosing the
+    Karmarkar--Karp algorithm only if it is expected to finish in time.
+
+    Parameters
+    ----------
+    numbers
+        The numbers to be partitioned; a list, or a NumPy array.
+    num_parts
+        The desired number of parts in the partition. Default: 2.
+    return_indices
+        If True, the elements of the parts are the indices of the corresponding entries
+        of numbers; if False (default), the elements are the numbers themselves.
+    time_limit
+        If given, the number of seconds after which to stop searching for better
+        partitions.
+    optimal
+        If True, search for an optimal partition, within the time limit if one is
+        given. Default: False.
+    objective
+        What an optimal partition minimizes; either "difference" (default), the
+        difference between the largest and the smallest part, or "largest_part", the
+        size of the largest part, in which case the numbers must be non-negative.
+        For two parts, these are the same.
+    compact
+        If True, the partition is given as a ``CompactPartitioningResult``, which only
+        builds the parts when they are accessed. Default: False.
+
+    Returns
+    -------
+    The partition represented by a ``PartitioningResult``, which is marked as
+    ``proven_optimal`` if it was found to be optimal.
+
+    """
+    if objective not in OBJECTIVES:
+        raise ValueError(
+            f'Invalid objective "{objective}". Valid options: {", ".join(OBJECTIVES)}'
+        )
+    if not optimal and time_limit is None:
+        return _heuristic(numbers, num_parts, return_indices, _HEURISTIC_TIME, compact)
+    numbers = _to_list(numbers)
+    if time_limit is not None and (
+        _first_result_time(numbers, num_parts, objective) > time_limit
+    ):
+        return _heuristic(numbers, num_parts, return_indices, time_limit, compact)
+    results: Iterator[AnyPartitioningResult]
+    if objective == "largest_part" and num_parts > 2:
+        results = sequential_number_partitioning(
+            numbers, num_parts, return_indices, time_limit, compact=compact
+        )
+    else:
+        results = complete_karmarkar_karp(
+            numbers, num_parts, return_indices, time_limit=time_limit, compact=compact
+        )
+    result = next(results)
+    for result in results:
+        pass
+    return result
+
+
+def _heuristic(
+    numbers: Any,
+    num_parts: int,
+    return_indices: bool,
+    time_limit: float,
+    compact: bool,
+) -> AnyPartitioningResult:
+    if _karmarkar_karp_time(len(numbers), num_parts) <= time_limit:
+        return karmarkar_karp(
+            _to_list(numbers), num_parts, return_indices, compact=compact
+        )
+    return greedy(numbers, num_parts, return_indices, compact=compact)
+
+
+def _karmarkar_karp_time(num_numbers: int, num_parts: int) -> float:
+    return num_numbers * (
+        _KARMARKAR_KARP_TIME_PER_NUMBER
+        + _KARMARKAR_KARP_TIME_PER_NUMBER_AND_PART * num_parts
+    )
+
+
+def _first_result_time(numbers: Any, num_parts: int, objective: str) -> float:
+    """Estimate the time it takes the complete algorithm to produce its first
+    partition."""
+    num_numbers = len(numbers)
+    if (
+        (objective == "largest_part" and num_parts > 2)
+        or (num_parts == 2 and num_numbers <= _SCHROEPPEL_SHAMIR_MAX_SIZE)
+        or _auto_uses_dp(numbers, num_parts)
+    ):
+        # These start from the Karmarkar--Karp partition, or reach it right away.
+        return _karmarkar_karp_time(num_numbers, num_parts)
+    return num_numbers**2 * (
+        _FIRST_LEAF_TIME_PER_SQUARED_NUMBER
+        + _FIRST_LEAF_TIME_PER_SQUARED_NUMBER_AND_PART * num_parts
+    )
@@ -0,0 +1,185 @@
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from itertools import chain
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from .common import AnyPartitioningResult, CompactPartitioningResult
+from .greedy import greedy
+from .karmarkar_karp import karmarkar_karp
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None  # type: ignore[assignment]
+
+
+@dataclass
+class BatchResult:
+    """The results of partitioning many instances at once, in columnar form.
+
+    Parameters
+    ----------
+    assignments:
+        The parts of the numbers of all instances, concatenated; that is, the i'th
+        number of instance m belongs to part ``assignments[offsets[m] + i]`` of the
+        partition of that instance.
+    sizes:
+        Array of shape ``(number of instances, num_parts)`` whose m'th row contains the
+        sums of the parts of the partition of instance m.
+    offsets:
+        Array with one more element than the number of instances, giving the position
+        in ``assignments`` at which each instance starts.
+    """
+
+    assignments: Any
+    sizes: Any
+    offsets: Any
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, instance: int) -> CompactPartitioningResult:
+        """Give the partition of a single instance, with the elements of the parts
+        being the indices of the numbers of the instance."""
+        start, end = self.offsets[instance], self.offsets[instance + 1]
+        return CompactPartitioningResult(
+            self.assignments[start:end], self.sizes[instance].tolist()
+        )
+
+
+def partition_many(
+    instances: Any,
+    num_parts: int = 2,
+    algorithm: str = "karmarkar_karp",
+    lengths: Optional[Sequence[int]] = None,
+    workers: Optional[int] = None,
+) -> BatchResult:
+    """Partition many independent instances in one call.
+
+    This requires NumPy. The greedy algorithm is run on all instances at once, adding
+    the i'th largest number of every instance in a single vectorized step, while the
+    Karmarkar--Karp algorithm is run on each instance in turn, optionally spread over
+    a pool of worker processes. Either way, the partitions are the same as the ones
+    obtained by calling the algorithm on each instance.
+
+    Parameters
+    ----------
+    instances
+        The instances to be partitioned; either a list of lists of numbers, or a 2-D
+        array whose rows are the instances, padded to equal lengths.
+    num_parts
+        The desired number of parts in each partition. Default: 2.
+    algorithm
+        The algorithm to use. Allowed values are "karmarkar_karp" (default) and
+        "greedy".
+    lengths
+        If given, the number of numbers in each row of ``instances``; the remaining
+        entries of each row are padding and are ignored. By default, all numbers are
+        used.
+    workers
+        If given, the number of worker processes over which to spread the instances
+        when they are partitioned one at a time. By default, everything happens in the
+        calling process.
+
+    Returns
+    -------
+    The partitions represented by a ``BatchResult``.
+
+    """
+    if algorithm not in ALGORITHMS:
+        raise ValueError(
+            f'Invalid algorithm "{algorithm}". Valid options: {", ".join(ALGORITHMS)}'
+        )
+    if np is None:
+        raise ImportError("partition_many requires NumPy to be installed")
+    # Convert NumPy input to Python numbers, as the algorithms rely on exact sums.
+    rows = [
+        instance.tolist() if isinstance(instance, np.ndarray) else list(instance)
+        for instance in instances
+    ]
+    if lengths is not None:
+        rows = [row[:length] for row, length in zip(rows, lengths)]
+    row_lengths = np.array([len(row) for row in rows], dtype=np.intp)
+    offsets = np.zeros(len(rows) + 1, dtype=np.intp)
+    np.cumsum(row_lengths, out=offsets[1:])
+    if algorithm == "greedy":
+        values = _padded_array(rows, row_lengths)
+        if values is not None:
+            assignments, sizes = _greedy_vectorized(values, row_lengths, num_parts)
+            return BatchResult(assignments, sizes, offsets)
+    tasks = [(algorithm, row, num_parts) for row in rows]
+    if workers is None:
+        results = list(map(_partition_instance, tasks))
+    else:
+        with ProcessPoolExecutor(workers) as executor:
+            chunksize = max(1, len(tasks) // (4 * workers))
+            results = list(
+                executor.map(_partition_instance, tasks, chunksize=chunksize)
+            )
+    assignments = np.fromiter(
+        chain.from_iterable(assignment for assignment, _ in results),
+        dtype=np.intp,
+        count=int(offsets[-1]),
+    )
+    sizes_list = [sizes for _, sizes in results]
+    sizes = np.array(sizes_list)
+    if sizes.dtype.kind == "f" and any(
+        type(size) is int and abs(size) > 2**53
+        for size in chain.from_iterable(sizes_list)
+    ):
+        # Keep large integers exact when some of the other sizes are floats.
+        sizes = np.array(sizes_list, dtype=object)
+    return BatchResult(assignments, sizes.reshape(len(rows), num_parts), offsets)
+
+
+def _partition_instance(task: Tuple[str, List[int], int]) -> Tuple[Any, List[int]]:
+    algorithm, numbers, num_parts = task
+    result = ALGORITHMS[algorithm](numbers, num_parts, True, compact=True)
+    assert isinstance(result, CompactPartitioningResult)
+    return result.assignment, result.sizes
+
+
+def _padded_array(rows: List[List[int]], row_lengths: Any) -> Any:
+    """Put the instances in a 2-D array padded with zeros, or return None if their
+    sums can not be computed exactly with a NumPy number type."""
+    numbers = list(chain.from_iterable(rows))
+    flat = np.array(numbers)
+    if flat.dtype.kind == "f" and not all(type(x) is float for x in numbers):
+        # Integers mixed with floats would be rounded.
+        return None
+    if flat.dtype.kind in "biu":
+        # Check that no partial sum can overflow, using Python integers.
+        largest = max(abs(int(flat.max(initial=0))), abs(int(flat.min(initial=0))))
+        if largest * int(row_lengths.max(initial=0)) >= 2**63:
+            return None
+        flat = flat.astype(np.int64)
+    elif flat.dtype.kind != "f":
+        return None
+    values = np.zeros((len(rows), int(row_lengths.max(initial=0))), dtype=flat.dtype)
+    values[np.arange(values.shape[1]) < row_lengths[:, np.newaxis]] = flat
+    return values
+
+
+def _greedy_vectorized(values: Any, row_lengths: Any, num_parts: int) -> Any:
+    num_instances, max_length = values.shape
+    is_padding = np.arange(max_length) >= row_lengths[:, np.newaxis]
+    # Sort each row in descending order, keeping the order of equal numbers as in
+    # greedy, and with the padding at the end.
+    order = np.lexsort((-values, is_padding), axis=-1)
+    sorted_values = np.take_along_axis(values, order, axis=-1)
+    sums = np.zeros((num_instances, num_parts), dtype=values.dtype)
+    assignment = np.zeros((num_instances, max_length), dtype=np.intp)
+    rows = np.arange(num_instances)
+    for t in range(max_length):
+        active = rows[t < row_lengths]
+        # argmin picks the first of several smallest parts, just like greedy.
+        smallest = np.argmin(sums[active], axis=1)
+        sums[active, smallest] += sorted_values[active, t]
+        assignment[active, order[active, t]] = smallest
+    return assignment[~is_padding], sums
+
+
+ALGORITHMS: Dict[str, Callable[..., AnyPartitioningResult]] = {
+    "karmarkar_karp": karmarkar_karp,
+    "greedy": greedy,
+}
@@ -0,0 +1,277 @@
+import hashlib
+import json
+import sqlite3
+from array import array
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from .auto import partition
+from .common import (
+    AnyPartitioningResult,
+    CompactPartitioningResult,
+    PartitioningResult,
+    _to_list,
+)
+from .complete_karmarkar_karp import complete_karmarkar_karp
+from .greedy import complete_greedy, greedy
+from .karmarkar_karp import karmarkar_karp
+from .recursive_number_partitioning import recursive_number_partitioning
+from .sequential_number_partitioning import sequential_number_partitioning
+
+# A cached partition of the sorted numbers: the part of each number, the sums of the
+# parts, and whether the partition is known to be optimal.
+_Entry = Tuple["array[int]", List[Any], bool]
+
+
+class PartitionCache:
+    """A cache of partitions, for partitioning the same numbers many times.
+
+    Partitions are cached by the multiset of numbers, the number of parts, the
+    algorithm, and its options, so that a request for a permutation of numbers
+    partitioned before is answered by mapping the cached partition to the order of the
+    numbers, in time O(n log n) for sorting the numbers, instead of running the
+    algorithm again. The algorithms are run on the numbers in sorted order, so the
+    partition does not depend on the order in which the numbers are given; with a
+    time limit, the partition found the first time is the one given for all requests.
+
+    The least recently used partitions are evicted once the cache holds ``max_size``
+    of them. They are kept in memory, or in an SQLite database if ``path`` is given,
+    which lets them be shared between processes and kept between runs.
+
+    Parameters
+    ----------
+    max_size
+        The largest number of partitions to keep. Default: 1024.
+    path
+        If given, the path of the SQLite database in which to keep the partitions,
+        which is created if it does not exist.
+    """
+
+    def __init__(self, max_size: int = 1024, path: Optional[str] = None):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._store = _MemoryStore() if path is None else _SQLiteStore(path)
+
+    def __len__(self) -> int:
+        return len(self._store)
+
+    def partition(
+        self,
+        numbers: Any,
+        num_parts: int = 2,
+        return_indices: bool = False,
+        algorithm: str = "complete_karmarkar_karp",
+        compact: bool = False,
+        **options: Any,
+    ) -> AnyPartitioningResult:
+        """Give the partition produced by an algorithm, from the cache if possible.
+
+        Parameters
+        ----------
+        numbers
+            The numbers to be partitioned; integers or floats, as a list or a NumPy
+            array.
+        num_parts
+            The desired number of parts in the partition. Default: 2.
+        return_indices
+            If True, the elements of the parts are the indices of the corresponding
+            entries of numbers; if False (default), the elements are the numbers
+            themselves.
+        algorithm
+            The name of the algorithm to use; one of "complete_karmarkar_karp"
+            (default), "complete_greedy", "recursive_number_partitioning",
+            "sequential_number_partitioning", "karmarkar_karp", "greedy", and
+            "partition". For the complete algorithms, the last partition they produce
+            is used.
+        compact
+            If True, the partition is returned as a ``CompactPartitioningResult``,
+            which only builds the parts when they are accessed. Default: False.
+        options
+            Further keyword arguments to pass to the algorithm, such as ``method`` or
+            ``time_limit``; these must be None, booleans, numbers, or strings.
+
+        Returns
+        -------
+        The partition represented by a ``PartitioningResult``, with the elements of
+        each part in the order of the numbers, or by a ``CompactPartitioningResult``
+        if ``compact`` is True.
+
+        """
+        if algorithm not in ALGORITHMS:
+            raise ValueError(
+                f'Invalid algorithm "{algorithm}". '
+                f'Valid options: {", ".join(ALGORITHMS)}'
+            )
+        numbers = _to_list(numbers)
+        order = sorted(range(len(numbers)), key=numbers.__getitem__)
+        sorted_numbers = [numbers[i] for i in order]
+        key = _key(sorted_numbers, num_parts, algorithm, options)
+        entry = self._store.get(key)
+        if entry is None:
+            self.misses += 1
+            result = ALGORITHMS[algorithm](sorted_numbers, num_parts, options)
+            assert isinstance(result, CompactPartitioningResult)
+            entry = (
+                array("l", _to_list(result.assignment)),
+                result.sizes,
+                result.proven_optimal,
+            )
+            self._store.put(key, entry, self.max_size)
+        else:
+            self.hits += 1
+        sorted_assignment, sizes, proven_optimal = entry
+        assignment = array("l", bytes(len(sorted_assignment) * array("l").itemsize))
+        for i, part in zip(order, sorted_assignment):
+            assignment[i] = part
+        compact_result = CompactPartitioningResult(
+            assignment, list(sizes), None if return_indices else numbers, proven_optimal
+        )
+        if compact:
+            return compact_result
+        return PartitioningResult(
+            compact_result.partition, compact_result.sizes, proven_optimal
+        )
+
+    def clear(self) -> None:
+        """Remove all partitions from the cache."""
+        self._store.clear()
+
+    def close(self) -> None:
+        """Close the database, if the partitions are kept in one."""
+        self._store.close()
+
+
+def _key(
+    sorted_numbers: List[Any], num_parts: int, algorithm: str, options: Dict[str, Any]
+) -> str:
+    for name, value in options.items():
+        if value is not None and not isinstance(value, (bool, int, float, str)):
+            raise ValueError(f'The option "{name}" can not be part of a cache key')
+    try:
+        description = json.dumps(
+            [sorted_numbers, num_parts, algorithm, options], sort_keys=True
+        )
+    except TypeError as error:
+        raise ValueError("Only integers and floats can be cached") from error
+    return hashlib.sha256(description.encode()).hexdigest()
+
+
+def _last(results: Iterator[AnyPartitioningResult]) -> AnyPartitioningResult:
+    result = next(results)
+    for result in results:
+        pass
+    return result
+
+
+def _complete(
+    function: Callable[..., Any],
+) -> Callable[[List[Any], int, Dict[str, Any]], AnyPartitioningResult]:
+    return lambda numbers, num_parts, options: _last(
+        function(numbers, num_parts, True, compact=True, **options)
+    )
+
+
+def _heuristic(
+    function: Callable[..., AnyPartitioningResult],
+) -> Callable[[List[Any], int, Dict[str, Any]], AnyPartitioningResult]:
+    return lambda numbers, num_parts, options: function(
+        numbers, num_parts, True, compact=True, **options
+    )
+
+
+class _MemoryStore:
+    def __init__(self) -> None:
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[_Entry]:
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    def put(self, key: str, entry: _Entry, max_size: int) -> None:
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > max_size:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def close(self) -> None:
+        pass
+
+
+class _SQLiteStore:
+    def __init__(self, path: str) -> None:
+        self._connection = sqlite3.connect(path)
+        with self._connection:
+            # Entries are ordered by when they were last used by a counter, as
+            # timestamps may be equal or go backwards.
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS partitions (key TEXT PRIMARY KEY, "
+                "assignment BLOB, sizes TEXT, proven_optimal INTEGER, used INTEGER)"
+            )
+            self._connection.execute(
+                "CREATE INDEX IF NOT EXISTS partitions_used ON partitions (used)"
+            )
+
+    def __len__(self) -> int:
+        (count,) = self._connection.execute(
+            "SELECT COUNT(*) FROM partitions"
+        ).fetchone()
+        return int(count)
+
+    def get(self, key: str) -> Optional[_Entry]:
+        with self._connection:
+            row = self._connection.execute(
+                "SELECT assignment, sizes, proven_optimal FROM partitions "
+                "WHERE key = ?",
+                (key,),
+            ).fetchone()
+            if row is None:
+                return None
+            self._connection.execute(
+                "UPDATE partitions SET used = "
+                "(SELECT COALESCE(MAX(used), 0) + 1 FROM partitions) WHERE key = ?",
+                (key,),
+            )
+        assignment = array("l")
+        assignment.frombytes(row[0])
+        return assignment, json.loads(row[1]), bool(row[2])
+
+    def put(self, key: str, entry: _Entry, max_size: int) -> None:
+        assignment, sizes, proven_optimal = entry
+        with self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO partitions VALUES "
+                "(?, ?, ?, ?, (SELECT COALESCE(MAX(used), 0) + 1 FROM partitions))",
+                (key, assignment.tobytes(), json.dumps(sizes), int(proven_optimal)),
+            )
+            self._connection.execute(
+                "DELETE FROM partitions WHERE key NOT IN "
+                "(SELECT key FROM partitions ORDER BY used DESC LIMIT ?)",
+                (max_size,),
+            )
+
+    def clear(self) -> None:
+        with self._connection:
+            self._connection.execute("DELETE FROM partitions")
+
+    def close(self) -> None:
+        self._connection.close()
+
+
+ALGORITHMS = {
+    "complete_karmarkar_karp": _complete(complete_karmarkar_karp),
+    "complete_greedy": _complete(complete_greedy),
+    "recursive_number_partitioning": _complete(recursive_number_partitioning),
+    "sequential_number_partitioning": _complete(sequential_number_partitioning),
+    "karmarkar_karp": _heuristic(karmarkar_karp),
+    "greedy": _heuristic(greedy),
+    "partition": _heuristic(partition),
+}
@@ -1,5 +1,13 @@
-from dataclasses import dataclass
-from typing import List
+import sys
+from array import array
+from dataclasses import dataclass, field
+from time import perf_counter
+from typing import Any, Iterator, List, Optional, Sequence, Union
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None  # type: ignore[assignment]
 
 Partition = List[List[int]]
 
@@ -16,7 +24,392 @@ class PartitioningResult:
     sizes:
         List containing the corresponding sums of the parts; that is, the i'th element
         is the sum of the i'th element of the partition.
+    proven_optimal:
+        Whether the partition is known to be optimal. For the complete algorithms, this
+        is set on the last partition found once the search finishes without hitting any
+        of its limits, which may happen after the partition has been yielded.
     """
 
     partition: Partition
     sizes: List[int]
+    proven_optimal: bool = False
+
+
+class CompactPartitioningResult:
+    """The result of performing a partitioning, stored as an array of part indices.
+
+    The partition itself is only built, and then cached, when the ``partition``
+    attribute is first accessed, so that no lists are created when only the sizes or
+    the assignment are needed.
+
+    Parameters
+    ----------
+    assignment:
+        An ``array('l')``, or a NumPy array, whose i'th element is the index of the part
+        containing the i'th number being partitioned.
+    sizes:
+        List containing the sums of the parts.
+    numbers:
+        The numbers being partitioned, used as the elements of the parts of
+        ``partition``; if None, the elements are the indices of the numbers instead.
+    proven_optimal:
+        Whether the partition is known to be optimal; see ``PartitioningResult``.
+    """
+
+    __slots__ = ("assignment", "sizes", "proven_optimal", "_numbers", "_partition")
+
+    def __init__(
+        self,
+        assignment: Any,
+        sizes: List[int],
+        numbers: Optional[Sequence[int]] = None,
+        proven_optimal: bool = False,
+    ):
+        self.assignment = assignment
+        self.sizes = sizes
+        self.proven_optimal = proven_optimal
+        self._numbers = numbers
+        self._partition: Optional[Partition] = None
+
+    @property
+    def partition(self) -> Partition:
+        """The partition as a list of lists, with the elements of each part in the
+        order of the numbers."""
+        if self._partition is None:
+            partition: Partition = [[] for _ in range(len(self.sizes))]
+            if self._numbers is None:
+                for i, part in enumerate(_to_list(self.assignment)):
+                    partition[part].append(i)
+            else:
+                numbers = _to_list(self._numbers)
+                for i, part in enumerate(_to_list(self.assignment)):
+                    partition[part].append(numbers[i])
+            self._partition = partition
+        return self._partition
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, CompactPartitioningResult):
+            return NotImplemented
+        return (
+            _to_list(self.assignment) == _to_list(other.assignment)
+            and self.sizes == other.sizes
+            and self.proven_optimal == other.proven_optimal
+            and self.partition == other.partition
+        )
+
+    def __repr__(self) -> str:
+        return (
+            f"CompactPartitioningResult(assignment={self.assignment!r}, "
+            f"sizes={self.sizes!r}, proven_optimal={self.proven_optimal!r})"
+        )
+
+
+# The result types that the algorithms can return.
+AnyPartitioningResult = Union[PartitioningResult, CompactPartitioningResult]
+
+
+@dataclass
+class SearchStatistics:
+    """Statistics on the work done by the search of a complete algorithm.
+
+    An instance passed as ``stats`` to a complete algorithm is updated while the
+    search runs; the numbers of nodes and the improvement times are up to date
+    whenever a partition is yielded, and once the search ends.
+
+    Parameters
+    ----------
+    nodes:
+        The number of nodes of the search visited so far, as counted for the
+        ``max_nodes`` limit.
+    pruned:
+        The number of nodes discarded because a lower bound showed that they could not
+        lead to an improvement.
+    max_stack_size:
+        The largest number of entries on the stack of the search; the memory used by
+        the search grows linearly with it. For ``complete_greedy``, the entries are the
+        nodes waiting to be visited; for ``complete_karmarkar_karp``, they are the
+        nodes on the path to the current one, each holding the partitions left to
+        combine, so that this is also the maximum depth of the search, except for the
+        "beam" method, for which they are the nodes kept at one depth.
+    improvement_times:
+        The number of seconds from the start of the search until each partition was
+        found.
+    """
+
+    nodes: int = 0
+    pruned: int = 0
+    max_stack_size: int = 0
+    improvement_times: List[float] = field(default_factory=list)
+
+
+def _to_list(sequence: Sequence[Any]) -> List[Any]:
+    if isinstance(sequence, list):
+        return sequence
+    tolist = getattr(sequence, "tolist", None)
+    return tolist() if tolist is not None else list(sequence)
+
+
+def _as_array(numbers: Any) -> Any:
+    """View numbers given as a NumPy array, or as another object supporting the buffer
+    protocol such as an ``array.array``, as a one-dimensional NumPy array without
+    copying them.
+
+    Gives None if the numbers are not integers or floats given in one of these ways,
+    or if NumPy is not installed.
+    """
+    if np is None or isinstance(numbers, (list, tuple)):
+        return None
+    if not isinstance(numbers, np.ndarray):
+        try:
+            numbers = np.asarray(memoryview(numbers))
+        except (TypeError, ValueError):
+            return None
+    if numbers.ndim != 1 or numbers.dtype.kind not in "iuf":
+        return None
+    return numbers
+
+
+def _compact_result(
+    partition: Partition,
+    sizes: List[int],
+    numbers: Sequence[int],
+    return_indices: bool,
+    proven_optimal: bool = False,
+) -> CompactPartitioningResult:
+    """Turn a partition whose elements are indices into a compact result."""
+    assignment = array("l", bytes(array("l").itemsize * len(numbers)))
+    for part_index, part in enumerate(partition):
+        for i in part:
+            assignment[i] = part_index
+    return CompactPartitioningResult(
+        assignment, sizes, None if return_indices else numbers, proven_optimal
+    )
+
+
+def _perfect_difference(numbers: Sequence[Any], num_parts: int) -> float:
+    """Bound the difference between the largest and the smallest part of any partition
+    of the numbers into the given number of parts from below.
+
+    A partition reaching the bound is optimal. For integers, the parts can only have
+    equal sums if the total is divisible by the number of parts; for non-negative
+    numbers, the largest part is at least the largest number, and the smallest part
+    at most the average of the other parts, or zero if some part is empty. For floats,
+    the bound is raised by the rounding error the sums of the parts may have, so that
+    partitions are also recognized as optimal when rounding hides that they are.
+    """
+    numbers = _to_list(numbers)
+    if not numbers:
+        return 0
+    integral = all(isinstance(number, int) for number in numbers)
+    bound = _difference_bound(
+        sum(numbers), max(numbers), min(numbers), len(numbers), num_parts, integral
+    )
+    if integral:
+        return bound
+    return bound + _rounding_tolerance(len(numbers), sum(map(abs, numbers)))
+
+
+def _rounding_tolerance(num_numbers: int, magnitude: float) -> float:
+    """Bound the rounding error of sums of at most the given number of floats, whose
+    absolute values sum to at most ``magnitude``."""
+    return num_numbers * sys.float_info.epsilon * magnitude
+
+
+def _difference_bound(
+    total: float,
+    largest: float,
+    smallest: float,
+    num_numbers: int,
+    num_parts: int,
+    integral: bool,
+) -> float:
+    """Compute the bound of ``_perfect_difference`` from the total, the largest, and
+    the smallest of the numbers."""
+    if num_parts < 2:
+        return 0
+    bound: float = 1 if integral and total % num_parts else 0
+    if smallest < 0:
+        return bound
+    if num_numbers < num_parts:
+        return max(bound, largest)
+    if num_numbers == num_parts:
+        return max(bound, largest - smallest)
+    if integral:
+        return max(bound, largest - (total - largest) // (num_parts - 1))
+    return max(bound, largest - (total - largest) / (num_parts - 1))
+
+
+class _Reduction:
+    """A partitioning problem with a number that sits alone in a part taken out.
+
+    For non-negative numbers, a number at least as large as the sum of all others is
+    alone in the largest part of some partition minimizing the difference between the
+    largest and the smallest part. With three parts, what is left is to partition the
+    other numbers into two parts as evenly as possible, since maximizing the smaller of
+    two parts with a fixed total is the same as minimizing their difference; with two
+    parts, the bounds of ``_perfect_difference`` already recognize the partition
+    right away, and with more parts, the problem left is a different one, so nothing
+    is taken out in those cases.
+
+    Parameters
+    ----------
+    numbers:
+        The numbers to partition.
+    num_parts:
+        The number of parts.
+
+    Attributes
+    ----------
+    numbers:
+        The numbers left to partition.
+    num_parts:
+        The number of parts to partition them into.
+    indices:
+        The indices of the numbers left to partition among the given ones.
+    singleton:
+        The index of the number taken out, or None if there is none.
+    """
+
+    def __init__(self, numbers: List[int], num_parts: int):
+        self.numbers = numbers
+        self.num_parts = num_parts
+        self.indices: Sequence[int] = range(len(numbers))
+        self.singleton: Optional[int] = None
+        self._original = numbers
+        if num_parts != 3 or len(numbers) <= num_parts or min(numbers) < 0:
+            return
+        largest = max(self.indices, key=numbers.__getitem__)
+        if 2 * numbers[largest] < sum(numbers):
+            return
+        self.singleton = largest
+        self.indices = [i for i in self.indices if i != largest]
+        self.numbers = [numbers[i] for i in self.indices]
+        self.num_parts = 2
+
+    def target(self, target_difference: Optional[float]) -> Optional[float]:
+        """Turn a target for the difference of the given problem into one for the
+        problem left."""
+        if self.singleton is None or target_difference is None:
+            return target_difference
+        # The number taken out makes up the largest part, so the difference is that
+        # number minus the smaller of the two other parts, which is half of their
+        # total minus their difference.
+        return 2 * (target_difference - self._original[self.singleton]) + sum(
+            self.numbers
+        )
+
+    def results(
+        self,
+        results: Iterator[AnyPartitioningResult],
+        return_indices: bool,
+        compact: bool,
+    ) -> Iterator[AnyPartitioningResult]:
+        """Turn the partitions of the problem left into partitions of the given one,
+        with the number taken out in a last part of its own."""
+        if self.singleton is None:
+            yield from results
+            return
+        singleton = self.singleton
+        value = self._original[singleton]
+        result: Optional[AnyPartitioningResult] = None
+        reduced: Optional[AnyPartitioningResult] = None
+        for reduced in results:
+            sizes = reduced.sizes + [value]
+            if compact:
+                assert isinstance(reduced, CompactPartitioningResult)
+                assignment = array(
+                    "l", bytes(array("l").itemsize * len(self._original))
+                )
+                for i, part in zip(self.indices, _to_list(reduced.assignment)):
+                    assignment[i] = part
+                assignment[singleton] = len(sizes) - 1
+                result = CompactPartitioningResult(
+                    assignment,
+                    sizes,
+                    None if return_indices else self._original,
+                    reduced.proven_optimal,
+                )
+            else:
+                partition: Partition = [
+                    [self.indices[i] for i in part] if return_indices else part
+                    for part in reduced.partition
+                ]
+                partition.append([singleton if return_indices else value])
+                result = PartitioningResult(partition, sizes, reduced.proven_optimal)
+            yield result
+        # The last partition of the problem left may be marked optimal once its search
+        # is exhausted.
+        if result is not None and reduced is not None and reduced.proven_optimal:
+            result.proven_optimal = True
+
+
+class _SearchLimits:
+    """Keeps track of the limits imposed on the search of a complete algorithm.
+
+    Parameters
+    ----------
+    time_limit:
+        The number of seconds after which to stop the search, or None for no limit.
+    max_nodes:
+        The number of nodes after which to stop the search, or None for no limit.
+    target:
+        The value of the objective at which to stop the search, or None to continue
+        until an optimal partition is found.
+    stats:
+        If given, the statistics in which the search records the work it does.
+    """
+
+    def __init__(
+        self,
+        time_limit: Optional[float] = None,
+        max_nodes: Optional[int] = None,
+        target: Optional[float] = None,
+        stats: Optional[SearchStatistics] = None,
+    ):
+        self.deadline = None if time_limit is None else perf_counter() + time_limit
+        self.max_nodes = max_nodes
+        self.target = target
+        self.stats = stats
+        self.nodes = 0
+        self.stopped = False
+
+    def should_stop(self, found: bool, nodes: int = 1) -> bool:
+        """Register the visit of nodes, and check if the search should stop.
+
+        The search is never stopped before a first partition has been found; once this
+        returns True, ``stopped`` is set, so that a search that was cut short can be
+        told apart from one that finished.
+        """
+        self.nodes += nodes
+        if not found:
+            return False
+        if self.max_nodes is not None and self.nodes > self.max_nodes:
+            self.stopped = True
+        elif self.deadline is not None and perf_counter() > self.deadline:
+            self.stopped = True
+        return self.stopped
+
+    def reached(self, objective_value: float) -> bool:
+        """Check if an objective value is good enough to stop the search."""
+        return self.target is not None and objective_value <= self.target
+
+
+def _record_statistics(
+    results: Iterator[AnyPartitioningResult], limits: _SearchLimits
+) -> Iterator[AnyPartitioningResult]:
+    """Record the number of nodes and the improvement times of a search in the
+    statistics of its limits.
+
+    Only searches asked for statistics are wrapped like this, so that the others do
+    not pay for it.
+    """
+    stats = limits.stats
+    assert stats is not None
+    start = perf_counter()
+    try:
+        for result in results:
+            stats.improvement_times.append(perf_counter() - start)
+            stats.nodes = limits.nodes
+            yield result
+    finally:
+        stats.nodes = limits.nodes
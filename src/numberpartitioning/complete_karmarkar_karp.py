@@ -1,120 +1,1064 @@
 import heapq
-from itertools import count, permutations
-from math import inf
-from typing import Iterator, List, Tuple
+import multiprocessing
+import os
+from array import array
+from concurrent.futures import Future, ProcessPoolExecutor
+from functools import reduce
+from itertools import count
+from math import gcd, inf
+from queue import Empty
+from typing import TYPE_CHECKING, Any, Callable, Iterator, List, Optional, Tuple
 
-from .common import Partition, PartitioningResult
+from .common import (
+    AnyPartitioningResult,
+    CompactPartitioningResult,
+    Partition,
+    PartitioningResult,
+    SearchStatistics,
+    _perfect_difference,
+    _record_statistics,
+    _Reduction,
+    _SearchLimits,
+    _to_list,
+)
+from .dynamic_programming import _dynamic_programming
+from .karmarkar_karp import karmarkar_karp
+from .meet_in_the_middle import _horowitz_sahni, _schroeppel_shamir
+from .partition_heap import _from_items, _items, _PartitionHeap, _pop, _push
+
+if TYPE_CHECKING:
+    from multiprocessing import Queue
+    from multiprocessing.sharedctypes import Synchronized
+
+# Depth at which the parallel search hands off subtrees to worker processes, and the
+# number of seconds to wait for messages from the workers before checking limits.
+_PARALLEL_SPLIT_DEPTH = 8
+_PARALLEL_POLL_INTERVAL = 0.05
+# The largest width of the beam searches, beyond which the beam search method
+# continues depth-first, which bounds the number of nodes it holds at a time.
+_BEAM_MAX_WIDTH = 256
+# The largest numbers of numbers for which the automatic method partitions into two
+# parts with the Horowitz--Sahni and the Schroeppel--Shamir algorithms respectively.
+_HOROWITZ_SAHNI_MAX_SIZE = 40
+_SCHROEPPEL_SHAMIR_MAX_SIZE = 60
+# Before switching to these, the complete Karmarkar--Karp search is given the larger
+# of a fixed number of nodes and a fraction of 2^(n/2).
+_AUTO_MIN_SEARCH_NODES = 100
+_AUTO_SEARCH_FRACTION = 256
+# The automatic method uses dynamic programming for two parts when the square root of
+# the number of numbers times their total, divided by their greatest common divisor,
+# is at most the given number, bounding the number of bits of subset sums stored;
+# for at most 60 numbers, the number of numbers times the total must also be at most
+# the given multiple of the 2^(n/2) subset sums of the meet-in-the-middle algorithms.
+_AUTO_DP_MAX_BITS = 2**31
+_AUTO_DP_COST_RATIO = 10_000
 
 
 def complete_karmarkar_karp(
-    numbers: List[int],
+    numbers: Any,
     num_parts: int = 2,
     return_indices: bool = False,
-    method: str = "purepython",
-) -> Iterator[PartitioningResult]:
+    method: str = "auto",
+    time_limit: Optional[float] = None,
+    max_nodes: Optional[int] = None,
+    target_difference: Optional[float] = None,
+    compact: bool = False,
+    stats: Optional[SearchStatistics] = None,
+) -> Iterator[AnyPartitioningResult]:
     """Produce partitions using the complete Karmarkar--Karp algorithm.
 
+    Partitions are recognized as optimal as soon as the difference between their
+    largest and smallest part reaches a lower bound computed from the total and the
+    largest of the numbers, which ends the search. With three parts, a number at least
+    as large as all others together is put in a part of its own before searching, so
+    that only the remaining numbers are partitioned, into two parts, which "auto"
+    then does as it does for two parts.
+
     Parameters
     ----------
     numbers
-        The list of numbers to be partitioned.
+        The list of numbers to be partitioned. This may also be a NumPy array, or
+        another object supporting the buffer protocol, of integers or floats.
     num_parts
         The desired number of parts in the partition. Default: 2.
     return_indices
         If True, the elements of the parts are the indices of the corresponding entries
         of numbers; if False (default), the elements are the numbers themselves.
     method
-        Which specific implementation to use. Currently the only allowed (and default)
-        value is "purepython".
+        Which specific implementation to use. Allowed values are "auto" (default),
+        "purepython", "lds", "beam", "parallel", "horowitz_sahni",
+        "schroeppel_shamir", and "dp". "purepython" searches the tree depth-first.
+        "lds" uses limited discrepancy search, visiting the leaves in order of the
+        number of times their path deviates from the Karmarkar--Karp heuristic.
+        "beam" runs beam searches of doubling widths, keeping the most promising
+        nodes at each depth, and continues depth-first after a width of 256, so that
+        it never holds more than 512 nodes, or the depth of the tree if larger, at a
+        time. All three search the whole tree unless stopped. "parallel" splits the
+        search between processes, one for each CPU. The last three only support two
+        parts; after the Karmarkar--Karp partition, they find an optimal partition
+        directly. "horowitz_sahni" and "schroeppel_shamir" do so by matching the
+        subset sums of the two halves of the numbers, taking time proportional to
+        2^(n/2), and memory proportional to 2^(n/2) and 2^(n/4) respectively. "dp"
+        requires non-negative integers, and uses dynamic programming over the subset
+        sums, taking time proportional to n times the total of the numbers. For two
+        parts, "auto" uses "dp" when the total is small, and otherwise, for at most 60
+        numbers, gives the complete Karmarkar--Karp search as many nodes as it takes
+        to solve easy instances before switching to "horowitz_sahni" or
+        "schroeppel_shamir"; in all other cases, it uses "purepython".
+    time_limit
+        If given, the search stops after this many seconds.
+    max_nodes
+        If given, the search stops after visiting this many nodes of the search tree.
+    target_difference
+        If given, the search stops once a partition is found in which the difference
+        between the largest and the smallest part is at most this value.
+    compact
+        If True, partitions are given as ``CompactPartitioningResult``, which only
+        build the parts when they are accessed. Default: False.
+    stats
+        If given, a ``SearchStatistics`` in which to record the work done by the
+        search. The nodes pruned and the stack size are only recorded by the complete
+        Karmarkar--Karp search itself, which for "parallel" means only by its part in
+        the main process.
+
+    The limits are only checked once the first partition has been found, so at least
+    one partition is always produced.
 
     Returns
     -------
     An iterator yielding partitions represented by ``PartitioningResult`` of
-    increasing quality until an optimal partition is found.
+    increasing quality until an optimal partition is found, or one of the limits is
+    reached. If the search finishes without reaching any limits, the last partition is
+    marked as ``proven_optimal``; unless it is perfect, this only happens once the
+    iterator is advanced after the partition has been yielded, that is, once it is
+    exhausted.
 
     """
     if method not in METHODS:
         raise ValueError(
             f'Invalid method "{method}". Valid options: {", ".join(METHODS)}'
         )
-    return METHODS[method](numbers, return_indices, num_parts)
+    if method in _TWO_PART_METHODS and num_parts != 2:
+        raise ValueError("This method only supports two parts")
+    reduction = _Reduction(_to_list(numbers), num_parts)
+    limits = _SearchLimits(
+        time_limit, max_nodes, reduction.target(target_difference), stats
+    )
+    results = reduction.results(
+        METHODS[method](
+            reduction.numbers, return_indices, reduction.num_parts, limits, compact
+        ),
+        return_indices,
+        compact,
+    )
+    if stats is None:
+        return results
+    return _record_statistics(results, limits)
+
+
+def _combine_sizes(
+    sizes_1: List[int],
+    sizes_2: List[int],
+    should_stop: Optional[Callable[[], bool]] = None,
+) -> Iterator[List[int]]:
+    """Generate the ways of combining the parts of two partitions, best first.
+
+    Both lists of sizes are assumed to be sorted in increasing order. Each combination
+    is given as a list whose j'th element is the index of the part of the first
+    partition that is combined with the j'th part of the second. Combinations are
+    yielded in order of increasing difference between their largest and smallest sums,
+    and only one combination is yielded for each multiset of sums. Since parts of equal
+    size are interchangeable, the search only considers one way of choosing the parts
+    combined with each run of equal sizes, so that inputs with many equal sizes, such
+    as the partitions of few numbers into many parts, do not lead to an enumeration of
+    all their permutations.
+
+    The search is a best-first search over partial combinations, in which the parts of
+    the second partition are combined in decreasing order. The remaining parts can at
+    best be combined by pairing them in opposite orders, since this simultaneously
+    minimizes the largest sum and maximizes the smallest, which bounds the difference
+    of any completion from below; in particular, the first combination is found
+    without backtracking. If ``should_stop`` is given, it is called for every partial
+    combination considered, and the search ends once it returns True.
+    """
+    num_parts = len(sizes_1)
+    # The index of the first part in the run of equal sizes containing each part.
+    run_starts = list(range(num_parts))
+    for j in range(1, num_parts):
+        if sizes_2[j] == sizes_2[j - 1]:
+            run_starts[j] = run_starts[j - 1]
+    tiebreak = count()
+    # Elements are the lower bound, the number of parts left to combine and a tie
+    # breaker, the partial combination, the parts of the first partition not yet used,
+    # and the largest and smallest sums so far; ties are broken in favour of the most
+    # complete combinations. Initially, use the smallest and largest possible sums as
+    # largest and smallest.
+    queue: List[Tuple[int, int, int, List[int], List[int], int, int]] = [
+        (
+            0,
+            num_parts,
+            next(tiebreak),
+            [],
+            list(range(num_parts)),
+            sizes_1[0] + sizes_2[0],
+            sizes_1[-1] + sizes_2[-1],
+        )
+    ]
+    yielded = set()
+    while queue:
+        if should_stop is not None and should_stop():
+            return
+        _, _, _, combination, unused, largest, smallest = heapq.heappop(queue)
+        j = num_parts - len(combination) - 1
+        if j < 0:
+            new_sizes = tuple(
+                sorted(sizes_1[i] + size for i, size in zip(combination[::-1], sizes_2))
+            )
+            if new_sizes not in yielded:
+                yielded.add(new_sizes)
+                yield combination[::-1]
+            continue
+        # Parts of the second partition of equal size are interchangeable, so they
+        # are only combined with parts of the first partition of non-decreasing size;
+        # this requires enough parts at least as large to remain for the rest of the
+        # run.
+        smallest_allowed = -inf
+        if combination and sizes_2[j] == sizes_2[j + 1]:
+            smallest_allowed = sizes_1[combination[-1]]
+        tried = set()
+        for position, i in enumerate(unused):
+            if len(unused) - position - 1 < j - run_starts[j]:
+                break
+            if sizes_1[i] < smallest_allowed or sizes_1[i] in tried:
+                continue
+            tried.add(sizes_1[i])
+            new_sum = sizes_1[i] + sizes_2[j]
+            new_largest = max(largest, new_sum)
+            new_smallest = min(smallest, new_sum)
+            new_unused = list(unused)
+            del new_unused[position]
+            opposite_sums = [
+                sizes_1[i_2] + size for i_2, size in zip(reversed(new_unused), sizes_2)
+            ]
+            bound_largest = max(new_largest, max(opposite_sums, default=new_largest))
+            bound_smallest = min(new_smallest, min(opposite_sums, default=new_smallest))
+            heapq.heappush(
+                queue,
+                (
+                    bound_largest - bound_smallest,
+                    j,
+                    next(tiebreak),
+                    combination + [i],
+                    new_unused,
+                    new_largest,
+                    new_smallest,
+                ),
+            )
 
 
 def _combine_partitions(
-    partition_1: Partition, partition_2: Partition
+    partition_1: Partition,
+    sizes_1: List[int],
+    partition_2: Partition,
+    sizes_2: List[int],
+    should_stop: Optional[Callable[[], bool]] = None,
 ) -> Iterator[Tuple[Partition, List[int]]]:
-    yielded = set()
-    for permutation in permutations(partition_1, len(partition_1)):
-        out = sorted(sorted(p + l) for p, l in zip(permutation, partition_2))
-        out_ = tuple(tuple(el) for el in out)
-        if out_ not in yielded:
-            yielded.add(out_)
-            yield (out, [sum(x) for x in out])
+    for combination in _combine_sizes(sizes_1, sizes_2, should_stop):
+        new_sizes = [sizes_1[i] + size for i, size in zip(combination, sizes_2)]
+        indices = sorted(range(len(new_sizes)), key=new_sizes.__getitem__)
+        yield (
+            [partition_1[combination[j]] + partition_2[j] for j in indices],
+            [new_sizes[j] for j in indices],
+        )
 
 
 def _possible_partition_difference_lower_bound(
-    node: List[Tuple[int, int, Partition, List[int]]], num_parts: int
+    node: _PartitionHeap, num_parts: int
 ) -> int:
-    sizes_flattened = [size for partition in node for size in partition[3]]
-    max_sizes_flattened = max(sizes_flattened)
-    return -(
-        max_sizes_flattened
-        - (sum(sizes_flattened) - max_sizes_flattened) // (num_parts - 1)
+    return -(node.largest - (node.total - node.largest) // (num_parts - 1))
+
+
+def _root(
+    numbers: List[int], num_parts: int, heap_count: Iterator[int]
+) -> _PartitionHeap:
+    # The parts contain the indices of the numbers, which are only replaced by the
+    # numbers themselves when results are created.
+    if not numbers:
+        raise ValueError("At least one number is required")
+    root = _from_items(
+        [
+            (
+                number,
+                next(heap_count),
+                [[] for _ in range(num_parts - 1)] + [[i]],
+                [0] * (num_parts - 1) + [number],
+            )
+            for i, number in enumerate(numbers)
+        ]
+    )
+    assert root is not None
+    return root
+
+
+def _pop_two(
+    partitions: _PartitionHeap,
+) -> Tuple[Partition, List[int], Partition, List[int], Optional[_PartitionHeap]]:
+    """Take the two partitions with the largest differences from a node with at
+    least two partitions, giving them along with the remaining partitions."""
+    rest = _pop(partitions)
+    assert rest is not None
+    return (
+        partitions.partition,
+        partitions.sizes,
+        rest.partition,
+        rest.sizes,
+        _pop(rest),
     )
 
 
-def _get_indices(numbers: List[int], partition: Partition) -> Partition:
-    large_number = max(numbers) + 1
-    indices: List[List[int]] = []
-    for subpartition in partition:
-        indices.append([])
-        for x in subpartition:
-            i = numbers.index(x)
-            indices[-1].append(i)
-            numbers[i] = large_number
-    return indices
+def _search(
+    stack: List[Iterator[Tuple[int, _PartitionHeap]]],
+    num_parts: int,
+    heap_count: Iterator[int],
+    limits: _SearchLimits,
+    shared_best: Optional["Synchronized[int]"] = None,
+    split_depth: Optional[int] = None,
+    best_difference: float = inf,
+) -> Iterator[Tuple[int, _PartitionHeap]]:
+    """Search depth-first for improving partitions.
 
+    The stack contains iterators over the children of the nodes on the current path,
+    so that children are only created when they are visited. Along with each child,
+    they give a lower bound on the difference of any partition reachable from it.
 
-def _complete_karmarkar_karp_pure_python(
-    numbers: List[int], return_indices: bool, num_parts: int
-) -> Iterator[PartitioningResult]:
-    stack: List[List[Tuple[int, int, Partition, List[int]]]] = [[]]
-    heap_count = count()  # To avoid ambiguity in heaps
-    for number in numbers:
-        l: List[List[int]] = [[] for _ in range(num_parts - 1)]
-        r: List[List[int]] = [[number]]
-        this_partition: Partition = l + r
-        this_sizes: List[int] = [0] * (num_parts - 1) + [number]
-        heapq.heappush(
-            stack[0], (-number, next(heap_count), this_partition, this_sizes)
-        )
-    best = -inf
+    Leaves improving on the best partition found so far are yielded along with their
+    difference. If ``split_depth`` is given, nodes at that depth are yielded along with
+    their lower bound instead of being searched. If ``shared_best`` is given, it holds
+    the smallest difference found by any process searching the same tree. Only
+    partitions with a difference smaller than ``best_difference`` are yielded.
+    """
+    best = -best_difference
+    stats = limits.stats
     while stack:
-        partitions = stack.pop()
+        child = next(stack[-1], None)
+        if child is None:
+            stack.pop()
+            continue
+        if limits.should_stop(best > -inf):
+            return
+        if shared_best is not None and shared_best.value < _NO_SHARED_BEST:
+            best = max(best, -shared_best.value)
+        difference_lower_bound, partitions = child
+        # Children are generated in order of increasing lower bound, so if this child
+        # can not lead to an improvement, neither can any of its remaining siblings.
+        if -difference_lower_bound <= best:
+            if stats is not None:
+                stats.pruned += 1
+            stack.pop()
+            continue
         if _possible_partition_difference_lower_bound(partitions, num_parts) <= best:
+            if stats is not None:
+                stats.pruned += 1
             continue
-        if len(partitions) == 1:
-            num = partitions[0][0]
+        if partitions.size == 1:
+            num = -partitions.difference
             if num > best:
                 best = num
-                _, _, final_partition, final_sums = partitions[0]
-                if return_indices:
-                    final_partition = _get_indices(numbers[:], final_partition)
-                yield PartitioningResult(final_partition, final_sums)
-                if num == 0:
-                    return
+                yield -num, partitions
             continue
-        _, _, p1, p1_sum = heapq.heappop(partitions)
-        _, _, p2, p2_sum = heapq.heappop(partitions)
-        tmp_stack_extension = []
-        for new_partition, new_sizes in _combine_partitions(p1, p2):
-            tmp_partitions = partitions[:]
-            diff = max(new_sizes) - min(new_sizes)
-            heapq.heappush(
-                tmp_partitions, (-diff, next(heap_count), new_partition, new_sizes)
+        if len(stack) - 1 == split_depth:
+            yield difference_lower_bound, partitions
+            continue
+        p1, p1_sum, p2, p2_sum, rest = _pop_two(partitions)
+        stack.append(
+            _children(
+                rest,
+                p1,
+                p1_sum,
+                p2,
+                p2_sum,
+                heap_count,
+                # Generating a child can take a while with many parts, so the limits
+                # are also checked along the way, without counting extra nodes.
+                lambda: limits.should_stop(best > -inf, 0),
+            )
+        )
+        if stats is not None and len(stack) > stats.max_stack_size:
+            stats.max_stack_size = len(stack)
+
+
+def _limited_discrepancy_search(
+    root: _PartitionHeap,
+    num_parts: int,
+    heap_count: Iterator[int],
+    limits: _SearchLimits,
+) -> Iterator[Tuple[int, _PartitionHeap]]:
+    """Search for improving partitions with improved limited discrepancy search.
+
+    Taking any child but the first of a node, that is, deviating from the
+    Karmarkar--Karp heuristic, counts as a discrepancy. The tree is searched
+    depth-first once for each number of discrepancies, from none up to the depth of
+    the tree, each time only visiting the leaves reached with exactly that number of
+    discrepancies, so that every leaf is visited once, and the leaves closest to the
+    Karmarkar--Karp partition are visited first.
+
+    Leaves improving on the best partition found so far are yielded along with their
+    difference, as in ``_search``.
+    """
+    best = -inf
+    stats = limits.stats
+    for discrepancies in range(root.size):
+        # Elements are the children of a node still to be visited, the number of
+        # discrepancies its descendants must make, the index of the next child, and
+        # the number of levels below each child.
+        stack: List[
+            Tuple[
+                Iterator[Tuple[int, _PartitionHeap]],
+                int,
+                List[int],
+                int,
+            ]
+        ] = [(iter([(0, root)]), discrepancies, [0], root.size - 1)]
+        while stack:
+            children, budget, next_index, levels = stack[-1]
+            # All children after the first take a discrepancy.
+            if next_index[0] > 0 and budget == 0:
+                stack.pop()
+                continue
+            child = next(children, None)
+            if child is None:
+                stack.pop()
+                continue
+            is_first = next_index[0] == 0
+            next_index[0] += 1
+            if limits.should_stop(best > -inf):
+                return
+            difference_lower_bound, partitions = child
+            if -difference_lower_bound <= best:
+                if stats is not None:
+                    stats.pruned += 1
+                stack.pop()
+                continue
+            child_budget = budget if is_first else budget - 1
+            if child_budget > levels:
+                # The discrepancies can not all be made below this child.
+                continue
+            if (
+                _possible_partition_difference_lower_bound(partitions, num_parts)
+                <= best
+            ):
+                if stats is not None:
+                    stats.pruned += 1
+                continue
+            if partitions.size == 1:
+                num = -partitions.difference
+                if num > best:
+                    best = num
+                    yield -num, partitions
+                continue
+            p1, p1_sum, p2, p2_sum, rest = _pop_two(partitions)
+            stack.append(
+                (
+                    _children(
+                        rest,
+                        p1,
+                        p1_sum,
+                        p2,
+                        p2_sum,
+                        heap_count,
+                        lambda: limits.should_stop(best > -inf, 0),
+                    ),
+                    child_budget,
+                    [0],
+                    levels - 1,
+                )
             )
-            tmp_stack_extension.append(tmp_partitions)
-        stack.extend(sorted(tmp_stack_extension))
+            if stats is not None and len(stack) > stats.max_stack_size:
+                stats.max_stack_size = len(stack)
+
+
+def _beam_search(
+    root: _PartitionHeap,
+    num_parts: int,
+    heap_count: Iterator[int],
+    limits: _SearchLimits,
+) -> Iterator[Tuple[int, _PartitionHeap]]:
+    """Search for improving partitions with beam searches of increasing width.
+
+    Each beam search goes through the tree one level at a time, keeping only the
+    children whose partitions have the smallest sum of differences, up to the width of
+    the beam, so that it holds at most twice the width of nodes at a time. This is the
+    sum that the Karmarkar--Karp heuristic keeps small, and it bounds the difference
+    of the best partition reachable from a node from above. A beam search which never
+    had to drop a child has searched the whole tree; otherwise, the width is doubled.
+    Once the width would exceed ``_BEAM_MAX_WIDTH``, the remaining tree is searched
+    depth-first, only looking for partitions improving on those already found.
+
+    Leaves improving on the best partition found so far are yielded along with their
+    difference, as in ``_search``.
+    """
+    best = -inf
+    stats = limits.stats
+    tiebreak = count()
+    width = 1
+    while width <= _BEAM_MAX_WIDTH:
+        dropped = False
+        level = [root]
+        while level and level[0].size > 1:
+            # The children kept so far, as a heap with the largest sum of differences,
+            # or spread, on top.
+            kept: List[Tuple[int, int, _PartitionHeap]] = []
+            for partitions in level:
+                p1, p1_sum, p2, p2_sum, rest = _pop_two(partitions)
+                for i, (difference_lower_bound, child) in enumerate(
+                    _children(
+                        rest,
+                        p1,
+                        p1_sum,
+                        p2,
+                        p2_sum,
+                        heap_count,
+                        lambda: limits.should_stop(best > -inf, 0),
+                    )
+                ):
+                    if i == width:
+                        # No more children of a node can be kept than the width.
+                        dropped = True
+                        break
+                    if limits.should_stop(best > -inf):
+                        return
+                    if -difference_lower_bound <= best:
+                        if stats is not None:
+                            stats.pruned += 1
+                        break
+                    if (
+                        _possible_partition_difference_lower_bound(child, num_parts)
+                        <= best
+                    ):
+                        if stats is not None:
+                            stats.pruned += 1
+                        continue
+                    spread = child.difference_sum
+                    if len(kept) == width:
+                        dropped = True
+                        if spread >= -kept[0][0]:
+                            continue
+                        heapq.heapreplace(kept, (-spread, next(tiebreak), child))
+                    else:
+                        heapq.heappush(kept, (-spread, next(tiebreak), child))
+            level = [child for _, _, child in kept]
+            if stats is not None and len(level) > stats.max_stack_size:
+                stats.max_stack_size = len(level)
+        for partitions in level:
+            num = -partitions.difference
+            if num > best:
+                best = num
+                yield -num, partitions
+        if not dropped:
+            return
+        width *= 2
+    yield from _search(
+        [iter([(0, root)])],
+        num_parts,
+        heap_count,
+        limits,
+        best_difference=-best,
+    )
+
+
+def _to_result(
+    numbers: List[int],
+    order: List[int],
+    return_indices: bool,
+    partitions: _PartitionHeap,
+    compact: bool = False,
+    perfect_difference: float = 0,
+) -> AnyPartitioningResult:
+    """Create the result for a leaf, whose parts contain indices of numbers.
+
+    In the partition, the elements of each part are sorted, using that ``order``
+    contains the indices of the numbers sorted by the numbers, so that this takes
+    linear time. The result is marked as optimal if its difference is at most
+    ``perfect_difference``.
+    """
+    proven_optimal = partitions.difference <= perfect_difference
+    final_partition = partitions.partition
+    final_sums = partitions.sizes
+    assignment = array("l", bytes(array("l").itemsize * len(numbers)))
+    for part_index, part in enumerate(final_partition):
+        for i in part:
+            assignment[i] = part_index
+    if compact:
+        return CompactPartitioningResult(
+            assignment,
+            final_sums,
+            None if return_indices else numbers,
+            proven_optimal,
+        )
+    partition: Partition = [[] for _ in final_partition]
+    if return_indices:
+        for i, part_index in enumerate(assignment):
+            partition[part_index].append(i)
+    else:
+        for i in order:
+            partition[assignment[i]].append(numbers[i])
+    return PartitioningResult(partition, final_sums, proven_optimal)
+
+
+def _complete_karmarkar_karp_pure_python(
+    numbers: List[int],
+    return_indices: bool,
+    num_parts: int,
+    limits: _SearchLimits,
+    compact: bool = False,
+) -> Iterator[AnyPartitioningResult]:
+    return _complete_karmarkar_karp_with_search(
+        numbers,
+        return_indices,
+        num_parts,
+        limits,
+        compact,
+        lambda root, num_parts, heap_count, limits: _search(
+            [iter([(0, root)])], num_parts, heap_count, limits
+        ),
+    )
+
+
+def _complete_karmarkar_karp_lds(
+    numbers: List[int],
+    return_indices: bool,
+    num_parts: int,
+    limits: _SearchLimits,
+    compact: bool = False,
+) -> Iterator[AnyPartitioningResult]:
+    return _complete_karmarkar_karp_with_search(
+        numbers,
+        return_indices,
+        num_parts,
+        limits,
+        compact,
+        _limited_discrepancy_search,
+    )
+
+
+def _complete_karmarkar_karp_beam(
+    numbers: List[int],
+    return_indices: bool,
+    num_parts: int,
+    limits: _SearchLimits,
+    compact: bool = False,
+) -> Iterator[AnyPartitioningResult]:
+    return _complete_karmarkar_karp_with_search(
+        numbers, return_indices, num_parts, limits, compact, _beam_search
+    )
+
+
+def _complete_karmarkar_karp_with_search(
+    numbers: List[int],
+    return_indices: bool,
+    num_parts: int,
+    limits: _SearchLimits,
+    compact: bool,
+    search: Callable[
+        [_PartitionHeap, int, Iterator[int], _SearchLimits],
+        Iterator[Tuple[int, _PartitionHeap]],
+    ],
+) -> Iterator[AnyPartitioningResult]:
+    """Turn the leaves found by a search of the whole tree, starting from the root,
+    into results."""
+    heap_count = count()  # To avoid ambiguity in heaps
+    root = _root(numbers, num_parts, heap_count)
+    order = sorted(range(len(numbers)), key=numbers.__getitem__)
+    perfect_difference = _perfect_difference(numbers, num_parts)
+    result: Optional[AnyPartitioningResult] = None
+    for difference, partitions in search(root, num_parts, heap_count, limits):
+        result = _to_result(
+            numbers, order, return_indices, partitions, compact, perfect_difference
+        )
+        yield result
+        if result.proven_optimal or limits.reached(difference):
+            return
+    # The search space has been exhausted, so the last partition found is optimal.
+    if result is not None and not limits.stopped:
+        result.proven_optimal = True
+
+
+# The smallest difference found by the processes of a parallel search is shared as a
+# 64-bit integer, so differences that do not fit are not shared.
+_NO_SHARED_BEST = 2**63 - 1
+# The state shared between the processes of a parallel search; in worker processes,
+# this is set up by _initialize_worker.
+_worker_state: Optional[
+    Tuple[
+        "Queue[Optional[Tuple[int, _PartitionHeap]]]",
+        "Synchronized[int]",
+        "Synchronized[int]",
+        "Synchronized[bool]",
+    ]
+] = None
+
+
+def _initialize_worker(
+    queue: "Queue[Optional[Tuple[int, _PartitionHeap]]]",
+    shared_best: "Synchronized[int]",
+    shared_nodes: "Synchronized[int]",
+    stop: "Synchronized[bool]",
+) -> None:
+    global _worker_state
+    # Messages left behind when the search is stopped are of no interest, so do not
+    # let them keep the worker from exiting.
+    queue.cancel_join_thread()
+    _worker_state = (queue, shared_best, shared_nodes, stop)
+
+
+class _WorkerSearchLimits(_SearchLimits):
+    """Search limits for worker processes; these report the number of nodes visited
+    to the main process, and stop once the main process tells them to."""
+
+    _REPORT_INTERVAL = 1024
+
+    def should_stop(self, found: bool, nodes: int = 1) -> bool:
+        assert _worker_state is not None
+        _, _, shared_nodes, stop = _worker_state
+        self.nodes += nodes
+        if self.nodes >= self._REPORT_INTERVAL:
+            with shared_nodes.get_lock():
+                shared_nodes.value += self.nodes
+            self.nodes = 0
+        self.stopped = bool(stop.value)
+        return self.stopped
+
+
+def _search_subtree(
+    difference_lower_bound: int,
+    partitions: _PartitionHeap,
+    num_parts: int,
+) -> None:
+    assert _worker_state is not None
+    queue, shared_best, _, _ = _worker_state
+    heap_count = count(max(item[1] for item in _items(partitions)) + 1)
+    try:
+        for difference, leaf in _search(
+            [iter([(difference_lower_bound, partitions)])],
+            num_parts,
+            heap_count,
+            _WorkerSearchLimits(),
+            shared_best,
+        ):
+            with shared_best.get_lock():
+                if difference < shared_best.value:
+                    shared_best.value = difference
+            queue.put((difference, leaf))
+    finally:
+        # Tell the main process that the subtree has been searched.
+        queue.put(None)
+
+
+def _complete_karmarkar_karp_parallel(
+    numbers: List[int],
+    return_indices: bool,
+    num_parts: int,
+    limits: _SearchLimits,
+    compact: bool = False,
+) -> Iterator[AnyPartitioningResult]:
+    num_workers = os.cpu_count() or 1
+    queue: "Queue[Optional[Tuple[int, _PartitionHeap]]]"
+    queue = multiprocessing.Queue()
+    shared_best = multiprocessing.Value("q", _NO_SHARED_BEST)
+    shared_nodes = multiprocessing.Value("q", 0)
+    stop = multiprocessing.Value("b", False)
+    heap_count = count()
+    root = _root(numbers, num_parts, heap_count)
+    order = sorted(range(len(numbers)), key=numbers.__getitem__)
+    perfect_difference = _perfect_difference(numbers, num_parts)
+    # The top levels of the tree are searched by the main process, handing off nodes
+    # at the split depth to the workers as subtrees to be searched independently;
+    # only a limited number of subtrees are handed off at a time, so that the workers
+    # benefit from the improvements made along the way.
+    split_depth = min(len(numbers) - 1, _PARALLEL_SPLIT_DEPTH)
+    frontier: Optional[Iterator[Tuple[int, _PartitionHeap]]] = _search(
+        [iter([(0, root)])],
+        num_parts,
+        heap_count,
+        _SearchLimits(stats=limits.stats),
+        shared_best,
+        split_depth,
+    )
+    best = _NO_SHARED_BEST
+    result: Optional[AnyPartitioningResult] = None
+    futures: List["Future[None]"] = []
+    num_searching = 0
+    reported_nodes = 0
+    with ProcessPoolExecutor(
+        num_workers,
+        initializer=_initialize_worker,
+        initargs=(queue, shared_best, shared_nodes, stop),
+    ) as executor:
+        try:
+            while frontier is not None or num_searching:
+                leaves = []
+                while frontier is not None and num_searching < 2 * num_workers:
+                    node = next(frontier, None)
+                    if node is None:
+                        frontier = None
+                    elif node[1].size == 1:
+                        leaves.append(node)
+                    else:
+                        futures.append(
+                            executor.submit(_search_subtree, *node, num_parts)
+                        )
+                        num_searching += 1
+                if not leaves:
+                    # Workers send None once they are done with a subtree; a timeout
+                    # only means that no messages have arrived yet.
+                    try:
+                        message = queue.get(timeout=_PARALLEL_POLL_INTERVAL)
+                    except Empty:
+                        pass
+                    else:
+                        if message is None:
+                            num_searching -= 1
+                        else:
+                            leaves.append(message)
+                for difference, partitions in leaves:
+                    if difference >= best:
+                        continue
+                    best = difference
+                    with shared_best.get_lock():
+                        shared_best.value = min(shared_best.value, difference)
+                    result = _to_result(
+                        numbers,
+                        order,
+                        return_indices,
+                        partitions,
+                        compact,
+                        perfect_difference,
+                    )
+                    yield result
+                    if result.proven_optimal or limits.reached(difference):
+                        return
+                for future in futures:
+                    if future.done() and future.exception() is not None:
+                        raise future.exception()  # type: ignore[misc]
+                futures = [future for future in futures if not future.done()]
+                nodes = shared_nodes.value
+                if limits.should_stop(result is not None, nodes - reported_nodes):
+                    return
+                reported_nodes = nodes
+        finally:
+            stop.value = True
+            for future in futures:
+                future.cancel()
+    # The search space has been exhausted, so the last partition found is optimal.
+    if result is not None:
+        result.proven_optimal = True
+
+
+def _children(
+    partitions: Optional[_PartitionHeap],
+    p1: Partition,
+    p1_sum: List[int],
+    p2: Partition,
+    p2_sum: List[int],
+    heap_count: Iterator[int],
+    should_stop: Optional[Callable[[], bool]] = None,
+) -> Iterator[Tuple[int, _PartitionHeap]]:
+    # Combining a partition with another can decrease the difference between its
+    # largest and smallest parts by at most the difference of the other partition, so
+    # the remaining partitions can only decrease the difference of the new one by the
+    # sum of their differences.
+    remaining_difference = 0 if partitions is None else partitions.difference_sum
+    for new_partition, new_sizes in _combine_partitions(
+        p1, p1_sum, p2, p2_sum, should_stop
+    ):
+        diff = new_sizes[-1] - new_sizes[0]
+        yield diff - remaining_difference, _push(
+            partitions, diff, next(heap_count), new_partition, new_sizes
+        )
+
+
+def _complete_karmarkar_karp_two_way(
+    numbers: List[int],
+    return_indices: bool,
+    num_parts: int,
+    limits: _SearchLimits,
+    compact: bool = False,
+    solve: Callable[
+        [List[int], _SearchLimits, float], Optional[List[int]]
+    ] = _horowitz_sahni,
+    max_search_nodes: int = 0,
+) -> Iterator[AnyPartitioningResult]:
+    """Partition into two parts by searching at most the given number of nodes with
+    the complete Karmarkar--Karp algorithm, and then, unless that search finishes,
+    finding an optimal partition by finding the subset with the sum closest to half of
+    the total with ``solve``.
+
+    Without any nodes to search, the first partition is found with the
+    Karmarkar--Karp algorithm itself, which avoids creating the nodes on the way to
+    the first leaf of the search, each of which holds all remaining partitions.
+    """
+    order = sorted(range(len(numbers)), key=numbers.__getitem__)
+    result: Optional[AnyPartitioningResult] = None
+    if max_search_nodes:
+        search_limits = _SearchLimits(
+            None, max_search_nodes, limits.target, limits.stats
+        )
+        search_limits.deadline = limits.deadline
+        if limits.max_nodes is not None:
+            search_limits.max_nodes = min(max_search_nodes, limits.max_nodes)
+        for result in _complete_karmarkar_karp_pure_python(
+            numbers, return_indices, num_parts, search_limits, compact
+        ):
+            limits.nodes = search_limits.nodes
+            yield result
+        limits.nodes = search_limits.nodes
+    else:
+        parts = karmarkar_karp(numbers, num_parts, return_indices=True).partition
+        result = _two_way_result(
+            numbers,
+            order,
+            parts,
+            return_indices,
+            compact,
+            _perfect_difference(numbers, num_parts),
+        )
+        yield result
+    assert result is not None
+    difference = max(result.sizes) - min(result.sizes)
+    if (
+        result.proven_optimal
+        or limits.reached(difference)
+        or limits.should_stop(True, 0)
+    ):
+        return
+    subset = solve(numbers, limits, difference)
+    if limits.stopped:
+        return
+    if subset is None:
+        # No partition has a smaller difference.
+        result.proven_optimal = True
+        return
+    chosen = set(subset)
+    parts = [subset, [i for i in range(len(numbers)) if i not in chosen]]
+    result = _two_way_result(numbers, order, parts, return_indices, compact)
+    result.proven_optimal = True
+    yield result
+
+
+def _two_way_result(
+    numbers: List[int],
+    order: List[int],
+    parts: Partition,
+    return_indices: bool,
+    compact: bool,
+    perfect_difference: float = 0,
+) -> AnyPartitioningResult:
+    """Create the result for two parts containing indices of numbers, ordering the
+    parts by size as in the leaves of the search."""
+    sizes = [sum(numbers[i] for i in part) for part in parts]
+    if sizes[1] < sizes[0]:
+        parts = parts[::-1]
+        sizes = sizes[::-1]
+    leaf = _PartitionHeap(sizes[1] - sizes[0], 0, parts, sizes)
+    return _to_result(numbers, order, return_indices, leaf, compact, perfect_difference)
+
+
+def _complete_karmarkar_karp_horowitz_sahni(
+    numbers: List[int],
+    return_indices: bool,
+    num_parts: int,
+    limits: _SearchLimits,
+    compact: bool = False,
+) -> Iterator[AnyPartitioningResult]:
+    return _complete_karmarkar_karp_two_way(
+        numbers, return_indices, num_parts, limits, compact, _horowitz_sahni
+    )
+
+
+def _complete_karmarkar_karp_schroeppel_shamir(
+    numbers: List[int],
+    return_indices: bool,
+    num_parts: int,
+    limits: _SearchLimits,
+    compact: bool = False,
+) -> Iterator[AnyPartitioningResult]:
+    return _complete_karmarkar_karp_two_way(
+        numbers, return_indices, num_parts, limits, compact, _schroeppel_shamir
+    )
+
+
+def _complete_karmarkar_karp_dp(
+    numbers: List[int],
+    return_indices: bool,
+    num_parts: int,
+    limits: _SearchLimits,
+    compact: bool = False,
+) -> Iterator[AnyPartitioningResult]:
+    if not all(isinstance(number, int) and number >= 0 for number in numbers):
+        raise ValueError("Dynamic programming requires non-negative integers")
+    return _complete_karmarkar_karp_two_way(
+        numbers, return_indices, num_parts, limits, compact, _dynamic_programming
+    )
+
+
+def _complete_karmarkar_karp_auto(
+    numbers: List[int],
+    return_indices: bool,
+    num_parts: int,
+    limits: _SearchLimits,
+    compact: bool = False,
+) -> Iterator[AnyPartitioningResult]:
+    if num_parts != 2:
+        return _complete_karmarkar_karp_pure_python(
+            numbers, return_indices, num_parts, limits, compact
+        )
+    if _auto_uses_dp(numbers, num_parts):
+        return _complete_karmarkar_karp_two_way(
+            numbers, return_indices, num_parts, limits, compact, _dynamic_programming
+        )
+    if len(numbers) > _SCHROEPPEL_SHAMIR_MAX_SIZE:
+        return _complete_karmarkar_karp_pure_python(
+            numbers, return_indices, num_parts, limits, compact
+        )
+    if len(numbers) <= _HOROWITZ_SAHNI_MAX_SIZE:
+        solve = _horowitz_sahni
+    else:
+        solve = _schroeppel_shamir
+    # Instances with many perfect partitions are solved by the complete
+    # Karmarkar--Karp search after a few nodes; on others, the meet-in-the-middle
+    # algorithms win, so the search is only given a fraction of the number of subset
+    # sums they consider.
+    max_search_nodes = max(
+        _AUTO_MIN_SEARCH_NODES, 2 ** (len(numbers) // 2) // _AUTO_SEARCH_FRACTION
+    )
+    return _complete_karmarkar_karp_two_way(
+        numbers, return_indices, num_parts, limits, compact, solve, max_search_nodes
+    )
+
+
+def _auto_uses_dp(numbers: List[int], num_parts: int) -> bool:
+    """Check if the automatic method uses dynamic programming."""
+    if num_parts != 2:
+        return False
+    if not all(isinstance(number, int) and number >= 0 for number in numbers):
+        return False
+    reduced_total = sum(numbers) // (reduce(gcd, numbers, 0) or 1)
+    if len(numbers) ** 0.5 * reduced_total > _AUTO_DP_MAX_BITS:
+        return False
+    return len(numbers) > _SCHROEPPEL_SHAMIR_MAX_SIZE or len(
+        numbers
+    ) * reduced_total <= _AUTO_DP_COST_RATIO * 2 ** (len(numbers) // 2)
 
 
-METHODS = {"purepython": _complete_karmarkar_karp_pure_python}
+METHODS = {
+    "auto": _complete_karmarkar_karp_auto,
+    "purepython": _complete_karmarkar_karp_pure_python,
+    "lds": _complete_karmarkar_karp_lds,
+    "beam": _complete_karmarkar_karp_beam,
+    "parallel": _complete_karmarkar_karp_parallel,
+    "horowitz_sahni": _complete_karmarkar_karp_horowitz_sahni,
+    "schroeppel_shamir": _complete_karmarkar_karp_schroeppel_shamir,
+    "dp": _complete_karmarkar_karp_dp,
+}
+# The methods which only partition into two parts.
+_TWO_PART_METHODS = ("horowitz_sahni", "schroeppel_shamir", "dp")
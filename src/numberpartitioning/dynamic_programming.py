@@ -0,0 +1,62 @@
+from functools import reduce
+from math import gcd
+from typing import List, Optional
+
+from .common import _SearchLimits
+
+
+def _dynamic_programming(
+    numbers: List[int], limits: _SearchLimits, best_difference: float
+) -> Optional[List[int]]:
+    """Find a subset of non-negative integers whose sum is as close as possible to half
+    of the total, using dynamic programming over the subset sums.
+
+    The subset sums up to half of the total that can be formed from the first numbers
+    are kept as the bits of a Python integer, to which each number is added with a
+    single shift. The subset is found by going back through the numbers, each being
+    in the subset if the sum left to form could not be formed without it; to avoid
+    storing the subset sums after every number, they are only stored after every
+    block of about the square root of the number of numbers, and recomputed from these
+    one block at a time. This takes time proportional to the number of numbers times
+    the total divided by the word size; to keep the total small, the numbers are first
+    divided by their greatest common divisor.
+
+    Returns the indices of the numbers in the subset, if the difference between the
+    sums of the subset and the remaining numbers is smaller than ``best_difference``,
+    and None otherwise, or if the search is stopped by the limits.
+    """
+    divisor = reduce(gcd, numbers, 0) or 1
+    numbers = [number // divisor for number in numbers]
+    total = sum(numbers)
+    half = total // 2
+    mask = (1 << (half + 1)) - 1
+    block = max(1, int(len(numbers) ** 0.5))
+    checkpoints = []
+    reachable = 1
+    num_used = 0
+    for number in numbers:
+        if limits.should_stop(True):
+            return None
+        if num_used % block == 0:
+            checkpoints.append(reachable)
+        reachable = (reachable | reachable << number) & mask
+        num_used += 1
+        if reachable >> half:
+            # No subset can get closer to half of the total.
+            break
+    subset_sum = reachable.bit_length() - 1
+    if (total - 2 * subset_sum) * divisor >= best_difference:
+        return None
+    subset = []
+    for start in reversed(range(0, num_used, block)):
+        end = min(start + block, num_used)
+        last = end - 1
+        # The subset sums that can be formed before each number of the block.
+        before = [checkpoints[start // block]]
+        for number in numbers[start:last]:
+            before.append((before[-1] | before[-1] << number) & mask)
+        for i in reversed(range(start, end)):
+            if not before[i - start] >> subset_sum & 1:
+                subset.append(i)
+                subset_sum -= numbers[i]
+    return subset
@@ -1,49 +1,208 @@
+import heapq
+from array import array
+from itertools import accumulate
 from math import inf
-from typing import Callable, Iterator, List, Optional, Tuple
+from typing import Any, Callable, Iterator, List, Optional, Tuple
 
-from .common import Partition, PartitioningResult
+from .common import (
+    AnyPartitioningResult,
+    CompactPartitioningResult,
+    Partition,
+    PartitioningResult,
+    SearchStatistics,
+    _as_array,
+    _compact_result,
+    _difference_bound,
+    _perfect_difference,
+    _record_statistics,
+    _Reduction,
+    _rounding_tolerance,
+    _SearchLimits,
+    _to_list,
+)
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None  # type: ignore[assignment]
+
+# The NumPy implementation of greedy hands over to a heap once it can no longer add
+# numbers to at least this fraction of the parts at a time.
+_NUMPY_MIN_BLOCK_FRACTION = 1 / 16
 
 
 def greedy(
-    numbers: List[int], num_parts: int = 2, return_indices: bool = False
-) -> PartitioningResult:
+    numbers: Any,
+    num_parts: int = 2,
+    return_indices: bool = False,
+    compact: bool = False,
+) -> AnyPartitioningResult:
     """Produce a partition using the greedy algorithm.
 
     Concretely, this orders the input numbers in descending order, then adds them to
     the parts one at a time, each time adding the number to the currently smallest
-    part.
+    part, keeping the parts in a heap ordered by their sums.
 
     Parameters
     ----------
     numbers
-        The list of numbers to be partitioned.
+        The list of numbers to be partitioned. This may also be a NumPy array, or
+        another object supporting the buffer protocol such as an ``array.array``, of
+        integers or floats, in which case the numbers are read without copying them,
+        sorted, and, as far as possible, added to the parts many at a time with NumPy.
     num_parts
         The desired number of parts in the partition. Default: 2.
     return_indices
         If True, the elements of the parts are the indices of the corresponding entries
         of numbers; if False (default), the elements are the numbers themselves.
+    compact
+        If True, the partition is returned as a ``CompactPartitioningResult``, which
+        only builds the parts when they are accessed. Default: False.
 
     Returns
     -------
-    A partition representing by a ``PartitioningResult``.
+    A partition representing by a ``PartitioningResult``, or by a
+    ``CompactPartitioningResult`` if ``compact`` is True. The partition is marked as
+    ``proven_optimal`` if the difference between its largest and smallest part reaches
+    a lower bound computed from the total and the extremes of the numbers.
 
     """
+    values = _numpy_values(numbers)
+    if values is not None:
+        return _greedy_numpy(numbers, values, num_parts, return_indices, compact)
     sorted_numbers = sorted(enumerate(numbers), key=lambda x: x[1], reverse=True)
-    sums = [0] * num_parts
+    # The heap contains the sums of the parts along with their indices, so that ties
+    # are broken in favour of the first part.
+    heap = [(0, part) for part in range(num_parts)]
+    if compact:
+        assignment = array("l", bytes(array("l").itemsize * len(numbers)))
+        for index, number in sorted_numbers:
+            size, smallest = heap[0]
+            heapq.heapreplace(heap, (size + number, smallest))
+            assignment[index] = smallest
+        sizes = _heap_sizes(heap)
+        return CompactPartitioningResult(
+            assignment,
+            sizes,
+            None if return_indices else numbers,
+            max(sizes) - min(sizes) <= _perfect_difference(numbers, num_parts),
+        )
     partition: Partition = [[] for _ in range(num_parts)]
     for index, number in sorted_numbers:
-        smallest = min(range(len(sums)), key=sums.__getitem__)
-        sums[smallest] += number
+        size, smallest = heap[0]
+        heapq.heapreplace(heap, (size + number, smallest))
         partition[smallest].append(index if return_indices else number)
-    return PartitioningResult(partition, sums)
+    sizes = _heap_sizes(heap)
+    return PartitioningResult(
+        partition,
+        sizes,
+        max(sizes) - min(sizes) <= _perfect_difference(numbers, num_parts),
+    )
+
+
+def _heap_sizes(heap: List[Tuple[int, int]]) -> List[int]:
+    sizes = [0] * len(heap)
+    for size, part in heap:
+        sizes[part] = size
+    return sizes
+
+
+def _numpy_values(numbers: Any) -> Any:
+    """View the numbers as a NumPy array of int64 or float64, if they are given as an
+    array of integers whose sums fit in int64, or of floats; otherwise, give None."""
+    values = _as_array(numbers)
+    if values is None or not values.size:
+        return None
+    if values.dtype.kind == "f":
+        return values.astype(np.float64, copy=False)
+    largest = max(int(values.max()), -int(values.min()))
+    if largest * values.size >= 2**63:
+        return None
+    return values.astype(np.int64, copy=False)
+
+
+def _greedy_numpy(
+    numbers: Any, values: Any, num_parts: int, return_indices: bool, compact: bool
+) -> AnyPartitioningResult:
+    num_numbers = values.size
+    # Sort stably, so that equal numbers are added in the same order as in the pure
+    # Python implementation.
+    order = np.argsort(-values, kind="stable")
+    sorted_values = values[order]
+    sums = np.zeros(num_parts, dtype=values.dtype)
+    part_indices = np.arange(num_parts)
+    # The part each number in sorted_values is added to.
+    parts = np.empty(num_numbers, dtype=np.intp)
+    position = 0
+    while position < num_numbers:
+        # With the parts ordered by their sums, the next numbers can be added to the
+        # parts in that order for as long as each part is strictly smaller than the
+        # ones already added to; ties are left to the next round, which orders them
+        # by index.
+        by_size = np.lexsort((part_indices, sums))
+        end = min(position + num_parts, num_numbers)
+        block = end - position
+        old_sums = sums[by_size[:block]]
+        new_sums = old_sums + sorted_values[position:end]
+        smallest_new_sums = np.minimum.accumulate(new_sums)
+        conflicts = np.flatnonzero(old_sums[1:] >= smallest_new_sums[:-1])
+        if conflicts.size:
+            block = int(conflicts[0]) + 1
+            end = position + block
+        sums[by_size[:block]] = new_sums[:block]
+        parts[position:end] = by_size[:block]
+        position = end
+        if block < num_parts * _NUMPY_MIN_BLOCK_FRACTION:
+            break
+    if position < num_numbers:
+        heap = [(size, part) for part, size in enumerate(sums.tolist())]
+        heapq.heapify(heap)
+        remaining_parts = []
+        for number in sorted_values[position:].tolist():
+            size, smallest = heap[0]
+            heapq.heapreplace(heap, (size + number, smallest))
+            remaining_parts.append(smallest)
+        parts[position:] = remaining_parts
+        sums = np.array(_heap_sizes(heap), dtype=values.dtype)
+    sizes = sums.tolist()
+    integral = values.dtype.kind == "i"
+    perfect_difference = _difference_bound(
+        values.sum().item(),
+        sorted_values[0].item(),
+        sorted_values[-1].item(),
+        num_numbers,
+        num_parts,
+        integral,
+    )
+    if not integral:
+        perfect_difference += _rounding_tolerance(
+            num_numbers, np.abs(values).sum().item()
+        )
+    proven_optimal = max(sizes) - min(sizes) <= perfect_difference
+    if compact:
+        assignment = np.empty(num_numbers, dtype=np.intp)
+        assignment[order] = parts
+        return CompactPartitioningResult(
+            assignment, sizes, None if return_indices else numbers, proven_optimal
+        )
+    partition: Partition = [[] for _ in range(num_parts)]
+    elements = order if return_indices else sorted_values
+    for element, part in zip(elements.tolist(), parts.tolist()):
+        partition[part].append(element)
+    return PartitioningResult(partition, sizes, proven_optimal)
 
 
 def complete_greedy(
-    numbers: List[int],
+    numbers: Any,
     num_parts: int = 2,
     return_indices: bool = False,
     objective: Optional[Callable[[Partition], float]] = None,
-) -> Iterator[PartitioningResult]:
+    time_limit: Optional[float] = None,
+    max_nodes: Optional[int] = None,
+    target_difference: Optional[float] = None,
+    compact: bool = False,
+    stats: Optional[SearchStatistics] = None,
+) -> Iterator[AnyPartitioningResult]:
     """Generate partition using the order from the greedy algorithm.
 
     Concretely, this searches through all combinations by following the strategy that
@@ -52,12 +211,19 @@ def complete_greedy(
     input numbers are shuffled between different parts before larger input numbers are.
 
     New partitions are yielded whenever an improvement is found, according to an
-    optional objective function.
+    optional objective function. For the default objective, subtrees that can not
+    contain an improvement, as well as subtrees that are symmetric to ones already
+    searched, are skipped, and the search ends as soon as a perfect partition is found.
+    Among the subtrees skipped are those that only differ in which of several equal
+    numbers are added to which parts, so that each way of distributing the copies of
+    a number between the parts is searched once; and with three parts, a number at
+    least as large as all others together is put in a part of its own right away.
 
     Parameters
     ----------
     numbers
-        The list of numbers to be partitioned.
+        The list of numbers to be partitioned. This may also be a NumPy array, or
+        another object supporting the buffer protocol, of integers or floats.
     num_parts
         The desired number of parts in the partition. Default: 2.
     return_indices
@@ -66,20 +232,94 @@ def complete_greedy(
     objective
         The objective function to be minimized. If None (default), this is the
         difference between the size of the largest part and the smallest part.
+    time_limit
+        If given, the search stops after this many seconds.
+    max_nodes
+        If given, the search stops after visiting this many nodes of the search tree.
+    target_difference
+        If given, the search stops once a partition is found whose objective value is
+        at most this value.
+    compact
+        If True, partitions are given as ``CompactPartitioningResult``, which only
+        build the parts when they are accessed. Default: False.
+    stats
+        If given, a ``SearchStatistics`` in which to record the work done by the
+        search.
+
+    The limits are only checked once the first partition has been found, so at least
+    one partition is always produced.
 
     Yields
     ------
     Partitions represented by a ``PartitioningResult`` whenever a new best is found.
+    If the search finishes without reaching any limits, the last partition is marked
+    as ``proven_optimal``; unless it is perfect, this only happens once the iterator
+    is advanced after the partition has been yielded, that is, once it is exhausted.
 
     """
+    numbers = _to_list(numbers)
+    if objective is not None:
+        limits = _SearchLimits(time_limit, max_nodes, target_difference, stats)
+        results = _complete_greedy(
+            numbers, num_parts, return_indices, objective, limits, compact
+        )
+    else:
+        reduction = _Reduction(numbers, num_parts)
+        limits = _SearchLimits(
+            time_limit, max_nodes, reduction.target(target_difference), stats
+        )
+        results = reduction.results(
+            _complete_greedy(
+                reduction.numbers,
+                reduction.num_parts,
+                return_indices,
+                objective,
+                limits,
+                compact,
+            ),
+            return_indices,
+            compact,
+        )
+    if stats is None:
+        return results
+    return _record_statistics(results, limits)
+
+
+def _complete_greedy(
+    numbers: List[int],
+    num_parts: int,
+    return_indices: bool,
+    objective: Optional[Callable[[Partition], float]],
+    limits: _SearchLimits,
+    compact: bool,
+) -> Iterator[AnyPartitioningResult]:
     sorted_numbers = sorted(enumerate(numbers), key=lambda x: x[1], reverse=True)
-    # Create a stack whose elements are partitions, their sums, and current depth
-    to_visit: List[Tuple[Partition, List[int], int]] = [
-        ([[] for _ in range(num_parts)], [0] * num_parts, 0)
+    # The sum of the numbers still to be added at each depth, used for bounding.
+    remaining = list(accumulate(number for _, number in reversed(sorted_numbers)))
+    remaining = remaining[::-1] + [0]
+    # Rounding the average part size is only valid when all numbers are integers.
+    integral = all(isinstance(number, int) for number in numbers)
+    perfect_objective_value = _perfect_difference(numbers, num_parts)
+    # Create a stack whose elements are partitions, their sums, the current depth, and
+    # the sum the part the last number was added to had before adding it.
+    to_visit: List[Tuple[Partition, List[int], int, float]] = [
+        ([[] for _ in range(num_parts)], [0] * num_parts, 0, 0)
     ]
     best_objective_value = inf
+    stats = limits.stats
+    result: Optional[AnyPartitioningResult] = None
     while to_visit:
-        partition, sizes, depth = to_visit.pop()
+        if limits.should_stop(result is not None):
+            return
+        partition, sizes, depth, previous_size = to_visit.pop()
+        if (
+            objective is None
+            and _difference_lower_bound(sizes, remaining[depth], integral)
+            >= best_objective_value
+        ):
+            if stats is not None:
+                stats.pruned += 1
+            continue
         # If we have reach the leaves of the DFS tree, check if we have an improvement,
         # and yield if we do.
         if depth == len(numbers):
@@ -88,20 +328,91 @@ def complete_greedy(
             )
             if new_objective_value < best_objective_value:
                 best_objective_value = new_objective_value
-                yield PartitioningResult(partition, sizes)
+                is_perfect = (
+                    objective is None
+                    and best_objective_value <= perfect_objective_value
+                )
+                if compact:
+                    result = _compact_result(
+                        partition, sizes, numbers, return_indices, is_perfect
+                    )
+                else:
+                    result = PartitioningResult(partition, sizes, is_perfect)
+                yield result
+                if is_perfect or limits.reached(best_objective_value):
+                    return
         else:
             index, number = sorted_numbers[depth]
+            # Adding copies of a number to the same parts in a different order gives
+            # the same partitions, so for the default objective, we only add them to
+            # parts whose sums before adding them are in the order the greedy
+            # algorithm would give, which is increasing for non-negative numbers.
+            is_copy = (
+                objective is None
+                and depth > 0
+                and number == sorted_numbers[depth - 1][1]
+            )
             # Order parts by decreasing size, so smallest part ends up on top of stack.
-            for part_index in sorted(
+            part_indices = sorted(
                 range(len(sizes)), key=sizes.__getitem__, reverse=True
-            ):
+            )
+            for i, part_index in enumerate(part_indices):
+                size = sizes[part_index]
+                if is_copy and (
+                    size < previous_size if number >= 0 else size > previous_size
+                ):
+                    continue
+                # Adding the number to parts of equal sizes gives symmetric subtrees,
+                # so for the default objective, we only keep the one searched first.
+                if (
+                    objective is None
+                    and i + 1 < len(part_indices)
+                    and sizes[part_indices[i + 1]] == sizes[part_index]
+                ):
+                    continue
+                new_sizes = list(sizes)
+                new_sizes[part_index] += number
+                new_depth = depth + 1
+                if (
+                    objective is None
+                    and _difference_lower_bound(
+                        new_sizes, remaining[new_depth], integral
+                    )
+                    >= best_objective_value
+                ):
+                    if stats is not None:
+                        stats.pruned += 1
+                    continue
                 # Create the next vertex; be careful to copy lists when necessary, but
                 # note that we can reuse all but one part in the existing partition.
                 new_partition = list(partition)
                 new_partition[part_index] = list(new_partition[part_index]) + [
-                    index if return_indices else number
+                    index if return_indices or compact else number
                 ]
-                new_sizes = list(sizes)
-                new_sizes[part_index] += number
-                new_depth = depth + 1
-                to_visit.append((new_partition, new_sizes, new_depth))
+                to_visit.append((new_partition, new_sizes, new_depth, size))
+            if stats is not None and len(to_visit) > stats.max_stack_size:
+                stats.max_stack_size = len(to_visit)
+    # The search space has been exhausted, so the last partition found is optimal.
+    if result is not None:
+        result.proven_optimal = True
+
+
+def _difference_lower_bound(
+    sizes: List[int], remaining: int, integral: bool = True
+) -> float:
+    """Bound the difference between the largest and smallest part from below.
+
+    The bound holds for all partitions obtained by adding numbers summing to
+    ``remaining`` to parts whose current sums are given by ``sizes``. If ``integral``
+    is True, all numbers are assumed to be integers, which allows rounding the
+    average part size.
+    """
+    total = sum(sizes) + remaining
+    if integral:
+        largest_average: float = -(-total // len(sizes))
+        smallest_average: float = total // len(sizes)
+    else:
+        largest_average = smallest_average = total / len(sizes)
+    largest = max(max(sizes), largest_average)
+    smallest = min(min(sizes) + remaining, smallest_average)
+    return largest - smallest
@@ -0,0 +1,236 @@
+import heapq
+from bisect import bisect_left, insort
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .common import CompactPartitioningResult, Partition, PartitioningResult
+from .karmarkar_karp import karmarkar_karp
+
+
+class IncrementalPartitioner:
+    """A partition which is kept up to date as numbers are added and removed.
+
+    Numbers are added to the currently smallest part, as in the greedy algorithm, and
+    removed from the part containing them, both in amortized time O(log k) for k
+    parts. As long as only non-negative numbers are added, the difference between the
+    largest and the smallest part never exceeds the larger of the difference it
+    started from and the largest number added; removals can leave the parts further
+    apart, which ``rebalance`` repairs by moving numbers between the largest and the
+    smallest part.
+
+    Parameters
+    ----------
+    num_parts
+        The desired number of parts in the partition. Default: 2.
+    numbers
+        If given, numbers to start with, which are partitioned with the
+        Karmarkar--Karp algorithm, and whose identifiers are their indices.
+    """
+
+    def __init__(self, num_parts: int = 2, numbers: Optional[List[int]] = None):
+        self.num_parts = num_parts
+        self._sizes = [0] * num_parts
+        # The numbers of each part, by their identifiers, and the part containing
+        # each number.
+        self._members: List[Dict[int, int]] = [{} for _ in range(num_parts)]
+        self._part_of: Dict[int, int] = {}
+        # The numbers of each part with their identifiers, sorted, or None if they
+        # have changed since they were last needed.
+        self._sorted: List[Optional[List[Tuple[int, int]]]] = [None] * num_parts
+        self._next_id = 0
+        if numbers:
+            result = karmarkar_karp(numbers, num_parts, compact=True)
+            assert isinstance(result, CompactPartitioningResult)
+            self._assign(numbers, result.assignment)
+        else:
+            self._rebuild_heaps()
+
+    @property
+    def sizes(self) -> List[int]:
+        """The sums of the parts."""
+        return list(self._sizes)
+
+    def __len__(self) -> int:
+        return len(self._part_of)
+
+    def __contains__(self, number_id: int) -> bool:
+        return number_id in self._part_of
+
+    def part_of(self, number_id: int) -> int:
+        """Give the index of the part containing the number with a given
+        identifier."""
+        return self._part_of[number_id]
+
+    def add(self, number: int) -> int:
+        """Add a number to the smallest part, and give its identifier."""
+        number_id = self._next_id
+        self._next_id += 1
+        part_index = self._smallest()
+        self._members[part_index][number_id] = number
+        self._part_of[number_id] = part_index
+        self._sorted[part_index] = None
+        self._resize(part_index, number)
+        return number_id
+
+    def remove(self, number_id: int) -> int:
+        """Remove the number with a given identifier, and give the number."""
+        part_index = self._part_of.pop(number_id)
+        number = self._members[part_index].pop(number_id)
+        self._sorted[part_index] = None
+        self._resize(part_index, -number)
+        return number
+
+    def rebalance(self, budget: int = 1) -> int:
+        """Move numbers between the largest and the smallest part to bring them
+        closer together.
+
+        Each step moves the number from the largest part to the smallest which brings
+        their sums closest to each other, or if no number brings them closer, swaps the
+        two numbers which do so. Since the new sums lie strictly between the old ones,
+        no step increases the difference between the largest and the smallest part.
+        The parts involved are sorted when they have changed since they were last
+        sorted; after that, a move takes time O(log m) and a swap O(m log m) for parts
+        of m numbers.
+
+        Parameters
+        ----------
+        budget
+            The largest number of moves and swaps to make. Default: 1.
+
+        Returns
+        -------
+        The number of moves and swaps made, which is less than the budget if the
+        largest and the smallest part could not be brought closer together.
+        """
+        steps = 0
+        while steps < budget:
+            largest = self._largest()
+            smallest = self._smallest()
+            gap = self._sizes[largest] - self._sizes[smallest]
+            if gap <= 0:
+                break
+            largest_numbers = self._sorted_numbers(largest)
+            # Moving a number, or swapping two numbers with a difference, between
+            # zero and the gap brings the parts closer together, most so when it is
+            # close to half of the gap.
+            y = _closest_between(largest_numbers, 0, gap)
+            if y is not None:
+                self._move(y, largest, smallest)
+                steps += 1
+                continue
+            swap = None
+            for z in self._sorted_numbers(smallest):
+                y = _closest_between(largest_numbers, z[0], z[0] + gap)
+                if y is not None and (
+                    swap is None
+                    or abs(2 * (y[0] - z[0]) - gap)
+                    < abs(2 * (swap[0][0] - swap[1][0]) - gap)
+                ):
+                    swap = (y, z)
+            if swap is None:
+                break
+            self._move(swap[0], largest, smallest)
+            self._move(swap[1], smallest, largest)
+            steps += 1
+        return steps
+
+    def result(self, return_ids: bool = False) -> PartitioningResult:
+        """Give the current partition.
+
+        Parameters
+        ----------
+        return_ids
+            If True, the elements of the parts are the identifiers of the numbers; if
+            False (default), the elements are the numbers themselves.
+
+        Returns
+        -------
+        The partition represented by a ``PartitioningResult``, with the elements of
+        each part in the order in which they were added.
+        """
+        partition: Partition = [
+            sorted(members) if return_ids else [members[i] for i in sorted(members)]
+            for members in self._members
+        ]
+        return PartitioningResult(partition, self.sizes)
+
+    def _assign(self, numbers: Sequence[int], assignment: Sequence[int]) -> None:
+        """Add numbers to given parts, with their indices as identifiers."""
+        for i, (number, part_index) in enumerate(zip(numbers, assignment)):
+            self._members[part_index][i] = number
+            self._part_of[i] = part_index
+            self._sizes[part_index] += number
+        self._next_id = len(numbers)
+        self._rebuild_heaps()
+
+    def _move(self, number: Tuple[int, int], source: int, target: int) -> None:
+        """Move a number, given with its identifier, between two parts, keeping the
+        sorted numbers of the parts up to date."""
+        value, number_id = number
+        source_numbers = self._sorted[source]
+        if source_numbers is not None:
+            del source_numbers[bisect_left(source_numbers, number)]
+        target_numbers = self._sorted[target]
+        if target_numbers is not None:
+            insort(target_numbers, number)
+        del self._members[source][number_id]
+        self._members[target][number_id] = value
+        self._part_of[number_id] = target
+        self._resize(source, -value)
+        self._resize(target, value)
+
+    def _sorted_numbers(self, part_index: int) -> List[Tuple[int, int]]:
+        numbers = self._sorted[part_index]
+        if numbers is None:
+            numbers = sorted(
+                (value, number_id)
+                for number_id, value in self._members[part_index].items()
+            )
+            self._sorted[part_index] = numbers
+        return numbers
+
+    def _resize(self, part_index: int, change: int) -> None:
+        size = self._sizes[part_index] + change
+        self._sizes[part_index] = size
+        # The heaps hold outdated sizes until these reach the top, so rebuild them
+        # once these make up most of the heaps; this takes time O(k) after at least k
+        # updates.
+        if len(self._smallest_heap) > 4 * self.num_parts + 16:
+            self._rebuild_heaps()
+        else:
+            heapq.heappush(self._smallest_heap, (size, part_index))
+            heapq.heappush(self._largest_heap, (-size, part_index))
+
+    def _rebuild_heaps(self) -> None:
+        self._smallest_heap = [(size, i) for i, size in enumerate(self._sizes)]
+        self._largest_heap = [(-size, i) for i, size in enumerate(self._sizes)]
+        heapq.heapify(self._smallest_heap)
+        heapq.heapify(self._largest_heap)
+
+    def _smallest(self) -> int:
+        heap = self._smallest_heap
+        while heap[0][0] != self._sizes[heap[0][1]]:
+            heapq.heappop(heap)
+        return heap[0][1]
+
+    def _largest(self) -> int:
+        heap = self._largest_heap
+        while -heap[0][0] != self._sizes[heap[0][1]]:
+            heapq.heappop(heap)
+        return heap[0][1]
+
+
+def _closest_between(
+    numbers: List[Tuple[int, int]], low: int, high: int
+) -> Optional[Tuple[int, int]]:
+    """Find the number, given with its identifier, that lies strictly between ``low``
+    and ``high`` and is closest to their midpoint, if any."""
+    middle = (low + high) / 2
+    i = bisect_left(numbers, (middle,))
+    candidates = [
+        numbers[j]
+        for j in (i - 1, i)
+        if 0 <= j < len(numbers) and low < numbers[j][0] < high
+    ]
+    if not candidates:
+        return None
+    return min(candidates, key=lambda number: abs(number[0] - middle))
@@ -1,77 +1,207 @@
 import heapq
-from itertools import count
-from typing import List, Tuple
+from array import array
+from typing import Any, Iterator, List, Tuple
 
-from .common import Partition, PartitioningResult
+from .common import (
+    AnyPartitioningResult,
+    CompactPartitioningResult,
+    Partition,
+    PartitioningResult,
+    _perfect_difference,
+    _to_list,
+)
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None  # type: ignore[assignment]
 
 
 def karmarkar_karp(
-    numbers: List[int],
+    numbers: Any,
     num_parts: int = 2,
     return_indices: bool = False,
     method: str = "purepython",
-) -> PartitioningResult:
+    compact: bool = False,
+) -> AnyPartitioningResult:
     """Produce a partition using the Karmarkar--Karp algorithm.
 
     Parameters
     ----------
     numbers
-        The list of numbers to be partitioned.
+        The list of numbers to be partitioned. This may also be a NumPy array, or
+        another object supporting the buffer protocol such as an ``array.array``, of
+        integers or floats, which is converted to Python numbers once.
     num_parts
         The desired number of parts in the partition. Default: 2.
     return_indices
         If True, the elements of the parts are the indices of the corresponding entries
         of numbers; if False (default), the elements are the numbers themselves.
     method
-        Which specific implementation to use. Currently the only allowed (and default)
-        value is "purepython".
+        Which specific implementation to use. Allowed values are "purepython"
+        (default) and "numpy"; the latter requires NumPy, and builds the parts from
+        the merges one level at a time with NumPy, rather than one merge at a time.
+    compact
+        If True, the partition is returned as a ``CompactPartitioningResult``, which
+        only builds the parts when they are accessed. Default: False.
 
     Returns
     -------
-    A partition representing by a ``PartitioningResult``.
+    A partition representing by a ``PartitioningResult``, or by a
+    ``CompactPartitioningResult`` if ``compact`` is True. The partition is marked as
+    ``proven_optimal`` if the difference between its largest and smallest part reaches
+    a lower bound computed from the total and the extremes of the numbers.
 
     """
     if method not in METHODS:
         raise ValueError(
             f'Invalid method "{method}". Valid options: {", ".join(METHODS)}'
         )
-    return METHODS[method](numbers, return_indices, num_parts)
+    values = _to_list(numbers)
+    result = METHODS[method](values, return_indices, num_parts, compact)
+    sizes = result.sizes
+    if max(sizes) - min(sizes) <= _perfect_difference(values, num_parts):
+        result.proven_optimal = True
+    return result
 
 
 def _argsort(seq: List[int]) -> List[int]:
     return sorted(range(len(seq)), key=seq.__getitem__)
 
 
+def _leaf_parts(
+    num_numbers: int,
+    num_parts: int,
+    merges: List[Tuple[int, int, List[int]]],
+    root: int,
+) -> Iterator[Tuple[int, int]]:
+    """Find the parts of a node in a merge forest containing each leaf below it.
+
+    The first ``len(numbers)`` nodes of the forest are the leaves, with leaf ``i``
+    having ``numbers[i]`` as the sole element of its last part, and node
+    ``len(numbers) + m`` is obtained by merging the two nodes in ``merges[m]``: part
+    ``j`` of the merged node is part ``permutation[j]`` of the first node combined with
+    part ``num_parts - permutation[j] - 1`` of the second.
+
+    The leaves are generated along with the index of their part in a single
+    traversal.
+    """
+    # Traverse depth-first, with the parts of each node labelled by the part of the
+    # final partition they end up in; visiting the first node of each merge first
+    # keeps elements in the order given by concatenating the merged parts.
+    to_visit: List[Tuple[int, List[int]]] = [(root, list(range(num_parts)))]
+    while to_visit:
+        node, labels = to_visit.pop()
+        if node < num_numbers:
+            yield node, labels[-1]
+            continue
+        a, b, permutation = merges[node - num_numbers]
+        labels_a = [0] * num_parts
+        labels_b = [0] * num_parts
+        for j, label in zip(permutation, labels):
+            labels_a[j] = label
+            labels_b[num_parts - j - 1] = label
+        to_visit.append((b, labels_b))
+        to_visit.append((a, labels_a))
+
+
 def _karmarkar_karp_pure_python(
-    numbers: List[int], return_indices: bool, num_parts: int
-) -> PartitioningResult:
-    partitions: List[Tuple[int, int, Partition, List[int]]] = []
-    heap_count = count()  # To avoid ambiguity in heap
-    for i in range(len(numbers)):
-        this_partition: Partition = []
-        for n in range(num_parts - 1):
-            this_partition.append([])
-        this_partition.append([i if return_indices else numbers[i]])
-        this_sizes: List[int] = [0] * (num_parts - 1) + [numbers[i]]
-        heapq.heappush(
-            partitions, (-numbers[i], next(heap_count), this_partition, this_sizes)
-        )
-    for k in range(len(numbers) - 1):
-        _, _, p1, p1_sum = heapq.heappop(partitions)
-        _, _, p2, p2_sum = heapq.heappop(partitions)
+    numbers: List[int], return_indices: bool, num_parts: int, compact: bool = False
+) -> AnyPartitioningResult:
+    num_numbers = len(numbers)
+    # Nodes are identified by their index in the merge forest; indices are increasing
+    # in creation order so they double as tie breakers in the heap.
+    partitions: List[Tuple[int, int, List[int]]] = [
+        (-number, i, [0] * (num_parts - 1) + [number])
+        for i, number in enumerate(numbers)
+    ]
+    heapq.heapify(partitions)
+    merges: List[Tuple[int, int, List[int]]] = []
+    for node in range(num_numbers, 2 * num_numbers - 1):
+        _, a, p1_sum = heapq.heappop(partitions)
+        _, b, p2_sum = heapq.heappop(partitions)
         new_sizes: List[int] = [
             p1_sum[j] + p2_sum[num_parts - j - 1] for j in range(num_parts)
         ]
-        new_partition: Partition = [
-            p1[j] + p2[num_parts - j - 1] for j in range(num_parts)
-        ]
         indices = _argsort(new_sizes)
         new_sizes = [new_sizes[i] for i in indices]
-        new_partition = [new_partition[i] for i in indices]
+        merges.append((a, b, indices))
         diff = new_sizes[-1] - new_sizes[0]
-        heapq.heappush(partitions, (-diff, next(heap_count), new_partition, new_sizes))
-    _, _, final_partition, final_sums = partitions[0]
+        heapq.heappush(partitions, (-diff, node, new_sizes))
+    _, root, final_sums = partitions[0]
+    leaf_parts = _leaf_parts(num_numbers, num_parts, merges, root)
+    if compact:
+        assignment = array("l", bytes(array("l").itemsize * num_numbers))
+        for leaf, part in leaf_parts:
+            assignment[leaf] = part
+        return CompactPartitioningResult(
+            assignment, final_sums, None if return_indices else numbers
+        )
+    final_partition: Partition = [[] for _ in range(num_parts)]
+    for leaf, part in leaf_parts:
+        final_partition[part].append(leaf if return_indices else numbers[leaf])
     return PartitioningResult(final_partition, final_sums)
 
 
-METHODS = {"purepython": _karmarkar_karp_pure_python}
+def _karmarkar_karp_numpy(
+    numbers: List[int], return_indices: bool, num_parts: int, compact: bool = False
+) -> AnyPartitioningResult:
+    if np is None:
+        raise ImportError('The "numpy" method requires NumPy to be installed')
+    num_numbers = len(numbers)
+    # The merges themselves are carried out exactly as in the pure Python version, so
+    # part sizes stay Python numbers and can not overflow; only the merge forest is
+    # stored in arrays, so that the parts can be reconstructed one level at a time.
+    partitions: List[Tuple[int, int, List[int]]] = [
+        (-number, i, [0] * (num_parts - 1) + [number])
+        for i, number in enumerate(numbers)
+    ]
+    heapq.heapify(partitions)
+    merged: List[Tuple[int, int]] = []
+    permutations: List[List[int]] = []
+    for node in range(num_numbers, 2 * num_numbers - 1):
+        _, a, p1_sum = heapq.heappop(partitions)
+        _, b, p2_sum = heapq.heappop(partitions)
+        new_sizes = [p1_sum[j] + p2_sum[num_parts - j - 1] for j in range(num_parts)]
+        indices = _argsort(new_sizes)
+        new_sizes = [new_sizes[i] for i in indices]
+        merged.append((a, b))
+        permutations.append(indices)
+        heapq.heappush(partitions, (new_sizes[0] - new_sizes[-1], node, new_sizes))
+    _, root, final_sums = partitions[0]
+    children = np.array(merged, dtype=np.intp).reshape(-1, 2)
+    permutation_array = np.array(permutations, dtype=np.intp).reshape(-1, num_parts)
+    # Label the parts of each node by the part of the final partition they end up in,
+    # handling all nodes at the same depth of the forest at once; for leaves, only the
+    # last part is non-empty.
+    labels = np.empty((2 * num_numbers - 1, num_parts), dtype=np.intp)
+    labels[root] = np.arange(num_parts)
+    level = np.array([root], dtype=np.intp)
+    while level.size:
+        level = level[level >= num_numbers]
+        merge = level - num_numbers
+        a, b = children[merge, 0], children[merge, 1]
+        rows = np.arange(level.size)[:, np.newaxis]
+        permutation = permutation_array[merge]
+        labels_a = np.empty((level.size, num_parts), dtype=np.intp)
+        labels_b = np.empty((level.size, num_parts), dtype=np.intp)
+        labels_a[rows, permutation] = labels[level]
+        labels_b[rows, num_parts - 1 - permutation] = labels[level]
+        labels[a] = labels_a
+        labels[b] = labels_b
+        level = np.concatenate((a, b))
+    assignment = labels[:num_numbers, -1]
+    if compact:
+        return CompactPartitioningResult(
+            assignment, final_sums, None if return_indices else numbers
+        )
+    order = np.argsort(assignment, kind="stable")
+    boundaries = np.cumsum(np.bincount(assignment, minlength=num_parts))[:-1]
+    partition: Partition = [
+        part.tolist() if return_indices else [numbers[i] for i in part.tolist()]
+        for part in np.split(order, boundaries)
+    ]
+    return PartitioningResult(partition, final_sums)
+
+
+METHODS = {"purepython": _karmarkar_karp_pure_python, "numpy": _karmarkar_karp_numpy}
@@ -0,0 +1,92 @@
+from collections import defaultdict
+from time import perf_counter
+from typing import Any, DefaultDict, List, Optional
+
+from .common import (
+    AnyPartitioningResult,
+    CompactPartitioningResult,
+    Partition,
+    PartitioningResult,
+    _compact_result,
+    _to_list,
+)
+from .incremental import IncrementalPartitioner
+
+
+def improve(
+    result: AnyPartitioningResult,
+    numbers: Any,
+    time_limit: Optional[float] = None,
+    return_indices: bool = False,
+) -> AnyPartitioningResult:
+    """Improve a partition with local search.
+
+    Starting from a partition found by another algorithm, such as ``greedy`` or
+    ``karmarkar_karp``, this repeatedly moves a number from the largest part to the
+    smallest, or, if no number can be moved to bring them closer together, swaps a
+    number of the largest part for a smaller number of the smallest. Each move or
+    swap is chosen to bring the two parts as close together as possible, using the
+    sorted numbers of the parts, so that each candidate is found by a binary search.
+    No step increases the difference between the largest and the smallest part.
+
+    Parameters
+    ----------
+    result
+        The partition to improve.
+    numbers
+        The numbers that were partitioned; a list, or a NumPy array.
+    time_limit
+        If given, the number of seconds after which to stop improving the partition;
+        otherwise, this continues until the largest and the smallest part can not be
+        brought closer together by moving or swapping numbers.
+    return_indices
+        Whether the elements of the parts of ``result`` are the indices of the
+        corresponding entries of numbers, rather than the numbers themselves; the
+        elements of the parts of the improved partition are the same. Default: False.
+
+    Returns
+    -------
+    The improved partition, as a ``CompactPartitioningResult`` if ``result`` is one,
+    and as a ``PartitioningResult`` otherwise, with the elements of each part in the
+    order of the numbers. The partition is marked as ``proven_optimal`` if the given
+    one was, or if its parts all have the same size.
+
+    """
+    deadline = None if time_limit is None else perf_counter() + time_limit
+    numbers = _to_list(numbers)
+    num_parts = len(result.sizes)
+    partitioner = IncrementalPartitioner(num_parts)
+    partitioner._assign(numbers, _assignment(result, numbers, return_indices))
+    while (deadline is None or perf_counter() < deadline) and partitioner.rebalance():
+        pass
+    sizes = partitioner.sizes
+    proven_optimal = result.proven_optimal or max(sizes) == min(sizes)
+    parts: Partition = partitioner.result(return_ids=True).partition
+    if isinstance(result, CompactPartitioningResult):
+        return _compact_result(parts, sizes, numbers, return_indices, proven_optimal)
+    if not return_indices:
+        parts = [[numbers[i] for i in part] for part in parts]
+    return PartitioningResult(parts, sizes, proven_optimal)
+
+
+def _assignment(
+    result: AnyPartitioningResult, numbers: List[int], return_indices: bool
+) -> List[int]:
+    """Give the index of the part containing each number in a partition."""
+    if isinstance(result, CompactPartitioningResult):
+        return _to_list(result.assignment)
+    assignment = [0] * len(numbers)
+    if return_indices:
+        for part_index, part in enumerate(result.partition):
+            for i in part:
+                assignment[i] = part_index
+        return assignment
+    # The parts contain the numbers themselves, so equal numbers are assigned to the
+    # parts containing them in the order of their indices.
+    indices: DefaultDict[int, List[int]] = defaultdict(list)
+    for i, number in enumerate(numbers):
+        indices[number].append(i)
+    for part_index, part in enumerate(result.partition):
+        for number in part:
+            assignment[indices[number].pop()] = part_index
+    return assignment
@@ -0,0 +1,196 @@
+import heapq
+from typing import Any, Iterator, List, Optional, Tuple
+
+from .common import _perfect_difference, _SearchLimits
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None  # type: ignore[assignment]
+
+# The largest number of numbers for which the subset sums of each half are created
+# as NumPy arrays, keeping memory use to a few tens of megabytes.
+_NUMPY_MAX_SIZE = 40
+
+
+def _horowitz_sahni(
+    numbers: List[Any], limits: _SearchLimits, best_difference: float
+) -> Optional[List[int]]:
+    """Find a subset of the numbers whose sum is as close as possible to half of the
+    total, using the algorithm of Horowitz and Sahni.
+
+    The subset sums of each half of the numbers are sorted, and the sums of the first
+    half are matched with those of the second half in a single pass, the former in
+    increasing and the latter in decreasing order. This takes time and memory
+    proportional to 2^(n/2). When NumPy is available, the matching is done for all
+    sums of the first half at once, by a binary search among the sums of the second.
+
+    Returns the indices of the numbers in the subset, if the difference between the
+    sums of the subset and the remaining numbers is smaller than ``best_difference``,
+    and None otherwise, or if the search is stopped by the limits.
+    """
+    half = len(numbers) // 2
+    if np is not None and len(numbers) <= _NUMPY_MAX_SIZE:
+        values = _numpy_values(numbers)
+        if values is not None:
+            return _horowitz_sahni_numpy(values, half, limits, best_difference)
+    sums_1 = _subset_sums(numbers[:half])
+    sums_2 = _subset_sums(numbers[half:])
+    order_1 = sorted(range(len(sums_1)), key=sums_1.__getitem__)
+    order_2 = sorted(range(len(sums_2)), key=sums_2.__getitem__, reverse=True)
+    return _closest_to_half(
+        numbers,
+        ((sums_1[mask], mask) for mask in order_1),
+        ((sums_2[mask], mask) for mask in order_2),
+        half,
+        limits,
+        best_difference,
+    )
+
+
+def _schroeppel_shamir(
+    numbers: List[Any], limits: _SearchLimits, best_difference: float
+) -> Optional[List[int]]:
+    """Find a subset of the numbers whose sum is as close as possible to half of the
+    total, using the algorithm of Schroeppel and Shamir.
+
+    This matches the subset sums of the two halves of the numbers just like the
+    algorithm of Horowitz and Sahni, but instead of storing them, the subset sums of
+    each half are generated in sorted order from the sorted subset sums of its two
+    quarters, using a heap; this takes memory proportional to 2^(n/4) only.
+
+    Returns the same as ``_horowitz_sahni``.
+    """
+    half = len(numbers) // 2
+    return _closest_to_half(
+        numbers,
+        _sorted_subset_sums(numbers[:half], False),
+        _sorted_subset_sums(numbers[half:], True),
+        half,
+        limits,
+        best_difference,
+    )
+
+
+def _closest_to_half(
+    numbers: List[Any],
+    increasing: Iterator[Tuple[Any, int]],
+    decreasing: Iterator[Tuple[Any, int]],
+    half: int,
+    limits: _SearchLimits,
+    best_difference: float,
+) -> Optional[List[int]]:
+    """Combine subset sums of the two halves of the numbers into the largest sum that
+    is at most half of the total.
+
+    The subset sums of the first half are given in increasing order, and those of the
+    second in decreasing order, along with the subsets as bit masks. For each sum of
+    the first half, the sums of the second half are skipped until the combined sum is
+    at most half of the total; since the sums of the first half only increase, the
+    skipped sums can never be used again.
+    """
+    total = sum(numbers)
+    # The smallest possible difference, at which the search can stop.
+    perfect = _perfect_difference(numbers, 2)
+    best: Optional[Tuple[int, int]] = None
+    current = next(decreasing, None)
+    for sum_1, mask_1 in increasing:
+        if limits.should_stop(True):
+            return None
+        while current is not None and 2 * (sum_1 + current[0]) > total:
+            current = next(decreasing, None)
+        if current is None:
+            break
+        difference = total - 2 * (sum_1 + current[0])
+        if difference < best_difference:
+            best_difference = difference
+            best = (mask_1, current[1])
+            if difference <= perfect or limits.reached(difference):
+                break
+    if best is None:
+        return None
+    mask_1, mask_2 = best
+    mask = mask_1 | mask_2 << half
+    return [i for i in range(len(numbers)) if mask >> i & 1]
+
+
+def _subset_sums(values: List[Any]) -> List[Any]:
+    """Give the sums of all subsets of the values, the subset with bit mask m having
+    its sum at position m."""
+    sums = [0]
+    for value in values:
+        sums += [subset_sum + value for subset_sum in sums]
+    return sums
+
+
+def _sorted_subset_sums(values: List[Any], reverse: bool) -> Iterator[Tuple[Any, int]]:
+    """Generate the subset sums of the values in sorted order, along with the subsets
+    as bit masks.
+
+    The values are split in two, and the sorted subset sums of both halves are
+    combined in order using a heap holding, for every sum of the first half, the next
+    sum of the second half to combine it with.
+    """
+    half = len(values) // 2
+    sums_1 = _subset_sums(values[:half])
+    sums_2 = _subset_sums(values[half:])
+    order_1 = sorted(range(len(sums_1)), key=sums_1.__getitem__, reverse=reverse)
+    order_2 = sorted(range(len(sums_2)), key=sums_2.__getitem__, reverse=reverse)
+    sorted_1 = [sums_1[mask] for mask in order_1]
+    sorted_2 = [sums_2[mask] for mask in order_2]
+    sign = -1 if reverse else 1
+    heap = [(sign * (sum_1 + sorted_2[0]), i, 0) for i, sum_1 in enumerate(sorted_1)]
+    heapq.heapify(heap)
+    while heap:
+        key, i, j = heap[0]
+        if j + 1 < len(sorted_2):
+            heapq.heapreplace(heap, (sign * (sorted_1[i] + sorted_2[j + 1]), i, j + 1))
+        else:
+            heapq.heappop(heap)
+        yield sign * key, order_1[i] | order_2[j] << half
+
+
+def _numpy_values(numbers: List[Any]) -> Any:
+    """Convert the numbers to a NumPy array, or return None if their subset sums can
+    not be computed exactly."""
+    if all(type(number) is float for number in numbers):
+        return np.array(numbers, dtype=np.float64)
+    if not all(isinstance(number, int) for number in numbers):
+        return None
+    if sum(abs(number) for number in numbers) >= 2**62:
+        return None
+    return np.array(numbers, dtype=np.int64)
+
+
+def _numpy_subset_sums(values: Any) -> Any:
+    sums = np.zeros(1, dtype=values.dtype)
+    for value in values:
+        sums = np.concatenate((sums, sums + value))
+    return sums
+
+
+def _horowitz_sahni_numpy(
+    values: Any, half: int, limits: _SearchLimits, best_difference: float
+) -> Optional[List[int]]:
+    sums_1 = _numpy_subset_sums(values[:half])
+    sums_2 = _numpy_subset_sums(values[half:])
+    if limits.should_stop(True, len(sums_1) + len(sums_2)):
+        return None
+    order_2 = np.argsort(sums_2, kind="stable")
+    sorted_2 = sums_2[order_2]
+    total = values.sum()
+    # For every sum of the first half, find the largest sum of the second half for
+    # which the combined sum is at most half of the total.
+    if values.dtype.kind == "f":
+        positions = np.searchsorted(sorted_2, total / 2 - sums_1, side="right") - 1
+    else:
+        positions = np.searchsorted(sorted_2, total // 2 - sums_1, side="right") - 1
+    combined = sums_1 + sorted_2[np.maximum(positions, 0)]
+    valid = np.flatnonzero(positions >= 0)
+    if not len(valid):
+        return None
+    best = valid[np.argmax(combined[valid])]
+    if total - 2 * combined[best] >= best_difference:
+        return None
+    mask = int(best) | int(order_2[positions[best]]) << half
+    return [i for i in range(len(values)) if mask >> i & 1]
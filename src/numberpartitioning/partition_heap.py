@@ -0,0 +1,168 @@
+from typing import Iterator, List, Optional, Tuple
+
+from .common import Partition
+
+
+class _PartitionHeap:
+    """A persistent leftist heap of partial partitions, with the partition with the
+    largest difference between its largest and smallest part on top.
+
+    The heaps are never modified, so that pushing and popping give new heaps which
+    share all but O(log n) of their nodes with the old ones; this is what lets the
+    children of a node of the complete Karmarkar--Karp search share the partitions
+    they have in common with their parent, instead of each holding a copy of them.
+    Each node also keeps track of the number of partitions in its subtree, their
+    largest part size, the total of their sizes, and the sum of their differences, so
+    that these are available in constant time for bounding.
+
+    Partitions with equal differences are ordered by their ``tiebreak``, smallest
+    first, and the empty heap is represented by None.
+    """
+
+    __slots__ = (
+        "difference",
+        "tiebreak",
+        "partition",
+        "sizes",
+        "own_largest",
+        "own_total",
+        "left",
+        "right",
+        "rank",
+        "size",
+        "largest",
+        "total",
+        "difference_sum",
+    )
+
+    def __init__(
+        self,
+        difference: int,
+        tiebreak: int,
+        partition: Partition,
+        sizes: List[int],
+        own_largest: Optional[int] = None,
+        own_total: Optional[int] = None,
+        left: Optional["_PartitionHeap"] = None,
+        right: Optional["_PartitionHeap"] = None,
+    ):
+        self.difference: int = difference
+        self.tiebreak: int = tiebreak
+        self.partition: Partition = partition
+        self.sizes: List[int] = sizes
+        # The largest size and the total of this partition alone, which are passed on
+        # by the copies made when merging, to avoid computing them again.
+        largest = max(sizes) if own_largest is None else own_largest
+        total = sum(sizes) if own_total is None else own_total
+        self.own_largest: int = largest
+        self.own_total: int = total
+        self.left: Optional[_PartitionHeap] = left
+        self.right: Optional[_PartitionHeap] = right
+        size = 1
+        difference_sum = difference
+        if left is not None:
+            size += left.size
+            if left.largest > largest:
+                largest = left.largest
+            total += left.total
+            difference_sum += left.difference_sum
+        if right is None:
+            self.rank: int = 1
+        else:
+            self.rank = right.rank + 1
+            size += right.size
+            if right.largest > largest:
+                largest = right.largest
+            total += right.total
+            difference_sum += right.difference_sum
+        self.size: int = size
+        self.largest: int = largest
+        self.total: int = total
+        self.difference_sum: int = difference_sum
+
+    def __reduce__(self) -> Tuple[object, ...]:
+        # Pickle the partitions as a list, since the left spine of a leftist heap may
+        # be too long for pickling it recursively.
+        return _from_items, (list(_items(self)),)
+
+
+def _merge(
+    heap_1: Optional[_PartitionHeap], heap_2: Optional[_PartitionHeap]
+) -> Optional[_PartitionHeap]:
+    """Merge two heaps, creating new nodes only along their right spines."""
+    if heap_1 is None:
+        return heap_2
+    if heap_2 is None:
+        return heap_1
+    # Walk down the right spines, taking the node that comes first each time, and
+    # then build the merged heap from the bottom up.
+    spine = []
+    while heap_1 is not None and heap_2 is not None:
+        if heap_2.difference > heap_1.difference or (
+            heap_2.difference == heap_1.difference and heap_2.tiebreak < heap_1.tiebreak
+        ):
+            heap_1, heap_2 = heap_2, heap_1
+        spine.append(heap_1)
+        heap_1 = heap_1.right
+    merged = heap_2 if heap_1 is None else heap_1
+    assert merged is not None
+    for node in reversed(spine):
+        left = node.left
+        if left is None or left.rank < merged.rank:
+            left, merged = merged, left
+        merged = _PartitionHeap(
+            node.difference,
+            node.tiebreak,
+            node.partition,
+            node.sizes,
+            node.own_largest,
+            node.own_total,
+            left,
+            merged,
+        )
+    return merged
+
+
+def _push(
+    heap: Optional[_PartitionHeap],
+    difference: int,
+    tiebreak: int,
+    partition: Partition,
+    sizes: List[int],
+) -> _PartitionHeap:
+    """Give the heap with a partition added."""
+    merged = _merge(heap, _PartitionHeap(difference, tiebreak, partition, sizes))
+    assert merged is not None
+    return merged
+
+
+def _pop(heap: _PartitionHeap) -> Optional[_PartitionHeap]:
+    """Give the heap without the partition on top."""
+    return _merge(heap.left, heap.right)
+
+
+def _items(
+    heap: Optional[_PartitionHeap],
+) -> Iterator[Tuple[int, int, Partition, List[int]]]:
+    """Generate the differences, tiebreaks, partitions, and sizes in a heap."""
+    stack = [heap]
+    while stack:
+        node = stack.pop()
+        if node is not None:
+            yield node.difference, node.tiebreak, node.partition, node.sizes
+            stack.append(node.left)
+            stack.append(node.right)
+
+
+def _from_items(
+    items: List[Tuple[int, int, Partition, List[int]]],
+) -> Optional[_PartitionHeap]:
+    """Build a heap from differences, tiebreaks, partitions, and sizes."""
+    heaps: List[Optional[_PartitionHeap]] = [_PartitionHeap(*item) for item in items]
+    # Merging the heaps in pairs takes linear time overall.
+    while len(heaps) > 1:
+        heaps = [
+            _merge(heaps[i], heaps[i + 1]) if i + 1 < len(heaps) else heaps[i]
+            for i in range(0, len(heaps), 2)
+        ]
+    return heaps[0] if heaps else None
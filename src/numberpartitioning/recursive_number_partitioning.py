@@ -0,0 +1,210 @@
+from typing import Any, Iterator, List, Optional, Tuple
+
+from .common import (
+    AnyPartitioningResult,
+    Partition,
+    PartitioningResult,
+    _compact_result,
+    _rounding_tolerance,
+    _SearchLimits,
+    _to_list,
+)
+from .karmarkar_karp import karmarkar_karp
+
+
+def recursive_number_partitioning(
+    numbers: Any,
+    num_parts: int = 2,
+    return_indices: bool = False,
+    time_limit: Optional[float] = None,
+    max_nodes: Optional[int] = None,
+    compact: bool = False,
+) -> Iterator[AnyPartitioningResult]:
+    """Produce partitions using recursive number partitioning.
+
+    This is Korf's recursive number partitioning algorithm, which minimizes the size
+    of the largest part; for two parts, this is the same as minimizing the difference
+    between the sizes of the parts. The first partition is the one produced by the
+    Karmarkar--Karp algorithm. Then, for as long as the largest part can be made
+    smaller, a partition with a smaller largest part is searched for by splitting the
+    parts into two halves, enumerating the subsets of the numbers that can make up
+    the first half, and recursively partitioning each half.
+
+    The numbers must be non-negative.
+
+    Parameters
+    ----------
+    numbers
+        The list of numbers to be partitioned. This may also be a NumPy array, or
+        another object supporting the buffer protocol, of integers or floats.
+    num_parts
+        The desired number of parts in the partition. Default: 2.
+    return_indices
+        If True, the elements of the parts are the indices of the corresponding entries
+        of numbers; if False (default), the elements are the numbers themselves.
+    time_limit
+        If given, the search stops after this many seconds.
+    max_nodes
+        If given, the search stops after considering this many subsets.
+    compact
+        If True, partitions are given as ``CompactPartitioningResult``, which only
+        build the parts when they are accessed. Default: False.
+
+    The limits are only checked once the first partition has been found, so at least
+    one partition is always produced.
+
+    Yields
+    ------
+    Partitions represented by a ``PartitioningResult`` whenever a partition with a
+    smaller largest part is found. If the search finishes without reaching any
+    limits, the last partition is marked as ``proven_optimal``; unless its largest
+    part is as small as possible for any partition, this only happens once the
+    iterator is exhausted.
+
+    """
+    numbers = _to_list(numbers)
+    if any(number < 0 for number in numbers):
+        raise ValueError("Recursive number partitioning requires non-negative numbers")
+    limits = _SearchLimits(time_limit, max_nodes)
+    initial = karmarkar_karp(numbers, num_parts, return_indices=True)
+    parts = initial.partition
+    # No part can be smaller than the largest number, or than the average part size,
+    # which can be rounded up when all numbers are integers; for floats, the largest
+    # part may exceed this bound by rounding errors and still be optimal.
+    if all(isinstance(number, int) for number in numbers):
+        average: float = -(-sum(numbers) // num_parts)
+        tolerance: float = 0
+    else:
+        average = sum(numbers) / num_parts
+        tolerance = _rounding_tolerance(len(numbers), sum(numbers))
+    lower_bound = max(max(numbers, default=0), average)
+    items = sorted(
+        ((number, i) for i, number in enumerate(numbers)),
+        key=lambda item: item[0],
+        reverse=True,
+    )
+    while True:
+        sizes = [sum(numbers[i] for i in part) for part in parts]
+        largest = max(sizes)
+        result = _to_result(
+            numbers,
+            parts,
+            sizes,
+            return_indices,
+            compact,
+            largest <= lower_bound + tolerance,
+        )
+        yield result
+        if result.proven_optimal:
+            return
+        new_parts = _partition_below(items, num_parts, largest, limits)
+        if new_parts is None:
+            # Unless the search was cut short, no better partition exists.
+            if not limits.stopped:
+                result.proven_optimal = True
+            return
+        parts = [[i for _, i in part] for part in new_parts]
+
+
+def _to_result(
+    numbers: List[int],
+    parts: Partition,
+    sizes: List[int],
+    return_indices: bool,
+    compact: bool,
+    proven_optimal: bool,
+) -> AnyPartitioningResult:
+    if compact:
+        return _compact_result(parts, sizes, numbers, return_indices, proven_optimal)
+    if not return_indices:
+        parts = [[numbers[i] for i in part] for part in parts]
+    return PartitioningResult(parts, sizes, proven_optimal)
+
+
+def _partition_below(
+    items: List[Tuple[int, int]],
+    num_parts: int,
+    bound: float,
+    limits: _SearchLimits,
+) -> Optional[List[List[Tuple[int, int]]]]:
+    """Partition numbers so that every part is smaller than a given bound.
+
+    The numbers are given along with their indices, sorted in decreasing order. The
+    parts are split into two halves, and for every subset of numbers whose sum allows
+    for the first half to have its parts below the bound, and for the remaining
+    numbers to do the same for the second half, both halves are partitioned
+    recursively. Returns None if no such partition exists, or if the search is
+    stopped by the limits.
+    """
+    total = sum(number for number, _ in items)
+    if num_parts == 1:
+        return [items] if total < bound else None
+    if (items and items[0][0] >= bound) or total >= num_parts * bound:
+        return None
+    num_parts_1 = num_parts // 2
+    num_parts_2 = num_parts - num_parts_1
+    values = [number for number, _ in items]
+    # When the halves consist of equally many parts, they are interchangeable, so the
+    # largest number can be put in the first half.
+    for subset in _subsets_with_sum_in_range(
+        values,
+        total - num_parts_2 * bound,
+        num_parts_1 * bound,
+        num_parts_1 == num_parts_2,
+    ):
+        if limits.should_stop(True):
+            return None
+        chosen = set(subset)
+        first = [items[i] for i in subset]
+        second = [item for i, item in enumerate(items) if i not in chosen]
+        parts_1 = _partition_below(first, num_parts_1, bound, limits)
+        if parts_1 is None:
+            if limits.stopped:
+                return None
+            continue
+        parts_2 = _partition_below(second, num_parts_2, bound, limits)
+        if parts_2 is None:
+            if limits.stopped:
+                return None
+            continue
+        return parts_1 + parts_2
+    return None
+
+
+def _subsets_with_sum_in_range(
+    values: List[int], low: float, high: float, include_first: bool = False
+) -> Iterator[List[int]]:
+    """Generate the subsets of non-negative numbers whose sums are in an open interval.
+
+    The values are assumed to be sorted in decreasing order, and subsets are given as
+    lists of positions in ``values``. Among equal values, only the first ones are ever
+    included, so that every multiset of values is generated once. If
+    ``include_first`` is True, only subsets containing the first value are generated.
+    """
+    num_values = len(values)
+    # The sum of the values from each position on, used to stop as soon as the sum of
+    # a subset can no longer exceed the lower end of the interval.
+    remaining = [0] * (num_values + 1)
+    for i in range(num_values - 1, -1, -1):
+        remaining[i] = remaining[i + 1] + values[i]
+    # The next position after each run of equal values.
+    next_different = [num_values] * num_values
+    for i in range(num_values - 2, -1, -1):
+        next_different[i] = (
+            next_different[i + 1] if values[i + 1] == values[i] else i + 1
+        )
+    chosen: List[int] = []
+
+    def search(position: int, subset_sum: int) -> Iterator[List[int]]:
+        if subset_sum >= high or subset_sum + remaining[position] <= low:
+            return
+        if position == num_values:
+            yield list(chosen)
+            return
+        chosen.append(position)
+        yield from search(position + 1, subset_sum + values[position])
+        chosen.pop()
+        if not (include_first and position == 0):
+            yield from search(next_different[position], subset_sum)
+
+    return search(0, 0)
@@ -0,0 +1,283 @@
+from math import inf
+from typing import Any, Iterator, List, Optional, Tuple
+
+from .common import (
+    AnyPartitioningResult,
+    _rounding_tolerance,
+    _SearchLimits,
+    _to_list,
+)
+from .karmarkar_karp import karmarkar_karp
+from .recursive_number_partitioning import _to_result
+
+# The largest number of subsets making up the first part that are cached between
+# iterations of the search.
+_CACHE_SIZE = 100_000
+
+
+def sequential_number_partitioning(
+    numbers: Any,
+    num_parts: int = 2,
+    return_indices: bool = False,
+    time_limit: Optional[float] = None,
+    max_nodes: Optional[int] = None,
+    compact: bool = False,
+) -> Iterator[AnyPartitioningResult]:
+    """Produce partitions using sequential number partitioning.
+
+    This is the sequential number partitioning algorithm of Schreiber and Korf, which
+    minimizes the size of the largest part, combined with Moffitt's cached iterative
+    weakening. The first partition is the one produced by the Karmarkar--Karp
+    algorithm. Then, starting from a lower bound on the largest part, partitions whose
+    parts are no larger than a given bound are searched for, increasing the bound
+    whenever no partition is found; the first partition found is optimal.
+
+    The parts are generated one at a time, with each part containing the largest of
+    the remaining numbers, and its sum large enough for the remaining parts to be no
+    larger than the bound. Each part is found by branching on including or excluding
+    each number, using the sums of all smaller numbers to stop early. When the bound
+    is increased, it is increased to the smallest value for which some subset that
+    was ruled out becomes possible, and the subsets making up the first part are
+    cached between bounds.
+
+    The numbers must be non-negative.
+
+    Parameters
+    ----------
+    numbers
+        The list of numbers to be partitioned. This may also be a NumPy array, or
+        another object supporting the buffer protocol, of integers or floats.
+    num_parts
+        The desired number of parts in the partition. Default: 2.
+    return_indices
+        If True, the elements of the parts are the indices of the corresponding entries
+        of numbers; if False (default), the elements are the numbers themselves.
+    time_limit
+        If given, the search stops after this many seconds.
+    max_nodes
+        If given, the search stops after visiting this many nodes of the search for
+        subsets.
+    compact
+        If True, partitions are given as ``CompactPartitioningResult``, which only
+        build the parts when they are accessed. Default: False.
+
+    The limits are only checked once the first partition has been found, so at least
+    one partition is always produced.
+
+    Yields
+    ------
+    Partitions represented by a ``PartitioningResult``; the Karmarkar--Karp partition,
+    followed by an optimal partition if it is better. If the search finishes without
+    reaching any limits, the last partition is marked as ``proven_optimal``; if this is
+    the Karmarkar--Karp partition, and its largest part is not as small as possible
+    for any partition, this only happens once the iterator is exhausted.
+
+    """
+    numbers = _to_list(numbers)
+    if any(number < 0 for number in numbers):
+        raise ValueError("Sequential number partitioning requires non-negative numbers")
+    limits = _SearchLimits(time_limit, max_nodes)
+    initial = karmarkar_karp(numbers, num_parts, return_indices=True)
+    parts = initial.partition
+    sizes = [sum(numbers[i] for i in part) for part in parts]
+    best = max(sizes)
+    integral = all(isinstance(number, int) for number in numbers)
+    # For floats, partitions reaching the bound up to rounding are accepted.
+    if integral:
+        average: float = -(-sum(numbers) // num_parts)
+        tolerance: float = 0
+    else:
+        average = sum(numbers) / num_parts
+        tolerance = _rounding_tolerance(len(numbers), sum(numbers))
+    bound = max(max(numbers, default=0), average)
+    result = _to_result(
+        numbers, parts, sizes, return_indices, compact, best <= bound + tolerance
+    )
+    yield result
+    if result.proven_optimal:
+        return
+    search = _SequentialSearch(numbers, num_parts, integral, limits, best)
+    if limits.stopped:
+        return
+    while bound < best:
+        new_parts = search.partition_at_most(bound)
+        if limits.stopped:
+            return
+        if new_parts is not None:
+            sizes = [sum(numbers[i] for i in part) for part in new_parts]
+            yield _to_result(numbers, new_parts, sizes, return_indices, compact, True)
+            return
+        bound = search.next_bound
+    # No partition has a smaller largest part than the initial one.
+    result.proven_optimal = True
+
+
+class _SequentialSearch:
+    """Searches for partitions whose parts are no larger than a bound.
+
+    After an unsuccessful search, ``next_bound`` is the smallest bound for which a
+    search could succeed; this is the smallest value that would have allowed a
+    subset to be used that was ruled out by the bound. The subsets making up the
+    first part, which do not depend on the bound other than through their sums, are
+    cached, as long as there are at most ``_CACHE_SIZE`` of them with sums below
+    ``upper_bound``.
+    """
+
+    def __init__(
+        self,
+        numbers: List[int],
+        num_parts: int,
+        integral: bool,
+        limits: _SearchLimits,
+        upper_bound: float,
+    ):
+        self.order = sorted(range(len(numbers)), key=numbers.__getitem__, reverse=True)
+        self.values = [numbers[i] for i in self.order]
+        self.num_parts = num_parts
+        self.integral = integral
+        self.limits = limits
+        self.next_bound: float = inf
+        self.cache: Optional[List[Tuple[float, List[int], float]]] = None
+        self._fill_cache(upper_bound)
+
+    def partition_at_most(self, bound: float) -> Optional[List[List[int]]]:
+        """Find a partition whose parts are no larger than the bound, giving the parts
+        as lists of indices of the numbers."""
+        self.bound = bound
+        self.next_bound = inf
+        positions = list(range(len(self.values)))
+        if self.cache is None:
+            parts = self._search(positions, self.num_parts)
+        else:
+            parts = self._search_cached(positions)
+        if parts is None:
+            return None
+        return [[self.order[position] for position in part] for part in parts]
+
+    def _fill_cache(self, upper_bound: float) -> None:
+        positions = list(range(len(self.values)))
+        if self.num_parts < 2 or not positions:
+            return
+        self.bound = upper_bound
+        total = sum(self.values)
+        low = total - (self.num_parts - 1) * upper_bound
+        cache = []
+        for subset in self._subsets(positions, low, self.num_parts):
+            cache.append(subset)
+            if len(cache) > _CACHE_SIZE:
+                return
+        if not self.limits.stopped:
+            self.cache = cache
+
+    def _search_cached(self, positions: List[int]) -> Optional[List[List[int]]]:
+        assert self.cache is not None
+        total = sum(self.values)
+        for subset_sum, subset, smallest_excluded in self.cache:
+            if self.limits.should_stop(True):
+                return None
+            if subset_sum > self.bound:
+                self._record(subset_sum)
+                continue
+            if subset_sum + smallest_excluded <= self.bound:
+                continue
+            remaining_total = total - subset_sum
+            if remaining_total > (self.num_parts - 1) * self.bound:
+                self._record_shortfall(remaining_total, self.num_parts - 1)
+                continue
+            parts = self._search_rest(positions, subset, self.num_parts)
+            if parts is not None or self.limits.stopped:
+                return parts
+        return None
+
+    def _search(
+        self, positions: List[int], num_parts: int
+    ) -> Optional[List[List[int]]]:
+        """Partition the numbers at the given positions into parts no larger than the
+        bound, the first part containing the largest of the numbers."""
+        if not positions:
+            return [[] for _ in range(num_parts)]
+        total = sum(self.values[position] for position in positions)
+        if num_parts == 1:
+            if total <= self.bound:
+                return [positions]
+            self._record(total)
+            return None
+        low = total - (num_parts - 1) * self.bound
+        for _, subset, _ in self._subsets(positions, low, num_parts):
+            parts = self._search_rest(positions, subset, num_parts)
+            if parts is not None or self.limits.stopped:
+                return parts
+        return None
+
+    def _search_rest(
+        self, positions: List[int], subset: List[int], num_parts: int
+    ) -> Optional[List[List[int]]]:
+        chosen = set(subset)
+        rest = [position for position in positions if position not in chosen]
+        parts = self._search(rest, num_parts - 1)
+        return None if parts is None else [subset] + parts
+
+    def _subsets(
+        self, positions: List[int], low: float, num_parts: int
+    ) -> Iterator[Tuple[float, List[int], float]]:
+        """Generate the subsets of the numbers at the given positions that contain the
+        first of them, and whose sums are between low and the bound, along with the
+        smallest of the numbers left out of them.
+
+        Subsets are generated by including or excluding one number at a time, with
+        only the first ones among equal numbers ever included; the sums of the numbers
+        after each position are computed once, so that subsets whose sums can not
+        reach low are given up on right away. Sums too large or too small for the
+        bound are recorded to find the next bound. Subsets to which one of the numbers
+        left out could be added without exceeding the bound are dominated, as that
+        number could always be moved into the subset, and are skipped.
+        """
+        values = [self.values[position] for position in positions]
+        num_values = len(values)
+        remaining = [0] * (num_values + 1)
+        for i in range(num_values - 1, -1, -1):
+            remaining[i] = remaining[i + 1] + values[i]
+        next_different = [num_values] * num_values
+        for i in range(num_values - 2, -1, -1):
+            if values[i + 1] == values[i]:
+                next_different[i] = next_different[i + 1]
+            else:
+                next_different[i] = i + 1
+        total = remaining[0]
+        chosen = [positions[0]]
+
+        def search(
+            i: int, subset_sum: float, smallest_excluded: float
+        ) -> Iterator[Tuple[float, List[int], float]]:
+            if self.limits.should_stop(True):
+                return
+            if subset_sum > self.bound:
+                self._record(subset_sum)
+                return
+            if subset_sum + remaining[i] < low:
+                self._record_shortfall(total - subset_sum - remaining[i], num_parts - 1)
+                return
+            if subset_sum + remaining[i] + smallest_excluded <= self.bound:
+                # Every subset from here on is dominated.
+                return
+            if i == num_values:
+                yield subset_sum, list(chosen), smallest_excluded
+                return
+            chosen.append(positions[i])
+            yield from search(i + 1, subset_sum + values[i], smallest_excluded)
+            chosen.pop()
+            yield from search(next_different[i], subset_sum, values[i])
+
+        return search(1, values[0], inf)
+
+    def _record(self, part_sum: float) -> None:
+        self.next_bound = min(self.next_bound, part_sum)
+
+    def _record_shortfall(self, remaining_total: float, num_parts: int) -> None:
+        """Record the bound needed to fit the given total into the given number of
+        parts."""
+        if self.integral:
+            needed: float = -(-remaining_total // num_parts)
+        else:
+            needed = remaining_total / num_parts
+        self.next_bound = min(self.next_bound, needed)
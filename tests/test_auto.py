@@ -0,0 +1,65 @@
+import sys
+from typing import List
+
+import pytest
+
+from numberpartitioning import (
+    complete_karmarkar_karp,
+    greedy,
+    karmarkar_karp,
+    partition,
+    sequential_number_partitioning,
+)
+
+
+def _difference(sizes: List[int]) -> int:
+    return max(sizes) - min(sizes)
+
+
+def test_partition_uses_karmarkar_karp_by_default() -> None:
+    numbers = [5, 5, 5, 4, 4, 3, 3, 1]
+    assert partition(numbers, 3) == karmarkar_karp(numbers, 3)
+    assert partition(numbers, 3, return_indices=True) == karmarkar_karp(
+        numbers, 3, return_indices=True
+    )
+
+
+def test_partition_falls_back_to_greedy(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(sys.modules["numberpartitioning.auto"], "_HEURISTIC_TIME", 0)
+    numbers = [5, 5, 5, 4, 4, 3, 3, 1]
+    assert partition(numbers, 3) == greedy(numbers, 3)
+
+
+@pytest.mark.parametrize("num_parts", [2, 3, 4])
+def test_partition_finds_optimum(num_parts: int) -> None:
+    numbers = [(i * 7919) % 1009 for i in range(1, 15)]
+    *_, expected = complete_karmarkar_karp(numbers, num_parts, method="purepython")
+    result = partition(numbers, num_parts, optimal=True)
+    assert result.proven_optimal
+    assert _difference(result.sizes) == _difference(expected.sizes)
+    assert sorted(sum(result.partition, [])) == sorted(numbers)
+
+
+def test_partition_minimizes_largest_part() -> None:
+    numbers = [(i * 7919) % 1009 for i in range(1, 31)]
+    *_, expected = sequential_number_partitioning(numbers, 10)
+    result = partition(numbers, 10, optimal=True, objective="largest_part")
+    assert result.proven_optimal
+    assert max(result.sizes) == max(expected.sizes)
+
+
+def test_partition_respects_time_limit(monkeypatch: pytest.MonkeyPatch) -> None:
+    numbers = [(i * 7919) % 100003 for i in range(1, 41)]
+    result = partition(numbers, 8, time_limit=0.1)
+    assert _difference(result.sizes) <= _difference(karmarkar_karp(numbers, 8).sizes)
+    # When not even the first partition of the search is expected within the time
+    # limit, a heuristic is used.
+    module = sys.modules["numberpartitioning.auto"]
+    monkeypatch.setattr(module, "_FIRST_LEAF_TIME_PER_SQUARED_NUMBER", 1)
+    assert partition(numbers, 8, time_limit=1) == karmarkar_karp(numbers, 8)
+    assert partition(numbers, 8, time_limit=0) == greedy(numbers, 8)
+
+
+def test_partition_raises_unsupported_objective() -> None:
+    with pytest.raises(ValueError):
+        partition([1, 2, 3], objective="foo")
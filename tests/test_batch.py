@@ -0,0 +1,74 @@
+import random
+from typing import Any, List
+
+import pytest
+
+from numberpartitioning import greedy, partition_many
+from numberpartitioning.batch import ALGORITHMS
+
+np = pytest.importorskip("numpy")
+
+
+def _random_instances(seed: int, count: int) -> List[List[Any]]:
+    rng = random.Random(seed)
+    return [
+        [rng.randint(0, 50) for _ in range(rng.randint(0, 30))] for _ in range(count)
+    ]
+
+
+@pytest.mark.parametrize("algorithm", ["greedy", "karmarkar_karp"])
+def test_partition_many_agrees_with_algorithms(algorithm: str) -> None:
+    instances = [[4, 5, 6, 7, 8], [5, 8, 6, 4, 7], *_random_instances(0, 200)]
+    instances = [instance for instance in instances if instance]
+    for num_parts in [2, 3, 7]:
+        results = partition_many(instances, num_parts, algorithm)
+        assert len(results) == len(instances)
+        assert results.sizes.shape == (len(instances), num_parts)
+        for i, numbers in enumerate(instances):
+            expected = ALGORITHMS[algorithm](numbers, num_parts, True)
+            assert list(map(sorted, expected.partition)) == results[i].partition
+            assert expected.sizes == results[i].sizes
+
+
+def test_partition_many_columnar_result() -> None:
+    results = partition_many([[4, 5, 6, 7, 8], [1, 2]], num_parts=3)
+    assert results.offsets.tolist() == [0, 5, 7]
+    assert results.assignments.tolist() == [1, 2, 2, 1, 0, 1, 2]
+    assert results.sizes.tolist() == [[8, 11, 11], [0, 1, 2]]
+
+
+def test_partition_many_accepts_padded_array() -> None:
+    instances = [instance for instance in _random_instances(1, 50) if instance]
+    lengths = [len(instance) for instance in instances]
+    padded = np.zeros((len(instances), max(lengths)), dtype=np.int64)
+    for i, instance in enumerate(instances):
+        padded[i] = instance + [1000] * (padded.shape[1] - len(instance))
+    for algorithm in ["greedy", "karmarkar_karp"]:
+        results = partition_many(padded, 4, algorithm, lengths=lengths)
+        expected = partition_many(instances, 4, algorithm)
+        assert results.assignments.tolist() == expected.assignments.tolist()
+        assert results.sizes.tolist() == expected.sizes.tolist()
+
+
+def test_partition_many_greedy_handles_floats_and_large_integers() -> None:
+    instances: List[List[Any]] = [[1.5, 2.5, 1.0, 0.25], [2**62] * 3 + [1]]
+    results = partition_many(instances, 2, "greedy")
+    for i, numbers in enumerate(instances):
+        expected = greedy(numbers, 2, True)
+        assert list(map(sorted, expected.partition)) == results[i].partition
+        assert expected.sizes == results[i].sizes
+    results = partition_many(instances[1:], 2, "greedy")
+    assert results.sizes.tolist() == [[2**63, 2**62 + 1]]
+
+
+def test_partition_many_with_workers() -> None:
+    instances = [instance for instance in _random_instances(2, 40) if instance]
+    results = partition_many(instances, 3, workers=2)
+    expected = partition_many(instances, 3)
+    assert results.assignments.tolist() == expected.assignments.tolist()
+    assert results.sizes.tolist() == expected.sizes.tolist()
+
+
+def test_partition_many_raises_unsupported_algorithm() -> None:
+    with pytest.raises(ValueError):
+        partition_many([[1, 2, 3]], algorithm="foo")
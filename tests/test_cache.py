@@ -0,0 +1,86 @@
+import random
+from typing import List
+
+import pytest
+
+from numberpartitioning import PartitionCache, complete_karmarkar_karp
+from numberpartitioning.common import CompactPartitioningResult
+
+
+def test_partition_cache_maps_partitions_to_order_of_numbers() -> None:
+    rng = random.Random(0)
+    numbers = [rng.randrange(1000) for _ in range(20)]
+    cache = PartitionCache()
+    result = cache.partition(numbers, 3)
+    *_, expected = complete_karmarkar_karp(numbers, 3)
+    assert max(result.sizes) - min(result.sizes) == max(expected.sizes) - min(
+        expected.sizes
+    )
+    assert result.proven_optimal
+    assert (cache.hits, cache.misses) == (0, 1)
+    shuffled = list(numbers)
+    rng.shuffle(shuffled)
+    for return_indices in [False, True]:
+        cached = cache.partition(shuffled, 3, return_indices)
+        assert cached.sizes == result.sizes
+        assert cached.proven_optimal
+        for part, size in zip(cached.partition, cached.sizes):
+            values = [shuffled[i] for i in part] if return_indices else part
+            assert sum(values) == size
+        elements = sorted(x for part in cached.partition for x in part)
+        assert elements == (list(range(20)) if return_indices else sorted(numbers))
+    assert (cache.hits, cache.misses) == (2, 1)
+    compact = cache.partition(shuffled, 3, compact=True)
+    assert isinstance(compact, CompactPartitioningResult)
+    assert compact.partition == cache.partition(shuffled, 3).partition
+
+
+def test_partition_cache_keys_on_parameters() -> None:
+    numbers = [4, 5, 6, 7, 8]
+    cache = PartitionCache()
+    cache.partition(numbers, 3, algorithm="greedy")
+    cache.partition(numbers, 2, algorithm="greedy")
+    cache.partition(numbers, 3, algorithm="karmarkar_karp")
+    cache.partition(numbers, 3, method="purepython")
+    cache.partition([4.0, 5.0, 6.0, 7.0, 8.0], 3, method="purepython")
+    assert (cache.hits, cache.misses) == (0, 5)
+    assert len(cache) == 5
+    cache.partition(numbers[::-1], 3, method="purepython")
+    assert (cache.hits, cache.misses) == (1, 5)
+    with pytest.raises(ValueError):
+        cache.partition(numbers, algorithm="unknown")
+    with pytest.raises(ValueError):
+        cache.partition(numbers, algorithm="complete_greedy", objective=max)
+
+
+def test_partition_cache_evicts_least_recently_used() -> None:
+    cache = PartitionCache(max_size=2)
+    instances: List[List[int]] = [[1, 2, 3], [4, 5, 6], [7, 8, 9]]
+    cache.partition(instances[0])
+    cache.partition(instances[1])
+    cache.partition(instances[0])
+    cache.partition(instances[2])
+    assert len(cache) == 2
+    cache.partition(instances[0])
+    cache.partition(instances[1])
+    assert (cache.hits, cache.misses) == (2, 4)
+    cache.clear()
+    assert len(cache) == 0
+
+
+def test_partition_cache_keeps_partitions_in_database(tmp_path: str) -> None:
+    path = f"{tmp_path}/cache.sqlite"
+    numbers = [0.5, 1.25, 2.0, 3.5, 4.0]
+    cache = PartitionCache(max_size=2, path=path)
+    result = cache.partition(numbers, 2, return_indices=True)
+    cache.partition([1, 2, 3], 2)
+    cache.close()
+    cache = PartitionCache(max_size=2, path=path)
+    assert len(cache) == 2
+    assert cache.partition(numbers, 2, return_indices=True) == result
+    assert (cache.hits, cache.misses) == (1, 0)
+    cache.partition([4, 5, 6], 2)
+    assert len(cache) == 2
+    cache.partition(numbers, 2)
+    assert cache.hits == 2
+    cache.close()
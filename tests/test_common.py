@@ -0,0 +1,85 @@
+from array import array
+
+import pytest
+
+from numberpartitioning.common import (
+    CompactPartitioningResult,
+    PartitioningResult,
+    _as_array,
+    _perfect_difference,
+    _Reduction,
+)
+
+
+def test_compact_result_builds_partition_lazily() -> None:
+    numbers = [5, 8, 6, 4, 7]
+    result = CompactPartitioningResult(
+        array("l", [2, 0, 2, 1, 1]), [8, 11, 11], numbers
+    )
+    assert result._partition is None
+    assert result.partition == [[8], [4, 7], [5, 6]]
+    assert result.partition is result.partition
+    indices = CompactPartitioningResult(array("l", [2, 0, 2, 1, 1]), [8, 11, 11])
+    assert indices.partition == [[1], [3, 4], [0, 2]]
+    assert result != indices
+    assert not hasattr(result, "__dict__")
+
+
+def test_perfect_difference() -> None:
+    assert _perfect_difference([4, 5, 6, 7, 8], 3) == 0
+    assert _perfect_difference([4, 5, 6, 7, 9], 3) == 1
+    assert _perfect_difference([1.5, 2.5, 3.0], 2) == pytest.approx(0, abs=1e-14)
+    # The largest number can not be balanced by the others.
+    assert _perfect_difference([20, 5, 6, 8], 3) == 11
+    # For floats, the bound allows for rounding.
+    assert 10.5 < _perfect_difference([20.0, 5.0, 6.0, 8.0], 3) < 10.5 + 1e-12
+    # Some parts are empty, or each number is alone in a part.
+    assert _perfect_difference([3, 8], 3) == 8
+    assert _perfect_difference([3, 8, 5], 3) == 5
+    assert _perfect_difference([20, -5, 6, 7], 3) == 1
+    assert _perfect_difference([], 3) == 0
+    assert _perfect_difference([5, 2], 1) == 0
+
+
+def test_reduction_takes_out_number_at_least_as_large_as_the_others() -> None:
+    numbers = [3, 20, 5, 4, 8]
+    reduction = _Reduction(numbers, 3)
+    assert reduction.singleton == 1
+    assert reduction.numbers == [3, 5, 4, 8]
+    assert reduction.num_parts == 2
+    # With the other parts summing to 20, a difference of 12 between the largest
+    # part of 20 and the smallest part means a difference of 4 between the others.
+    assert reduction.target(12) == 4
+    results = [
+        PartitioningResult([[3, 5], [4, 8]], [8, 12]),
+        PartitioningResult([[3, 4, 8], [5]], [15, 5]),
+    ]
+    reduced = list(reduction.results(iter(results), False, False))
+    assert reduced == [
+        PartitioningResult([[3, 5], [4, 8], [20]], [8, 12, 20]),
+        PartitioningResult([[3, 4, 8], [5], [20]], [15, 5, 20]),
+    ]
+    indices = [PartitioningResult([[0, 1], [2, 3]], [8, 12], True)]
+    assert list(reduction.results(iter(indices), True, False)) == [
+        PartitioningResult([[0, 2], [3, 4], [1]], [8, 12, 20], True)
+    ]
+    compact = [CompactPartitioningResult(array("l", [0, 0, 1, 1]), [8, 12])]
+    (result,) = reduction.results(iter(compact), False, True)
+    assert isinstance(result, CompactPartitioningResult)
+    assert list(result.assignment) == [0, 2, 0, 1, 1]
+    assert result.partition == [[3, 5], [4, 8], [20]]
+    for num_parts in [2, 4]:
+        assert _Reduction(numbers, num_parts).singleton is None
+    assert _Reduction([3, 10, 5, 4, 8], 3).singleton is None
+
+
+def test_as_array_views_buffers_without_copying() -> None:
+    np = pytest.importorskip("numpy")
+    numbers = array("d", [1.5, 2.5])
+    values = _as_array(numbers)
+    numbers[0] = 3.5
+    assert values.tolist() == [3.5, 2.5]
+    assert _as_array(np.array([1, 2])).tolist() == [1, 2]
+    assert _as_array([1, 2]) is None
+    assert _as_array(np.array([[1, 2]])) is None
+    assert _as_array(np.array(["a"])) is None
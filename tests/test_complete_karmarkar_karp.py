@@ -1,8 +1,14 @@
-from typing import List
+import random
+import sys
+import time
+from itertools import permutations
+from typing import Any, List
 
 import pytest
 
-from numberpartitioning import complete_karmarkar_karp
+from numberpartitioning import complete_karmarkar_karp, karmarkar_karp
+from numberpartitioning.common import SearchStatistics
+from numberpartitioning.complete_karmarkar_karp import _combine_sizes
 
 
 def _argsort(seq: List[List[int]]) -> List[int]:
@@ -53,6 +59,17 @@ def test_complete_karmarkar_karp_unordered_indices() -> None:
         assert [result.sizes[i] for i in indices] == expected_sizes[i]
 
 
+def test_complete_karmarkar_karp_indices_with_duplicates() -> None:
+    numbers = [5, 5, 5, 4, 4, 3, 3, 1]
+    for num_parts in [2, 3]:
+        for result in complete_karmarkar_karp(numbers, num_parts, True):
+            assert sorted(sum(result.partition, [])) == list(range(len(numbers)))
+            assert [
+                sum(numbers[i] for i in part) for part in result.partition
+            ] == result.sizes
+            assert all(part == sorted(part) for part in result.partition)
+
+
 def test_complete_karmarkar_karp_optimal_solution() -> None:
     numbers = [4, 5, 6, 7, 8]
     expected_partitions = [[[4, 5, 7], [6, 8]], [[4, 5, 6], [7, 8]]]
@@ -68,17 +85,17 @@ def test_complete_karmarkar_karp_larger_example() -> None:
     numbers = list(range(10, 30))
     expected_partitions = [
         [
-            [10, 13, 15, 19, 21, 25, 28],
-            [11, 12, 16, 18, 22, 24, 27],
+            [10, 12, 16, 18, 22, 24, 28],
+            [11, 13, 15, 19, 21, 25, 27],
             [14, 17, 20, 23, 26, 29],
         ],
         [
-            [10, 12, 16, 18, 22, 24, 28],
-            [11, 13, 14, 19, 21, 25, 27],
+            [10, 12, 16, 19, 21, 25, 27],
+            [11, 13, 14, 18, 22, 24, 28],
             [15, 17, 20, 23, 26, 29],
         ],
     ]
-    expected_sizes = [[131, 130, 129], [130, 130, 130]]
+    expected_sizes = [[130, 131, 129], [130, 130, 130]]
     results = complete_karmarkar_karp(numbers, num_parts=3)
     for i, result in enumerate(results):
         indices = _argsort(result.partition)
@@ -91,22 +108,22 @@ def test_complete_karmarkar_karp_no_index_error() -> None:
     results = complete_karmarkar_karp(numbers, num_parts=7)
     expected_partitions = [
         [
-            [10, 21, 22, 29, 40, 47],
-            [11, 20, 23, 30, 39, 46],
-            [12, 19, 24, 31, 38, 45],
-            [13, 18, 25, 32, 37, 44],
-            [14, 17, 26, 33, 36, 43],
-            [15, 28, 35, 41, 49],
-            [16, 27, 34, 42, 48],
+            [10, 15, 28, 33, 36, 47],
+            [11, 16, 27, 32, 37, 46],
+            [12, 17, 26, 31, 38, 45],
+            [13, 18, 25, 30, 39, 44],
+            [14, 19, 24, 29, 40, 43],
+            [20, 23, 35, 41, 49],
+            [21, 22, 34, 42, 48],
         ],
         [
-            [10, 20, 22, 29, 40, 47],
-            [11, 19, 24, 30, 39, 46],
+            [10, 15, 27, 33, 36, 47],
+            [11, 17, 26, 32, 37, 46],
             [12, 18, 25, 31, 38, 45],
-            [13, 17, 26, 32, 37, 44],
-            [14, 16, 27, 33, 36, 43],
-            [15, 28, 35, 41, 49],
-            [21, 23, 34, 42, 48],
+            [13, 19, 24, 30, 39, 44],
+            [14, 20, 23, 29, 40, 43],
+            [16, 28, 34, 42, 48],
+            [21, 22, 35, 41, 49],
         ],
     ]
     expected_sizes = [
@@ -124,3 +141,344 @@ def test_complete_karmarkar_karp_no_index_error() -> None:
 def test_complete_karmarkar_karp_raises_unsupported_method() -> None:
     with pytest.raises(ValueError):
         complete_karmarkar_karp([1, 2, 3], method="foo")
+
+
+def test_combine_sizes_yields_distinct_combinations_best_first() -> None:
+    sizes_1 = [1, 3, 3, 8, 12]
+    sizes_2 = [0, 2, 5, 5, 9]
+    combinations = list(_combine_sizes(sizes_1, sizes_2))
+    new_sizes = [
+        sorted(sizes_1[i] + size for i, size in zip(combination, sizes_2))
+        for combination in combinations
+    ]
+    expected_new_sizes = {
+        tuple(sorted(map(sum, zip(permutation, sizes_2))))
+        for permutation in permutations(sizes_1)
+    }
+    assert all(sorted(combination) == list(range(5)) for combination in combinations)
+    assert {tuple(sizes) for sizes in new_sizes} == expected_new_sizes
+    assert len(new_sizes) == len(expected_new_sizes)
+    differences = [sizes[-1] - sizes[0] for sizes in new_sizes]
+    assert differences == sorted(differences)
+    assert combinations[0] == [4, 3, 2, 1, 0]
+
+
+def test_combine_sizes_with_many_equal_sizes_is_fast() -> None:
+    num_parts = 30
+    start = time.perf_counter()
+    combinations = list(
+        _combine_sizes(list(range(1, num_parts + 1)), [0] * (num_parts - 1) + [100])
+    )
+    assert time.perf_counter() - start < 1
+    assert len(combinations) == num_parts
+    assert combinations[0][-1] == 0
+
+
+def test_complete_karmarkar_karp_many_parts() -> None:
+    numbers = list(range(1, 13))
+    start = time.perf_counter()
+    *_, result = complete_karmarkar_karp(numbers, num_parts=10)
+    assert time.perf_counter() - start < 5
+    assert result.proven_optimal
+    assert max(result.sizes) - min(result.sizes) == 7
+
+
+def test_combine_sizes_can_be_stopped() -> None:
+    sizes = list(range(20))
+    num_calls = 0
+
+    def should_stop() -> bool:
+        nonlocal num_calls
+        num_calls += 1
+        return num_calls > 100
+
+    assert list(_combine_sizes(sizes, sizes, lambda: True)) == []
+    combinations = list(_combine_sizes(sizes, sizes, should_stop))
+    assert combinations
+    assert num_calls == 101
+
+
+def test_complete_karmarkar_karp_marks_optimal_result() -> None:
+    numbers = list(range(10, 30))
+    *_, result = complete_karmarkar_karp(numbers, num_parts=3)
+    assert result.proven_optimal
+    numbers = [5, 5, 5, 4, 4, 3, 3, 1]
+    results = list(complete_karmarkar_karp(numbers, num_parts=2))
+    assert [result.proven_optimal for result in results] == [False] * (
+        len(results) - 1
+    ) + [True]
+
+
+def test_complete_karmarkar_karp_respects_limits() -> None:
+    numbers = [(i * 7919) % 100003 for i in range(1, 41)]
+    results = list(complete_karmarkar_karp(numbers, num_parts=8, max_nodes=50))
+    assert len(results) == 1
+    assert not results[0].proven_optimal
+    results = list(complete_karmarkar_karp(numbers, num_parts=8, time_limit=0))
+    assert len(results) == 1
+    first = results[0]
+    target = max(first.sizes) - min(first.sizes)
+    results = list(
+        complete_karmarkar_karp(numbers, num_parts=8, target_difference=target)
+    )
+    assert results == [first]
+
+
+def test_complete_karmarkar_karp_records_statistics() -> None:
+    rng = random.Random(0)
+    numbers = [rng.randrange(2**32) for _ in range(12)]
+    stats = SearchStatistics()
+    results = list(complete_karmarkar_karp(numbers, num_parts=3, stats=stats))
+    assert results[-1].proven_optimal
+    assert len(stats.improvement_times) == len(results)
+    assert stats.improvement_times == sorted(stats.improvement_times)
+    assert stats.nodes > 0
+    assert stats.pruned > 0
+    assert 0 < stats.max_stack_size <= len(numbers)
+    stats = SearchStatistics()
+    results = list(
+        complete_karmarkar_karp(numbers, num_parts=3, max_nodes=50, stats=stats)
+    )
+    assert not results[-1].proven_optimal
+    assert stats.nodes == 51
+
+
+@pytest.mark.parametrize("method", ["auto", "horowitz_sahni", "dp"])
+def test_complete_karmarkar_karp_records_statistics_for_two_parts(
+    method: str,
+) -> None:
+    numbers = [(i * 7919) % 1009 for i in range(1, 31)]
+    stats = SearchStatistics()
+    results = list(complete_karmarkar_karp(numbers, 2, method=method, stats=stats))
+    assert len(stats.improvement_times) == len(results)
+    assert stats.nodes > 0
+
+
+def test_complete_karmarkar_karp_parallel_finds_optimum() -> None:
+    numbers = [(i * 7919) % 1009 for i in range(1, 15)]
+    for num_parts in [2, 3, 4]:
+        *_, expected = complete_karmarkar_karp(numbers, num_parts=num_parts)
+        results = list(
+            complete_karmarkar_karp(
+                numbers, num_parts=num_parts, method="parallel", time_limit=60
+            )
+        )
+        differences = [max(result.sizes) - min(result.sizes) for result in results]
+        assert differences == sorted(set(differences), reverse=True)
+        assert differences[-1] == max(expected.sizes) - min(expected.sizes)
+        assert results[-1].proven_optimal
+        assert sorted(sum(results[-1].partition, [])) == sorted(numbers)
+
+
+def test_complete_karmarkar_karp_parallel_waits_for_slow_subtrees(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    # Polling far more often than subtrees are completed must not make the search
+    # finish before all subtrees have been searched.
+    module = sys.modules["numberpartitioning.complete_karmarkar_karp"]
+    monkeypatch.setattr(module, "_PARALLEL_POLL_INTERVAL", 1e-4)
+    numbers = [(i * 7919) % 100003 for i in range(1, 17)]
+    *_, expected = complete_karmarkar_karp(numbers, num_parts=4)
+    *_, result = complete_karmarkar_karp(
+        numbers, num_parts=4, method="parallel", time_limit=60
+    )
+    assert result.sizes == expected.sizes
+    assert result.proven_optimal
+
+
+@pytest.mark.parametrize("method", ["lds", "beam"])
+def test_complete_karmarkar_karp_strategies_find_optimum(method: str) -> None:
+    numbers = [(i * 7919) % 1009 for i in range(1, 15)]
+    for num_parts in [2, 3, 4]:
+        *_, expected = complete_karmarkar_karp(numbers, num_parts, method="purepython")
+        results = list(complete_karmarkar_karp(numbers, num_parts, method=method))
+        differences = [max(result.sizes) - min(result.sizes) for result in results]
+        assert differences == sorted(set(differences), reverse=True)
+        assert differences[-1] == max(expected.sizes) - min(expected.sizes)
+        assert results[-1].proven_optimal
+        assert sorted(sum(results[-1].partition, [])) == sorted(numbers)
+
+
+def test_complete_karmarkar_karp_beam_continues_depth_first(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    module = sys.modules["numberpartitioning.complete_karmarkar_karp"]
+    monkeypatch.setattr(module, "_BEAM_MAX_WIDTH", 2)
+    rng = random.Random(0)
+    numbers = [rng.randrange(2**32) for _ in range(12)]
+    *_, expected = complete_karmarkar_karp(numbers, 3, method="purepython")
+    stats = SearchStatistics()
+    *_, result = complete_karmarkar_karp(numbers, 3, method="beam", stats=stats)
+    assert result.sizes == expected.sizes
+    assert result.proven_optimal
+    assert stats.max_stack_size > 2
+
+
+@pytest.mark.parametrize("method", ["lds", "beam"])
+def test_complete_karmarkar_karp_strategies_respect_limits(method: str) -> None:
+    rng = random.Random(0)
+    numbers = [rng.randrange(2**32) for _ in range(30)]
+    results = list(complete_karmarkar_karp(numbers, 3, method=method, max_nodes=50))
+    assert not results[-1].proven_optimal
+    results = list(complete_karmarkar_karp(numbers, 3, method=method, time_limit=0))
+    assert len(results) == 1
+    assert not results[0].proven_optimal
+
+
+@pytest.mark.parametrize(
+    "method",
+    [
+        "purepython",
+        "lds",
+        "beam",
+        "parallel",
+        "horowitz_sahni",
+        "schroeppel_shamir",
+        "dp",
+    ],
+)
+def test_complete_karmarkar_karp_compact(method: str) -> None:
+    numbers = [5, 8, 6, 4, 7, 5]
+    for return_indices in [False, True]:
+        results = list(
+            complete_karmarkar_karp(numbers, 2, return_indices, method, time_limit=60)
+        )
+        compact_results = list(
+            complete_karmarkar_karp(
+                numbers, 2, return_indices, method, time_limit=60, compact=True
+            )
+        )
+        assert [sorted(map(sorted, r.partition)) for r in results] == [
+            sorted(map(sorted, r.partition)) for r in compact_results
+        ]
+        assert [r.sizes for r in results] == [r.sizes for r in compact_results]
+        assert compact_results[-1].proven_optimal
+
+
+@pytest.mark.parametrize("method", ["auto", "horowitz_sahni", "schroeppel_shamir"])
+def test_complete_karmarkar_karp_meet_in_the_middle_finds_optimum(method: str) -> None:
+    rng = random.Random(0)
+    for _ in range(100):
+        numbers = [
+            rng.randint(0, rng.choice([5, 1000, 2**40]))
+            for _ in range(rng.randint(1, 12))
+        ]
+        *_, expected = complete_karmarkar_karp(numbers, 2, method="purepython")
+        results = list(complete_karmarkar_karp(numbers, 2, method=method))
+        assert results[0].sizes == karmarkar_karp(numbers).sizes
+        differences = [max(result.sizes) - min(result.sizes) for result in results]
+        assert differences == sorted(set(differences), reverse=True)
+        assert differences[-1] == max(expected.sizes) - min(expected.sizes)
+        assert results[-1].proven_optimal
+        assert sorted(sum(results[-1].partition, [])) == sorted(numbers)
+
+
+def test_complete_karmarkar_karp_meet_in_the_middle_methods_agree() -> None:
+    rng = random.Random(1)
+    numbers = [rng.randrange(2**48) for _ in range(30)]
+    differences = set()
+    for method in ["auto", "horowitz_sahni", "schroeppel_shamir"]:
+        *_, result = complete_karmarkar_karp(numbers, 2, method=method)
+        assert result.proven_optimal
+        differences.add(max(result.sizes) - min(result.sizes))
+    assert len(differences) == 1
+
+
+def test_complete_karmarkar_karp_meet_in_the_middle_respects_limits() -> None:
+    rng = random.Random(2)
+    numbers = [rng.randrange(2**48) for _ in range(40)]
+    for method in ["auto", "schroeppel_shamir"]:
+        results = list(complete_karmarkar_karp(numbers, 2, method=method, max_nodes=10))
+        assert len(results) == 1
+        assert not results[0].proven_optimal
+
+
+def test_complete_karmarkar_karp_meet_in_the_middle_requires_two_parts() -> None:
+    with pytest.raises(ValueError):
+        next(complete_karmarkar_karp([1, 2, 3], 3, method="horowitz_sahni"))
+    with pytest.raises(ValueError):
+        complete_karmarkar_karp([1, 2, 3, 10], 3, method="dp")
+
+
+def test_complete_karmarkar_karp_dp_finds_optimum() -> None:
+    rng = random.Random(3)
+    for _ in range(100):
+        scale = rng.choice([1, 7])
+        numbers = [
+            scale * rng.randint(0, rng.choice([5, 1000]))
+            for _ in range(rng.randint(1, 12))
+        ]
+        *_, expected = complete_karmarkar_karp(numbers, 2, method="purepython")
+        results = list(complete_karmarkar_karp(numbers, 2, method="dp"))
+        assert results[0].sizes == sorted(karmarkar_karp(numbers).sizes)
+        assert max(results[-1].sizes) - min(results[-1].sizes) == max(
+            expected.sizes
+        ) - min(expected.sizes)
+        assert results[-1].proven_optimal
+        assert sorted(sum(results[-1].partition, [])) == sorted(numbers)
+
+
+def test_complete_karmarkar_karp_dp_many_numbers() -> None:
+    rng = random.Random(4)
+    numbers = [2 * rng.randint(1, 10**4) for _ in range(2000)]
+    numbers[0] += 1
+    for method in ["dp", "auto"]:
+        *_, result = complete_karmarkar_karp(numbers, 2, method=method, time_limit=60)
+        assert result.proven_optimal
+        assert max(result.sizes) - min(result.sizes) == 1
+        assert [sum(part) for part in result.partition] == result.sizes
+
+
+def test_complete_karmarkar_karp_dp_requires_non_negative_integers() -> None:
+    numbers_list: List[List[Any]] = [[1.5, 2.0, 3.5], [3, -1, 2]]
+    for numbers in numbers_list:
+        with pytest.raises(ValueError):
+            next(complete_karmarkar_karp(numbers, 2, method="dp"))
+
+
+@pytest.mark.parametrize("method", ["purepython", "lds", "beam", "auto"])
+def test_complete_karmarkar_karp_stops_at_lower_bound(method: str) -> None:
+    # The total is odd, so the first partition is perfect.
+    results = list(complete_karmarkar_karp([8, 7, 6, 5, 3], 2, method=method))
+    assert len(results) == 1
+    assert results[0].sizes == [14, 15]
+    assert results[0].proven_optimal
+    # No partition can do better than leaving the largest number alone.
+    results = list(complete_karmarkar_karp([30, 7, 6, 5, 3], 3, method=method))
+    assert len(results) == 1
+    assert max(results[0].sizes) - min(results[0].sizes) == 20
+    assert results[0].proven_optimal
+
+
+@pytest.mark.parametrize("compact", [False, True])
+def test_complete_karmarkar_karp_takes_out_large_number(compact: bool) -> None:
+    rng = random.Random(0)
+    others = [rng.randrange(1000) for _ in range(20)]
+    numbers = others[:10] + [sum(others)] + others[10:]
+    *_, result = complete_karmarkar_karp(numbers, 3, compact=compact)
+    assert result.proven_optimal
+    assert result.sizes[-1] == sum(others)
+    assert result.partition[-1] == [sum(others)]
+    *_, expected = complete_karmarkar_karp(others, 2)
+    assert result.sizes[:2] == expected.sizes
+    *_, result = complete_karmarkar_karp(numbers, 3, True, compact=compact)
+    assert result.partition[-1] == [10]
+    assert sorted(result.partition[0] + result.partition[1]) == [
+        i for i in range(21) if i != 10
+    ]
+
+
+@pytest.mark.parametrize("method", ["purepython", "horowitz_sahni"])
+def test_complete_karmarkar_karp_accepts_arrays(method: str) -> None:
+    np = pytest.importorskip("numpy")
+    numbers = [4, 5, 6, 7, 8]
+    expected = list(complete_karmarkar_karp(numbers, method=method))
+    results = list(complete_karmarkar_karp(np.array(numbers), method=method))
+    assert [result.sizes for result in results] == [result.sizes for result in expected]
+
+
+def test_complete_karmarkar_karp_float_partition_optimal_up_to_rounding() -> None:
+    # The parts 0.1 + 0.2 and 0.3 differ only by rounding.
+    result = next(complete_karmarkar_karp([0.1, 0.2, 0.3], method="purepython"))
+    assert max(result.sizes) - min(result.sizes) > 0
+    assert result.proven_optimal
@@ -1,5 +1,16 @@
+import random
+from array import array
+from itertools import product
+from typing import Any, List
+
+import pytest
+
 from numberpartitioning import complete_greedy, greedy
-from numberpartitioning.common import Partition
+from numberpartitioning.common import (
+    CompactPartitioningResult,
+    Partition,
+    SearchStatistics,
+)
 
 
 def test_greedy() -> None:
@@ -45,6 +56,45 @@ def test_greedy_large_problem() -> None:
     assert max(result.sizes) - min(result.sizes) == 799
 
 
+def test_greedy_many_parts() -> None:
+    numbers = [(i * 7919) % 1009 for i in range(2000)]
+    result = greedy(numbers, num_parts=500, return_indices=True)
+    assert sorted(sum(result.partition, [])) == list(range(2000))
+    assert [sum(numbers[i] for i in part) for part in result.partition] == result.sizes
+    assert max(result.sizes) - min(result.sizes) <= max(numbers)
+
+
+def test_greedy_numpy_input_agrees_with_list() -> None:
+    np = pytest.importorskip("numpy")
+    rng = random.Random(0)
+    for _ in range(200):
+        numbers = [rng.randint(-5, 20) for _ in range(rng.randint(1, 60))]
+        num_parts = rng.randint(1, 20)
+        for return_indices in [False, True]:
+            expected = greedy(numbers, num_parts, return_indices)
+            assert greedy(np.array(numbers), num_parts, return_indices) == expected
+            result = greedy(np.array(numbers), num_parts, return_indices, compact=True)
+            assert result.sizes == expected.sizes
+            assert list(map(sorted, result.partition)) == list(
+                map(sorted, expected.partition)
+            )
+
+
+def test_greedy_float_and_buffer_input_agrees_with_list() -> None:
+    pytest.importorskip("numpy")
+    rng = random.Random(0)
+    for _ in range(100):
+        numbers = [rng.uniform(0, 10) for _ in range(rng.randint(1, 60))]
+        num_parts = rng.randint(1, 20)
+        expected = greedy(numbers, num_parts, return_indices=True)
+        for values in [array("d", numbers), memoryview(array("d", numbers))]:
+            result = greedy(values, num_parts, return_indices=True)
+            assert list(map(sorted, result.partition)) == list(
+                map(sorted, expected.partition)
+            )
+            assert result.sizes == pytest.approx(expected.sizes)
+
+
 def test_complete_greedy_starts_with_greedy_solution() -> None:
     numbers = [4, 5, 6, 7, 8]
     num_parts = 3
@@ -96,3 +146,136 @@ def test_complete_greedy_min_objective_gives_different_partitions() -> None:
         result = next(iterator)
         assert expected_variance == objective(result.partition)
         assert expected_diff == max(result.sizes) - min(result.sizes)
+
+
+def test_complete_greedy_stops_at_perfect_partition() -> None:
+    numbers = [4, 5, 6, 7, 8]
+    results = list(complete_greedy(numbers, num_parts=2))
+    assert [max(r.sizes) - min(r.sizes) for r in results] == [4, 2, 0]
+    assert results[-1].sizes[0] == 15
+
+
+def test_complete_greedy_larger_example_finds_optimum() -> None:
+    numbers = [(i * 37) % 211 for i in range(1, 31)]
+    *_, result = complete_greedy(numbers, num_parts=3)
+    assert sum(numbers) % 3 != 0
+    assert max(result.sizes) - min(result.sizes) == 1
+    assert sorted(x for part in result.partition for x in part) == sorted(numbers)
+
+
+def test_complete_greedy_finds_optimum_for_floats() -> None:
+    numbers: List[Any] = [1.31, 1.49, 0.7, 0.69, 0.66, 1.38, 0.87]
+    *_, result = complete_greedy(numbers, num_parts=2)
+    assert max(result.sizes) - min(result.sizes) == pytest.approx(0.02)
+    assert result.proven_optimal
+    numbers = [6.99, 6.18, 9.75, 2.67, 3.06, 1.23, 1.8]
+    *_, result = complete_greedy(numbers, num_parts=2)
+    assert max(result.sizes) - min(result.sizes) == pytest.approx(0)
+
+
+def test_complete_greedy_marks_optimal_result() -> None:
+    numbers = list(range(20, 30))
+    *_, result = complete_greedy(numbers, num_parts=3)
+    assert result.proven_optimal
+    assert max(result.sizes) - min(result.sizes) == 7
+
+
+def test_complete_greedy_respects_limits() -> None:
+    numbers = list(range(20, 30))
+    results = list(complete_greedy(numbers, num_parts=3, max_nodes=0))
+    assert len(results) == 1
+    assert not results[0].proven_optimal
+    results = list(complete_greedy(numbers, num_parts=3, time_limit=0))
+    assert len(results) == 1
+    results = list(complete_greedy(numbers, num_parts=3, target_difference=15))
+    assert [max(r.sizes) - min(r.sizes) for r in results] == [19, 18, 16, 14]
+    assert not results[-1].proven_optimal
+
+
+def test_complete_greedy_records_statistics() -> None:
+    rng = random.Random(0)
+    numbers = [rng.randrange(2**32) for _ in range(12)]
+    stats = SearchStatistics()
+    results = list(complete_greedy(numbers, num_parts=3, stats=stats))
+    assert results[-1].proven_optimal
+    assert len(stats.improvement_times) == len(results)
+    assert stats.improvement_times == sorted(stats.improvement_times)
+    assert stats.nodes > 0
+    assert stats.pruned > 0
+    assert stats.max_stack_size > 0
+    stats = SearchStatistics()
+    results = list(complete_greedy(numbers, num_parts=3, max_nodes=50, stats=stats))
+    assert not results[-1].proven_optimal
+    assert stats.nodes == 51
+
+
+def test_greedy_compact() -> None:
+    numbers = [5, 8, 6, 4, 7]
+    result = greedy(numbers, num_parts=3, compact=True)
+    assert isinstance(result, CompactPartitioningResult)
+    assert list(result.assignment) == [2, 0, 2, 1, 1]
+    assert result.sizes == [8, 11, 11]
+    assert result.partition == [[8], [4, 7], [5, 6]]
+    result = greedy(numbers, num_parts=3, return_indices=True, compact=True)
+    assert result.partition == [[1], [3, 4], [0, 2]]
+
+
+def test_complete_greedy_compact() -> None:
+    numbers = [4, 5, 6, 7, 8]
+    for return_indices in [False, True]:
+        results = list(complete_greedy(numbers, 3, return_indices))
+        compact_results = list(
+            complete_greedy(numbers, 3, return_indices, compact=True)
+        )
+        assert [list(map(sorted, r.partition)) for r in results] == [
+            r.partition for r in compact_results
+        ]
+        assert [r.sizes for r in results] == [r.sizes for r in compact_results]
+        assert compact_results[-1].proven_optimal
+
+
+def test_greedy_marks_partitions_reaching_lower_bound() -> None:
+    assert greedy([5, 4, 3, 2], 2).proven_optimal
+    assert not greedy([4, 5, 6, 7, 9], 3).proven_optimal
+    result = greedy([30, 7, 6, 5, 3], 3, compact=True)
+    assert result.sizes == [30, 10, 11]
+    assert result.proven_optimal
+
+
+def _brute_force_difference(numbers: List[int], num_parts: int) -> int:
+    best = sum(numbers)
+    for assignment in product(range(num_parts), repeat=len(numbers)):
+        sizes = [0] * num_parts
+        for number, part in zip(numbers, assignment):
+            sizes[part] += number
+        best = min(best, max(sizes) - min(sizes))
+    return best
+
+
+def test_complete_greedy_searches_copies_of_numbers_once() -> None:
+    rng = random.Random(0)
+    for _ in range(50):
+        numbers = [rng.choice([0, 3, 3, 5, 7, 7, 7]) for _ in range(8)]
+        num_parts = rng.choice([2, 3, 4])
+        *_, result = complete_greedy(numbers, num_parts)
+        assert result.proven_optimal
+        assert max(result.sizes) - min(result.sizes) == _brute_force_difference(
+            numbers, num_parts
+        )
+    stats = SearchStatistics()
+    *_, result = complete_greedy([7] * 14 + [3] * 9 + [1], 3, stats=stats)
+    assert max(result.sizes) - min(result.sizes) == 0
+    assert stats.nodes < 100
+
+
+def test_complete_greedy_takes_out_large_number() -> None:
+    numbers = [4, 30, 8, 9, 6]
+    for return_indices in [False, True]:
+        *_, result = complete_greedy(numbers, 3, return_indices)
+        assert result.proven_optimal
+        assert result.sizes == [14, 13, 30]
+        assert result.partition[-1] == [1 if return_indices else 30]
+        *_, compact_result = complete_greedy(numbers, 3, return_indices, compact=True)
+        assert list(map(sorted, compact_result.partition)) == list(
+            map(sorted, result.partition)
+        )
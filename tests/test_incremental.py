@@ -0,0 +1,89 @@
+import random
+from typing import List
+
+from numberpartitioning import IncrementalPartitioner, greedy, karmarkar_karp
+
+
+def _difference(sizes: List[int]) -> int:
+    return max(sizes) - min(sizes)
+
+
+def test_incremental_partitioner_adds_to_smallest_part() -> None:
+    numbers = [8, 7, 6, 5, 4]
+    partitioner = IncrementalPartitioner(3)
+    ids = [partitioner.add(number) for number in numbers]
+    assert ids == [0, 1, 2, 3, 4]
+    assert partitioner.result().partition == greedy(numbers, 3).partition
+    assert partitioner.sizes == [8, 11, 11]
+    assert partitioner.part_of(4) == 1
+    assert len(partitioner) == 5
+
+
+def test_incremental_partitioner_starts_from_karmarkar_karp() -> None:
+    numbers = [5, 5, 5, 4, 4, 3, 3, 1]
+    partitioner = IncrementalPartitioner(3, numbers)
+    expected = karmarkar_karp(numbers, 3, return_indices=True)
+    assert partitioner.result(return_ids=True).partition == [
+        sorted(part) for part in expected.partition
+    ]
+    assert partitioner.sizes == expected.sizes
+    assert partitioner.add(2) == len(numbers)
+
+
+def test_incremental_partitioner_removes_numbers() -> None:
+    partitioner = IncrementalPartitioner(2, [10, 7, 3, 1])
+    assert partitioner.remove(0) == 10
+    assert 0 not in partitioner
+    assert sorted(partitioner.sizes) == [1, 10]
+    result = partitioner.result()
+    assert sorted(sum(result.partition, [])) == [1, 3, 7]
+    assert [sum(part) for part in result.partition] == result.sizes
+
+
+def test_incremental_partitioner_rebalances() -> None:
+    rng = random.Random(0)
+    partitioner = IncrementalPartitioner(4)
+    ids = [partitioner.add(rng.randrange(1000)) for _ in range(200)]
+    for number_id in ids[::2]:
+        partitioner.remove(number_id)
+    before = _difference(partitioner.sizes)
+    assert partitioner.rebalance(0) == 0
+    assert partitioner.rebalance(1) == 1
+    assert _difference(partitioner.sizes) <= before
+    # The repair stops once the largest and the smallest part can not be brought
+    # closer together.
+    assert partitioner.rebalance(1000) < 1000
+    assert _difference(partitioner.sizes) < before / 100
+    assert partitioner.rebalance(1) == 0
+    result = partitioner.result(return_ids=True)
+    assert sorted(sum(result.partition, [])) == ids[1::2]
+    for part_index, part in enumerate(result.partition):
+        assert all(partitioner.part_of(i) == part_index for i in part)
+
+
+def test_incremental_partitioner_swaps_when_no_move_helps() -> None:
+    partitioner = IncrementalPartitioner(2)
+    for number in [5, 6, 9, 1, 8]:
+        partitioner.add(number)
+    partitioner.remove(1)
+    # No number can be moved from [5, 9] to [1, 8] to bring them closer together, but
+    # 5 can be swapped for 1.
+    assert partitioner.result().partition == [[5, 9], [1, 8]]
+    assert partitioner.rebalance(5) == 1
+    assert partitioner.result().partition == [[9, 1], [5, 8]]
+    assert partitioner.sizes == [10, 13]
+
+
+def test_incremental_partitioner_handles_many_updates() -> None:
+    rng = random.Random(1)
+    partitioner = IncrementalPartitioner(10)
+    ids: List[int] = []
+    for _ in range(100_000):
+        if ids and rng.random() < 0.3:
+            partitioner.remove(ids.pop())
+        else:
+            ids.append(partitioner.add(rng.randrange(1000)))
+    assert len(partitioner) == len(ids)
+    assert len(partitioner._smallest_heap) <= 4 * 10 + 16
+    result = partitioner.result(return_ids=True)
+    assert sorted(sum(result.partition, [])) == sorted(ids)
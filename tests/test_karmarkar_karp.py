@@ -1,6 +1,43 @@
+import heapq
+import random
+from itertools import count
+from typing import Any, List, Tuple
+
 import pytest
 
 from numberpartitioning import karmarkar_karp
+from numberpartitioning.common import (
+    CompactPartitioningResult,
+    Partition,
+    PartitioningResult,
+)
+
+
+def _karmarkar_karp_by_concatenation(
+    numbers: List[int], num_parts: int, return_indices: bool
+) -> PartitioningResult:
+    # Reference implementation which concatenates the parts at every merge.
+    partitions: List[Tuple[int, int, Partition, List[int]]] = []
+    heap_count = count()
+    for i, number in enumerate(numbers):
+        this_partition: Partition = [[] for _ in range(num_parts - 1)]
+        this_partition.append([i if return_indices else number])
+        this_sizes = [0] * (num_parts - 1) + [number]
+        heapq.heappush(
+            partitions, (-number, next(heap_count), this_partition, this_sizes)
+        )
+    for _ in range(len(numbers) - 1):
+        _, _, p1, p1_sum = heapq.heappop(partitions)
+        _, _, p2, p2_sum = heapq.heappop(partitions)
+        new_sizes = [p1_sum[j] + p2_sum[num_parts - j - 1] for j in range(num_parts)]
+        new_partition = [p1[j] + p2[num_parts - j - 1] for j in range(num_parts)]
+        indices = sorted(range(num_parts), key=new_sizes.__getitem__)
+        new_sizes = [new_sizes[i] for i in indices]
+        new_partition = [new_partition[i] for i in indices]
+        diff = new_sizes[-1] - new_sizes[0]
+        heapq.heappush(partitions, (-diff, next(heap_count), new_partition, new_sizes))
+    _, _, final_partition, final_sums = partitions[0]
+    return PartitioningResult(final_partition, final_sums)
 
 
 def test_karmarkar_karp() -> None:
@@ -46,6 +83,114 @@ def test_karmarkar_karp_large_problem() -> None:
     assert max(result.sizes) - min(result.sizes) == 603
 
 
+def test_karmarkar_karp_numpy_handles_floats_and_large_integers() -> None:
+    pytest.importorskip("numpy")
+    floats: List[Any] = [1.5, 2.5, 1.0]
+    result = karmarkar_karp(floats, method="numpy")
+    assert result.partition == [[2.5], [1.5, 1.0]]
+    assert result.sizes == [2.5, 2.5]
+    numbers = [2**62] * 3 + [1]
+    result = karmarkar_karp(numbers, method="numpy")
+    assert result.sizes == karmarkar_karp(numbers).sizes == [2**62 + 1, 2**63]
+
+
+def test_karmarkar_karp_skewed_problem() -> None:
+    numbers = [2**i for i in range(200)]
+    result = karmarkar_karp(numbers, num_parts=3, return_indices=True)
+    assert sorted(i for part in result.partition for i in part) == list(range(200))
+    assert [sum(numbers[i] for i in part) for part in result.partition] == result.sizes
+
+
+@pytest.mark.parametrize("method", ["purepython", "numpy"])
+def test_karmarkar_karp_agrees_with_concatenating_parts(method: str) -> None:
+    if method == "numpy":
+        pytest.importorskip("numpy")
+    rng = random.Random(0)
+    instances = [
+        ([4, 5, 6, 7, 8], 3),
+        ([5, 8, 6, 4, 7], 3),
+        (list(range(800, 1200)), 7),
+        ([2**i for i in range(60)], 3),
+    ]
+    for _ in range(50):
+        length = rng.randint(1, 40)
+        numbers = [rng.randint(0, rng.choice([5, 1000, 10**12])) for _ in range(length)]
+        instances.append((numbers, rng.randint(2, 6)))
+    for numbers, num_parts in instances:
+        for return_indices in [False, True]:
+            result = karmarkar_karp(numbers, num_parts, return_indices, method)
+            expected = _karmarkar_karp_by_concatenation(
+                numbers, num_parts, return_indices
+            )
+            assert result.sizes == expected.sizes
+            if method == "numpy":
+                # The NumPy backend does not keep the order of elements within parts.
+                assert list(map(sorted, result.partition)) == list(
+                    map(sorted, expected.partition)
+                )
+            else:
+                assert result.partition == expected.partition
+
+
 def test_karmarkar_karp_raises_unsupported_method() -> None:
     with pytest.raises(ValueError):
         karmarkar_karp([1, 2, 3], method="foo")
+
+
+def test_karmarkar_karp_numpy() -> None:
+    pytest.importorskip("numpy")
+    numbers = [5, 8, 6, 4, 7]
+    expected_partition = [[8], [4, 7], [5, 6]]
+    expected_sizes = [8, 11, 11]
+    result = karmarkar_karp(numbers, num_parts=3, method="numpy")
+    assert result.partition == expected_partition
+    assert result.sizes == expected_sizes
+
+
+def test_karmarkar_karp_numpy_can_give_indices() -> None:
+    pytest.importorskip("numpy")
+    numbers = [5, 8, 6, 4, 7]
+    expected_partition = [[1], [3, 4], [0, 2]]
+    expected_sizes = [8, 11, 11]
+    result = karmarkar_karp(numbers, num_parts=3, return_indices=True, method="numpy")
+    assert result.partition == expected_partition
+    assert result.sizes == expected_sizes
+
+
+def test_karmarkar_karp_numpy_agrees_with_pure_python() -> None:
+    pytest.importorskip("numpy")
+    numbers = [(i * 7919) % 1009 for i in range(500)]
+    for num_parts in [2, 3, 7]:
+        result = karmarkar_karp(numbers, num_parts=num_parts, method="numpy")
+        expected = karmarkar_karp(numbers, num_parts=num_parts)
+        assert result.sizes == expected.sizes
+        assert list(map(sum, result.partition)) == result.sizes
+        assert sorted(map(sorted, result.partition)) == sorted(
+            map(sorted, expected.partition)
+        )
+
+
+@pytest.mark.parametrize("method", ["purepython", "numpy"])
+def test_karmarkar_karp_compact(method: str) -> None:
+    if method == "numpy":
+        pytest.importorskip("numpy")
+    numbers = [5, 8, 6, 4, 7]
+    result = karmarkar_karp(numbers, num_parts=3, method=method, compact=True)
+    assert isinstance(result, CompactPartitioningResult)
+    assert list(result.assignment) == [2, 0, 2, 1, 1]
+    assert result.sizes == [8, 11, 11]
+    assert result.partition == [[8], [4, 7], [5, 6]]
+    result = karmarkar_karp(
+        numbers, num_parts=3, return_indices=True, method=method, compact=True
+    )
+    assert result.partition == [[1], [3, 4], [0, 2]]
+
+
+def test_karmarkar_karp_marks_partitions_reaching_lower_bound() -> None:
+    for method in ["purepython", "numpy"]:
+        if method == "numpy":
+            pytest.importorskip("numpy")
+        result = karmarkar_karp([8, 7, 6, 5, 3], method=method)
+        assert result.sizes == [14, 15]
+        assert result.proven_optimal
+        assert not karmarkar_karp([4, 5, 6, 7, 9], 3, method=method).proven_optimal
@@ -0,0 +1,56 @@
+import random
+from typing import List
+
+from numberpartitioning import greedy, improve, karmarkar_karp
+from numberpartitioning.common import CompactPartitioningResult, PartitioningResult
+
+
+def _difference(sizes: List[int]) -> int:
+    return max(sizes) - min(sizes)
+
+
+def test_improve_greedy_partition() -> None:
+    numbers = [8, 7, 6, 5, 4]
+    result = greedy(numbers, 2)
+    assert result.sizes == [17, 13]
+    improved = improve(result, numbers)
+    assert isinstance(improved, PartitioningResult)
+    assert improved.partition == [[6, 5, 4], [8, 7]]
+    assert improved.sizes == [15, 15]
+    assert improved.proven_optimal
+    assert [sum(part) for part in improved.partition] == improved.sizes
+
+
+def test_improve_never_makes_partitions_worse() -> None:
+    rng = random.Random(0)
+    for _ in range(20):
+        num_parts = rng.randrange(2, 6)
+        numbers = [rng.randrange(10**6) for _ in range(rng.randrange(1, 200))]
+        for result in [greedy(numbers, num_parts), karmarkar_karp(numbers, num_parts)]:
+            improved = improve(result, numbers)
+            assert _difference(improved.sizes) <= _difference(result.sizes)
+            assert sorted(sum(improved.partition, [])) == sorted(numbers)
+
+
+def test_improve_keeps_indices_and_compact_results() -> None:
+    rng = random.Random(1)
+    numbers = rng.sample(range(1000), 100)
+    expected = improve(greedy(numbers, 3), numbers)
+    improved = improve(greedy(numbers, 3, return_indices=True), numbers, None, True)
+    assert [[numbers[i] for i in part] for part in improved.partition] == (
+        expected.partition
+    )
+    assert improved.sizes == expected.sizes
+    compact = improve(greedy(numbers, 3, compact=True), numbers)
+    assert isinstance(compact, CompactPartitioningResult)
+    assert compact.sizes == expected.sizes
+    assert compact.partition == expected.partition
+
+
+def test_improve_respects_time_limit() -> None:
+    rng = random.Random(2)
+    numbers = [rng.randrange(2**32) for _ in range(1000)]
+    result = greedy(numbers, 2, return_indices=True)
+    improved = improve(result, numbers, time_limit=0, return_indices=True)
+    assert improved.sizes == result.sizes
+    assert improved.partition == [sorted(part) for part in result.partition]
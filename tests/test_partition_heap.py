@@ -0,0 +1,64 @@
+import heapq
+import pickle
+import random
+from typing import List, Optional, Tuple
+
+from numberpartitioning.common import Partition
+from numberpartitioning.partition_heap import (
+    _from_items,
+    _items,
+    _PartitionHeap,
+    _pop,
+    _push,
+)
+
+
+def _random_items(count: int) -> List[Tuple[int, int, Partition, List[int]]]:
+    rng = random.Random(0)
+    items = []
+    for i in range(count):
+        sizes = sorted(rng.randrange(100) for _ in range(3))
+        items.append((sizes[-1] - sizes[0], i, [[i], [], []], sizes))
+    return items
+
+
+def test_partition_heap_pops_in_heapq_order() -> None:
+    items = _random_items(200)
+    expected = [(-difference, tiebreak) for difference, tiebreak, _, _ in items]
+    heapq.heapify(expected)
+    heap = _from_items(items)
+    while expected:
+        assert heap is not None
+        assert heapq.heappop(expected) == (-heap.difference, heap.tiebreak)
+        assert heap.size == len(expected) + 1
+        heap = _pop(heap)
+    assert heap is None
+
+
+def test_partition_heap_keeps_track_of_its_partitions() -> None:
+    items = _random_items(50)
+    heap: Optional[_PartitionHeap] = None
+    for i, item in enumerate(items):
+        heap = _push(heap, *item)
+        assert heap.size == i + 1
+        assert heap.largest == max(max(sizes) for *_, sizes in items[: i + 1])
+        assert heap.total == sum(sum(sizes) for *_, sizes in items[: i + 1])
+        assert heap.difference_sum == sum(item[0] for item in items[: i + 1])
+    assert sorted(_items(heap)) == sorted(items)
+
+
+def test_partition_heap_is_persistent() -> None:
+    items = _random_items(20)
+    heap = _from_items(items[:-1])
+    assert heap is not None
+    pushed = _push(heap, *items[-1])
+    popped = _pop(heap)
+    assert sorted(_items(heap)) == sorted(items[:-1])
+    assert sorted(_items(pushed)) == sorted(items)
+    assert popped is not None and popped.size == heap.size - 1
+
+
+def test_partition_heap_can_be_pickled() -> None:
+    heap = _from_items(_random_items(5000))
+    copy = pickle.loads(pickle.dumps(heap))
+    assert sorted(_items(copy)) == sorted(_items(heap))
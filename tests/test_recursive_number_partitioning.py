@@ -0,0 +1,62 @@
+import random
+from itertools import product
+from typing import List
+
+import pytest
+
+from numberpartitioning import karmarkar_karp, recursive_number_partitioning
+
+
+def _smallest_largest_part(numbers: List[int], num_parts: int) -> int:
+    return min(
+        max(
+            sum(number for number, part in zip(numbers, assignment) if part == j)
+            for j in range(num_parts)
+        )
+        for assignment in product(range(num_parts), repeat=len(numbers))
+    )
+
+
+def test_recursive_number_partitioning() -> None:
+    numbers = [5, 5, 5, 4, 4, 3, 3, 1]
+    results = list(recursive_number_partitioning(numbers, num_parts=3))
+    assert results[0].sizes == karmarkar_karp(numbers, num_parts=3).sizes
+    assert sorted(results[-1].sizes) == [10, 10, 10]
+    assert results[-1].proven_optimal
+    assert sorted(sum(results[-1].partition, [])) == sorted(numbers)
+
+
+def test_recursive_number_partitioning_can_give_indices() -> None:
+    numbers = [4, 5, 6, 7, 8]
+    *_, result = recursive_number_partitioning(numbers, 3, return_indices=True)
+    assert sorted(map(sorted, result.partition)) == [[0, 3], [1, 2], [4]]
+    assert sorted(result.sizes) == [8, 11, 11]
+
+
+def test_recursive_number_partitioning_finds_optimum() -> None:
+    rng = random.Random(0)
+    for _ in range(100):
+        numbers = [
+            rng.randint(0, rng.choice([5, 1000])) for _ in range(rng.randint(1, 8))
+        ]
+        num_parts = rng.randint(2, 4)
+        results = list(recursive_number_partitioning(numbers, num_parts))
+        largest = [max(result.sizes) for result in results]
+        assert largest == sorted(set(largest), reverse=True)
+        assert largest[-1] == _smallest_largest_part(numbers, num_parts)
+        assert results[-1].proven_optimal
+        assert [sum(part) for part in results[-1].partition] == results[-1].sizes
+
+
+def test_recursive_number_partitioning_respects_limits() -> None:
+    numbers = [(i * 7919) % 100003 for i in range(1, 41)]
+    results = list(recursive_number_partitioning(numbers, 5, max_nodes=10))
+    assert not results[-1].proven_optimal
+    results = list(recursive_number_partitioning(numbers, 5, time_limit=0))
+    assert len(results) == 1
+    assert not results[0].proven_optimal
+
+
+def test_recursive_number_partitioning_rejects_negative_numbers() -> None:
+    with pytest.raises(ValueError):
+        next(recursive_number_partitioning([3, -1, 2]))